@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local BGP index build and lookup throughput
+
+Builds an index from a synthetic snapshot of nested IPv4 prefixes and
+times longest-prefix matches three ways: one address at a time,
+lookup_many() over address strings, and origin_asns() over an integer
+array (the NumPy fast path).
+
+    python benchmarks/bench_bgp_index.py [--prefixes 1000000] [--lookups 2000000]
+"""
+
+import argparse
+import ipaddress
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from veribits.engines.bgp_index import PrefixIndex, build_index  # noqa: E402
+
+
+def snapshot(count, seed=1):
+    """pfx2as-style lines: mostly /24s with covering /16-/22 aggregates"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        length = rng.choice((16, 19, 20, 22, 24, 24, 24, 24))
+        network = rng.getrandbits(32) & ~((1 << (32 - length)) - 1) & 0xFFFFFFFF
+        yield f"{ipaddress.IPv4Address(network)}\t{length}\t{rng.randint(1, 400000)}"
+
+
+def rate(count, elapsed):
+    return f"{count / elapsed / 1e6:6.2f} M/s" if elapsed else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--prefixes", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bgp-index.bin")
+        lines = list(snapshot(args.prefixes))
+        started = time.perf_counter()
+        header = build_index(path, lines)
+        print(f"build: {header['ipv4_prefixes']} prefixes in {time.perf_counter() - started:.2f}s, "
+              f"{os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+        keys = np.random.default_rng(1).integers(0, 2 ** 32, args.lookups, dtype=np.uint64).astype(np.uint32)
+        strings = [str(ipaddress.IPv4Address(key)) for key in keys[:200_000].tolist()]
+
+        with PrefixIndex(path) as index:
+            started = time.perf_counter()
+            for ip in strings[:50_000]:
+                index.lookup(ip)
+            print(f"lookup():       {rate(50_000, time.perf_counter() - started)}")
+
+            started = time.perf_counter()
+            for _ in index.lookup_many(strings):
+                pass
+            print(f"lookup_many():  {rate(len(strings), time.perf_counter() - started)}")
+
+            started = time.perf_counter()
+            index.origin_asns(keys)
+            print(f"origin_asns():  {rate(len(keys), time.perf_counter() - started)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call connections vs the shared keep-alive session
+
+Starts a local HTTP/1.1 stand-in for the VeriBits API and times N POSTs
+made with module-level requests.post (a new connection each call, as the
+CLI used to do) against N POSTs through veribits.session.get_session().
+
+    python benchmarks/bench_session.py --requests 2000 [--tls]
+
+--tls serves the stand-in over HTTPS with a throwaway self-signed
+certificate (requires the openssl binary), which is where per-call
+handshakes hurt the most.
+"""
+
+import argparse
+import json
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from veribits.session import get_session  # noqa: E402
+
+BODY = json.dumps({"success": True, "data": {"listed": False, "listings": []}}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def self_signed_cert(directory):
+    cert = str(Path(directory) / "cert.pem")
+    key = str(Path(directory) / "key.pem")
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+        "-keyout", key, "-out", cert, "-days", "1",
+        "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+    ], check=True, capture_output=True)
+    return cert, key
+
+
+def run(label, post, url, count, verify):
+    start = time.perf_counter()
+    for i in range(count):
+        response = post(url, json={"ip": f"192.0.2.{i % 256}"}, verify=verify)
+        response.raise_for_status()
+        response.json()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {count} requests in {elapsed:.3f}s  "
+          f"({count / elapsed:,.0f} req/s, {elapsed / count * 1000:.3f} ms/req)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--tls", action="store_true", help="serve over HTTPS")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    scheme, verify = "http", True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.tls:
+            cert, key = self_signed_cert(tmp)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert, key)
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+            scheme, verify = "https", cert
+
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"{scheme}://127.0.0.1:{server.server_address[1]}/api/v1/tools/rbl-check"
+
+        before = run("requests.post", requests.post, url, args.requests, verify)
+        after = run("pooled session", get_session().post, url, args.requests, verify)
+        print(f"speedup: {before / after:.2f}x")
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
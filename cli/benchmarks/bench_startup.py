@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CLI startup time against a budget
+
+Measures the cumulative import time of veribits.cli with
+``python -X importtime`` and the wall time of a few cheap commands, and
+checks that importing the CLI does not load heavy dependencies (Rich,
+requests, NumPy, ...), which are meant to be imported by the commands
+that need them.
+
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 80]
+
+Exits non-zero if the import exceeds the budget or a heavy module is
+loaded at import time, so it can run as a CI check.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CLI_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only be imported by the commands that use them
+HEAVY_MODULES = ["rich", "requests", "urllib3", "numpy", "Crypto", "cryptography", "aiohttp",
+                 "sqlite3", "concurrent.futures"]
+
+COMMANDS = [
+    ["--version"],
+    ["--help"],
+    ["--output", "json", "ipcalc", "192.0.2.1/24"],
+    ["--output", "json", "config"],
+]
+
+
+def _env():
+    return dict(os.environ, PYTHONPATH=str(CLI_ROOT) + os.pathsep + os.getenv("PYTHONPATH", ""))
+
+
+def import_time_ms(runs):
+    """Best cumulative import time of veribits.cli over ``runs`` fresh interpreters"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import veribits.cli"],
+                                capture_output=True, text=True, env=_env(), check=True)
+        for line in result.stderr.splitlines():
+            fields = [field.strip() for field in line.split("|")]
+            if len(fields) == 3 and fields[2] == "veribits.cli":
+                cumulative = int(fields[1]) / 1000
+                best = cumulative if best is None else min(best, cumulative)
+    return best
+
+
+def heavy_imports():
+    """Heavy modules present in sys.modules after importing the CLI"""
+    code = ("import json, sys, veribits.cli; "
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            env=_env(), check=True)
+    return json.loads(result.stdout)
+
+
+def wall_ms(args, runs):
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=_env())
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=80.0,
+                        help="maximum cumulative import time of veribits.cli")
+    args = parser.parse_args()
+
+    # Warm up so bytecode compilation is not measured
+    subprocess.run([sys.executable, "-c", "import veribits.cli"], env=_env(), check=True)
+
+    interpreter = wall_ms([sys.executable, "-c", "pass"], args.runs)
+    print(f"{'python -c pass':<40} {interpreter:7.1f} ms")
+    for command in COMMANDS:
+        elapsed = wall_ms([sys.executable, "-m", "veribits.cli", *command], args.runs)
+        print(f"{'veribits ' + ' '.join(command):<40} {elapsed:7.1f} ms "
+              f"(+{elapsed - interpreter:.1f} ms over the interpreter)")
+
+    imported = import_time_ms(args.runs)
+    heavy = heavy_imports()
+    print(f"\nimport veribits.cli: {imported:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"heavy modules loaded at import: {', '.join(heavy) or 'none'}")
+
+    failed = imported > args.budget_ms or bool(heavy)
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,10 +39,16 @@ setup(
         "pyyaml>=6.0",
         "python-dotenv>=1.0.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+        "crypto": ["pycryptodome>=3.15", "cryptography>=41.0"],
+        "bulk": ["numpy>=1.21"],
+        "test": ["pytest>=7"],
+    },
     entry_points={
         "console_scripts": [
             "veribits=veribits.cli:main",
-            "vb=veribits.cli:main",  # Short alias
+            "vb=veribits.daemon:vb_main",  # Short alias; uses a running daemon
         ],
     },
 )
@@ -0,0 +1,102 @@
+"""
+Shared fixtures for the veribits test suite
+
+Run from the cli directory with ``python -m pytest``. Tests that need
+the optional ``cryptography`` package are skipped when it is missing.
+"""
+
+import datetime
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep caches, manifests and sockets out of the user's cache directory"""
+    monkeypatch.setenv("VERIBITS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("VERIBITS_MANIFEST", raising=False)
+
+
+@pytest.fixture(scope="session")
+def mock_api():
+    """Base URL of a bundled mock API server running for the whole session"""
+    from veribits.mock_server import api_url, make_server
+
+    server = make_server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield api_url(server)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api_client(mock_api, monkeypatch):
+    """Make the mock API the CLI's default client, without a response cache"""
+    from veribits import api
+    from veribits.client.sync import VeriBitsClient
+
+    client = VeriBitsClient(api_url=mock_api, api_key="")
+    monkeypatch.setattr(api, "_client", client)
+    return client
+
+
+@pytest.fixture(scope="session")
+def serialization():
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+
+    return serialization
+
+
+@pytest.fixture(scope="session")
+def rsa_key(serialization):
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope="session")
+def rsa_public_pem(rsa_key, serialization):
+    return rsa_key.public_key().public_bytes(serialization.Encoding.PEM,
+                                             serialization.PublicFormat.SubjectPublicKeyInfo)
+
+
+@pytest.fixture(scope="session")
+def rsa_private_pem(rsa_key, serialization):
+    return rsa_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                 serialization.NoEncryption())
+
+
+@pytest.fixture(scope="session")
+def rsa_cert_pem(rsa_key, serialization):
+    """A one-day self-signed certificate for rsa_key"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.x509.oid import NameOID
+
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "example.test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder().subject_name(subject).issuer_name(subject)
+            .public_key(rsa_key.public_key()).serial_number(x509.random_serial_number())
+            .not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+            .sign(rsa_key, hashes.SHA256()))
+    return cert.public_bytes(serialization.Encoding.PEM)
+
+
+@pytest.fixture(scope="session")
+def ec_key(serialization):
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+@pytest.fixture(scope="session")
+def ec_public_pem(ec_key, serialization):
+    return ec_key.public_key().public_bytes(serialization.Encoding.PEM,
+                                            serialization.PublicFormat.SubjectPublicKeyInfo)
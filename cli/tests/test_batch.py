@@ -0,0 +1,43 @@
+import io
+import json
+
+from click.testing import CliRunner
+
+from veribits.batch import BatchStats, read_inputs, run_batch
+from veribits.cli import main
+
+
+def test_read_inputs_skips_blanks_and_comments():
+    stream = io.StringIO("# header\n10.0.0.1\n\n  10.0.0.2  \n#10.0.0.3\n")
+    assert list(read_inputs(stream)) == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_run_batch_keeps_input_order_and_records_failures(api_client):
+    inputs = [f"10.0.{n}.1/24" for n in range(40)] + ["not-an-ip"] + ["192.168.1.77/26"]
+    stats = BatchStats()
+    records = list(run_batch("ipcalc", iter(inputs), concurrency=4, stats=stats))
+
+    assert [record["input"] for record in records] == inputs
+    assert records[3]["data"]["network_address"] == "10.0.3.0"
+    assert records[-1]["data"]["usable_hosts"] == 62
+    failed = records[-2]
+    assert failed["success"] is False
+    assert failed["status_code"] == 400
+    assert (stats.total, stats.succeeded, stats.failed) == (42, 41, 1)
+    assert stats.elapsed > 0
+
+
+def test_batch_command_passes_options(api_client, tmp_path):
+    out = tmp_path / "mx.ndjson"
+    result = CliRunner().invoke(main, ["batch", "dns", "-i", "-", "-O", "type=MX", "--out-file", str(out)],
+                                input="example.com\nexample.org\n")
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [record["input"] for record in records] == ["example.com", "example.org"]
+    assert {record["data"]["record_type"] for record in records} == {"MX"}
+
+
+def test_batch_command_rejects_unknown_options(api_client):
+    result = CliRunner().invoke(main, ["batch", "dns", "-i", "-", "-O", "colour=blue"], input="example.com\n")
+    assert result.exit_code == 2
+    assert "colour" in result.output
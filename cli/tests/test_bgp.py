@@ -0,0 +1,58 @@
+import pytest
+
+from veribits import bgp
+from veribits.batch import BatchStats
+from veribits.errors import APIError
+
+
+def test_normalize_asn():
+    assert bgp.normalize_asn(" AS13335 ") == "13335"
+    assert bgp.normalize_asn("as15169") == "15169"
+    assert bgp.normalize_asn("64512") == "64512"
+
+
+def test_profile_merges_every_part(api_client):
+    report = bgp.profile_asn("AS64500")
+    assert report["asn"] == "64500"
+    assert report["success"] is True
+    assert "errors" not in report
+    for key in ("ipv4_prefixes", "ipv4_peers", "ipv4_upstreams", "ipv4_downstreams", "abuse_contacts"):
+        assert key in report
+
+
+def test_profiles_keep_input_order(api_client):
+    asns = [str(64500 + n) for n in range(12)]
+    stats = BatchStats()
+    reports = list(bgp.profile_many(asns, concurrency=3, stats=stats))
+    assert [report["asn"] for report in reports] == asns
+    assert (stats.total, stats.succeeded, stats.failed) == (12, 12, 0)
+
+
+@pytest.fixture
+def failing_peers(api_client, monkeypatch):
+    """Make the peers lookup of AS64666 fail"""
+    real_call = bgp.call
+
+    def call(endpoint, method, body, *args, **kwargs):
+        if endpoint == "/bgp/asn/peers" and body["asn"] == "64666":
+            raise APIError("HTTP 502", status_code=502, detail="Upstream unavailable")
+        return real_call(endpoint, method, body, *args, **kwargs)
+
+    monkeypatch.setattr(bgp, "call", call)
+
+
+def test_partial_failure_keeps_the_other_parts(failing_peers):
+    stats = BatchStats()
+    reports = list(bgp.profile_many(["64500", "AS64666", "64501"], stats=stats))
+    assert [report["success"] for report in reports] == [True, False, True]
+    failed = reports[1]
+    assert failed["errors"] == {"peers": "Upstream unavailable"}
+    assert "ipv4_peers" not in failed
+    assert "ipv4_upstreams" in failed and "ipv4_prefixes" in failed
+    assert (stats.total, stats.succeeded, stats.failed) == (3, 2, 1)
+
+
+def test_merge_profile_falls_back_to_the_error_message():
+    parts = {name: {} for name, _ in bgp.PROFILE_PARTS}
+    parts["asn"] = APIError("Connection refused")
+    assert bgp.merge_profile("1", parts) == {"asn": "1", "success": False, "errors": {"asn": "Connection refused"}}
@@ -0,0 +1,104 @@
+import array
+import re
+
+import pytest
+
+from veribits.engines import bgp_index
+from veribits.engines.bgp_index import NO_MATCH, BGPIndexError, PrefixIndex
+
+SNAPSHOT = """\
+# prefix asn name
+10.0.0.0/8 64500 Example Backbone
+10.1.0.0/16 64501 Example Metro
+10.1.2.0/24 64502 Example Edge
+192.0.2.0\t24\t64503
+198.51.100.0\t198.51.100.255\t64504\tUS\tDOCUMENTATION-NET
+2001:db8::/32 64505 Example Six
+"""
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = str(tmp_path / "bgp.bin")
+    bgp_index.build_index(path, SNAPSHOT.splitlines(), source="test")
+    return path
+
+
+def key(address):
+    return bgp_index.address_key(address)[1]
+
+
+def test_flatten_disjoint_ranges():
+    table = [(key("10.0.0.0"), 8), (key("10.1.0.0"), 16), (key("10.1.2.0"), 24), (key("10.2.0.0"), 16)]
+    starts, owners = bgp_index._flatten(table, 32, "I")
+    assert list(zip(starts, owners)) == [
+        (0, NO_MATCH),
+        (key("10.0.0.0"), 0),
+        (key("10.1.0.0"), 1),
+        (key("10.1.2.0"), 2),
+        (key("10.1.3.0"), 1),
+        (key("10.2.0.0"), 3),
+        (key("10.3.0.0"), 0),
+        (key("11.0.0.0"), NO_MATCH),
+    ]
+    assert isinstance(starts, array.array) and starts.typecode == "I"
+
+
+def test_flatten_prefix_ending_at_the_top_of_the_space():
+    starts, owners = bgp_index._flatten([(key("255.255.255.0"), 24)], 32, "I")
+    assert list(zip(starts, owners)) == [(0, NO_MATCH), (key("255.255.255.0"), 0)]
+
+
+@pytest.mark.parametrize("address, prefix, asn", [
+    ("10.200.0.1", "10.0.0.0/8", 64500),
+    ("10.1.200.1", "10.1.0.0/16", 64501),
+    ("10.1.2.3", "10.1.2.0/24", 64502),
+    ("10.1.3.0", "10.1.0.0/16", 64501),
+    ("192.0.2.255", "192.0.2.0/24", 64503),
+    ("198.51.100.7", "198.51.100.0/24", 64504),
+    ("2001:db8:1::1", "2001:db8::/32", 64505),
+    ("11.0.0.1", None, None),
+])
+def test_longest_prefix_match(index_path, address, prefix, asn):
+    with PrefixIndex(index_path) as index:
+        record = index.lookup(address)
+        assert (record["prefix"], record["asn"]) == (prefix, asn)
+        assert list(index.lookup_many([address])) == [record]
+
+
+def test_lookup_names_and_invalid_addresses(index_path):
+    with PrefixIndex(index_path) as index:
+        assert index.lookup("10.1.2.3")["name"] == "Example Edge"
+        assert index.lookup("198.51.100.1")["name"] == "DOCUMENTATION-NET"
+        assert index.lookup("10.1.2")["error"] == "Invalid IP address"
+
+
+def test_update_index_applies_announcements_and_withdrawals(index_path):
+    delta = ["+ 10.1.2.128/25 64510 Example Customer", "W 10.1.2.0/24", "- 172.16.0.0/12", "A 203.0.113.0/24 64511"]
+    header, announced, withdrawn = bgp_index.update_index(index_path, delta)
+    assert (announced, withdrawn) == (2, 1)
+    assert header["deltas"] == 1
+    assert header["source"] == "test"
+    with PrefixIndex(index_path) as index:
+        assert index.lookup("10.1.2.1")["prefix"] == "10.1.0.0/16"
+        assert index.lookup("10.1.2.200")["name"] == "Example Customer"
+        assert index.lookup("203.0.113.9")["asn"] == 64511
+
+
+@pytest.mark.parametrize("line, message", [
+    ("-", "Line 1: expected '- prefix'"),
+    ("W", "Line 1: expected '- prefix'"),
+    ("+ 192.0.2.0/24", "Line 1: expected '+ prefix asn [name]'"),
+])
+def test_parse_delta_rejects_incomplete_lines(line, message):
+    with pytest.raises(BGPIndexError, match=re.escape(message)):
+        list(bgp_index.parse_delta([line]))
+
+
+def test_search_by_name_and_number(index_path):
+    with PrefixIndex(index_path) as index:
+        assert [record["asn"] for record in index.search("example")] == [64500, 64501, 64502, 64505]
+        assert index.search("METRO") == [{"asn": 64501, "name": "Example Metro"}]
+        assert index.search("AS64503") == [{"asn": 64503, "name": None}]
+        assert len(index.search("example", limit=2)) == 2
+        assert index.search("nothing-like-this") == []
@@ -0,0 +1,107 @@
+import pytest
+
+from veribits import cache
+from veribits.cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.time() for the cache module"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def store(tmp_path):
+    response_cache = ResponseCache(tmp_path / "responses.sqlite", max_bytes=1024 * 1024)
+    yield response_cache
+    response_cache.close()
+
+
+def whois(domain):
+    return {"success": True, "data": {"domain": domain, "registrar": "Example Registrar"}}
+
+
+def test_response_ttl():
+    assert cache.response_ttl("/tools/whois", {}, {}) == 24 * 3600
+    assert cache.response_ttl("/tools/scan-secrets", {}, {}) is None
+    dns = {"data": {"records": [{"ttl": 300}, {"ttl": 45}, {"value": "no ttl"}]}}
+    assert cache.response_ttl("/tools/dns-validate", {}, dns) == 45
+    assert cache.response_ttl("/tools/dns-validate", {}, {"data": {"records": []}}) == cache.DNS_NEGATIVE_TTL
+    assert cache.response_ttl("/crypto/validate/bitcoin", {"type": "address"}, {}) == 30 * 24 * 3600
+    assert cache.response_ttl("/crypto/validate/bitcoin", {"type": "transaction"}, {}) is None
+
+
+def test_hit_and_miss(store, clock):
+    assert store.get("/tools/whois", {"domain": "example.com"}) is None
+    store.put("/tools/whois", {"domain": "example.com"}, whois("example.com"))
+    assert store.get("/tools/whois", {"domain": "example.com"}) == whois("example.com")
+    assert store.get("/tools/whois", {"domain": "example.org"}) is None
+    stats = store.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 2)
+
+
+def test_payload_key_order_does_not_matter(store, clock):
+    store.put("/bgp/search", {"q": "x", "limit": 5}, {"data": 1})
+    assert store.get("/bgp/search", {"limit": 5, "q": "x"}) == {"data": 1}
+
+
+def test_ttl_expiry(store, clock):
+    store.put("/tools/dns-validate", {"domain": "a.test"}, {"data": {"records": [{"ttl": 30}]}})
+    clock[0] += 29
+    assert store.get("/tools/dns-validate", {"domain": "a.test"}) is not None
+    clock[0] += 2
+    assert store.get("/tools/dns-validate", {"domain": "a.test"}) is None
+    assert store.stats()["entries"] == 0
+
+
+def test_lru_eviction(tmp_path, clock):
+    size = len(b'{"success":true,"data":{"domain":"d0.test","registrar":"Example Registrar"}}')
+    store = ResponseCache(tmp_path / "responses.sqlite", max_bytes=size * 4)
+    try:
+        for i in range(4):
+            clock[0] += 1
+            store.put("/tools/whois", {"domain": f"d{i}.test"}, whois(f"d{i}.test"))
+        # Touch the oldest entry so d1 becomes the least recently used
+        clock[0] += 1
+        assert store.get("/tools/whois", {"domain": "d0.test"}) is not None
+        clock[0] += 1
+        store.put("/tools/whois", {"domain": "d4.test"}, whois("d4.test"))
+
+        present = [i for i in range(5) if store.get("/tools/whois", {"domain": f"d{i}.test"}) is not None]
+        # Evicted down to 90% of the limit: three entries of this size
+        assert present == [0, 3, 4]
+        assert store.stats()["size_bytes"] <= store.max_bytes * 0.9
+    finally:
+        store.close()
+
+
+def test_refresh_and_namespace(tmp_path, clock):
+    path = tmp_path / "responses.sqlite"
+    first = ResponseCache(path, namespace="https://a.test")
+    first.put("/tools/whois", {"domain": "x.test"}, whois("x.test"))
+    other = ResponseCache(path, namespace="https://b.test")
+    refreshing = ResponseCache(path, namespace="https://a.test", refresh=True)
+    try:
+        assert other.get("/tools/whois", {"domain": "x.test"}) is None
+        assert refreshing.get("/tools/whois", {"domain": "x.test"}) is None
+        assert first.get("/tools/whois", {"domain": "x.test"}) is not None
+    finally:
+        for store in (first, other, refreshing):
+            store.close()
+
+
+def test_api_keys_do_not_share_entries(tmp_path, clock):
+    path = tmp_path / "responses.sqlite"
+    stores = {key: ResponseCache(path, namespace=cache.cache_namespace("https://api.test", key))
+              for key in ("", "key-a", "key-b")}
+    try:
+        stores["key-a"].put("/tools/whois", {"domain": "x.test"}, whois("x.test"))
+        assert stores["key-a"].get("/tools/whois", {"domain": "x.test"}) is not None
+        assert stores["key-b"].get("/tools/whois", {"domain": "x.test"}) is None
+        assert stores[""].get("/tools/whois", {"domain": "x.test"}) is None
+    finally:
+        for store in stores.values():
+            store.close()
+    assert "key-a" not in cache.cache_namespace("https://api.test", "key-a")
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from veribits.client import VeriBitsClient
+from veribits.errors import APIError
+
+
+@pytest.fixture
+def client(mock_api):
+    return VeriBitsClient(api_url=mock_api, api_key="")
+
+
+def test_endpoint_methods_return_data(client):
+    assert client.ip_calculate("192.168.1.77", "26")["broadcast_address"] == "192.168.1.127"
+    records = client.dns_validate("example.com", "MX")["records"]
+    assert records and {record["type"] for record in records} == {"MX"}
+
+
+def test_client_errors_raise_api_error(client):
+    with pytest.raises(APIError) as raised:
+        client.ip_calculate("not-an-ip")
+    assert raised.value.status_code == 400
+    with pytest.raises(APIError) as raised:
+        client.request("/no/such/endpoint", "POST", {})
+    assert raised.value.status_code == 404
+    assert "Unknown endpoint" in raised.value.detail
+
+
+def test_upload(client):
+    data = b"\x89PNG\r\n\x1a\n" + bytes(100)
+    assert client.file_magic(data, "image.png")["detected_mime"] == "image/png"
+
+
+def test_async_client(mock_api):
+    pytest.importorskip("aiohttp")
+    from veribits.client.aio import AsyncVeriBitsClient
+
+    async def main():
+        async with AsyncVeriBitsClient(api_url=mock_api, api_key="", concurrency=8) as client:
+            results = await asyncio.gather(*(client.ip_calculate(f"10.0.{n}.9/24") for n in range(20)))
+            with pytest.raises(APIError) as raised:
+                await client.ip_calculate("not-an-ip")
+            return results, raised.value
+
+    results, error = asyncio.run(main())
+    assert [result["network_address"] for result in results] == [f"10.0.{n}.0" for n in range(20)]
+    assert error.status_code == 400
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from veribits.coalesce import Coalescer, request_key
+
+
+def test_request_key_is_canonical():
+    assert request_key("/x", {"a": 1, "b": [2]}) == request_key("/x", {"b": [2], "a": 1})
+    assert request_key("/x", {"a": 1}) != request_key("/y", {"a": 1})
+
+
+def run_concurrently(coalescer, payloads, fetch, joined):
+    """Call coalescer.run for each payload on its own thread, releasing ``fetch`` once ``joined`` callers wait"""
+    release = threading.Event()
+    results, errors = {}, {}
+
+    def blocked():
+        release.wait(5)
+        return fetch()
+
+    def worker(index, payload):
+        try:
+            results[index] = coalescer.run("/tools/whois", payload, blocked)
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=worker, args=item) for item in enumerate(payloads)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while coalescer.saved < joined and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_identical_requests_share_one_fetch():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"data": len(calls)}
+
+    coalescer = Coalescer()
+    results, errors = run_concurrently(coalescer, [{"domain": "a"}] * 4 + [{"domain": "b"}], fetch, 3)
+    assert not errors
+    assert len(calls) == 2
+    assert coalescer.saved == 3
+    assert results[0] == results[1] == results[2] == results[3]
+    assert coalescer._inflight == {}
+
+
+def test_errors_are_shared():
+    def fetch():
+        raise RuntimeError("boom")
+
+    coalescer = Coalescer()
+    results, errors = run_concurrently(coalescer, [{"domain": "a"}] * 3, fetch, 2)
+    assert not results
+    assert [str(error) for error in errors.values()] == ["boom"] * 3
+
+
+def test_sequential_requests_are_not_coalesced():
+    coalescer = Coalescer()
+    assert coalescer.run("/x", {}, lambda: 1) == 1
+    assert coalescer.run("/x", {}, lambda: 2) == 2
+    assert coalescer.saved == 0
+
+
+def test_run_async():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def main():
+        coalescer = Coalescer()
+        results = await asyncio.gather(*(coalescer.run_async("/x", {"q": 1}, fetch) for _ in range(5)))
+        return coalescer, results
+
+    coalescer, results = asyncio.run(main())
+    assert results == ["done"] * 5
+    assert len(calls) == 1
+    assert coalescer.saved == 4
+
+
+def test_run_async_errors_are_shared():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        coalescer = Coalescer()
+        return await asyncio.gather(*(coalescer.run_async("/x", {}, fetch) for _ in range(3)),
+                                    return_exceptions=True)
+
+    assert [str(result) for result in asyncio.run(main())] == ["boom"] * 3
+
+
+@pytest.fixture(scope="module")
+def slow_api():
+    """Base URL of a mock API answering after 0.2s, so identical requests overlap"""
+    from veribits.mock_server import api_url, make_server
+
+    server = make_server(latency=0.2)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield api_url(server)
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_client_coalesces_concurrent_requests(slow_api):
+    from veribits.client.sync import VeriBitsClient
+
+    client = VeriBitsClient(api_url=slow_api, api_key="")
+    payloads = [{"query": "example.com"}] * 4 + [{"query": "example.org"}]
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda payload: client.request("/tools/whois", "POST", payload), payloads))
+    assert [result["data"]["query"] for result in results] == ["example.com"] * 4 + ["example.org"]
+    assert client.coalescer.saved == 3
+
+
+def test_async_client_coalesces_concurrent_requests(slow_api):
+    pytest.importorskip("aiohttp")
+    from veribits.client.aio import AsyncVeriBitsClient
+
+    async def main():
+        async with AsyncVeriBitsClient(api_url=slow_api, api_key="") as client:
+            results = await asyncio.gather(*(client.request("/tools/whois", "POST", {"query": "example.com"})
+                                             for _ in range(4)))
+            return client.coalescer.saved, results
+
+    saved, results = asyncio.run(main())
+    assert saved == 3
+    assert all(result == results[0] for result in results)
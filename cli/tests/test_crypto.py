@@ -0,0 +1,98 @@
+import pytest
+
+from veribits.engines import crypto
+
+
+@pytest.mark.parametrize("data, digest", [
+    (b"", "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"),
+    (b"abc", "4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45"),
+])
+def test_keccak256_known_answers(data, digest):
+    assert crypto.keccak256(data).hex() == digest
+    assert crypto._keccak256_python(data).hex() == digest
+
+
+@pytest.mark.parametrize("length", [1, 135, 136, 137, 272, 1000])
+def test_keccak256_fallback_matches_across_block_boundaries(length):
+    data = bytes(range(256)) * 4
+    assert crypto._keccak256_python(data[:length]) == crypto.keccak256(data[:length])
+
+
+# EIP-55 test vectors
+@pytest.mark.parametrize("address", [
+    "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+    "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359",
+    "0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB",
+    "0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb",
+])
+def test_checksum_address(address):
+    assert crypto.to_checksum_address(address.lower()) == address
+    result = crypto.validate_ethereum_address(address)
+    assert result["is_valid"] and result["checksum_valid"]
+
+
+def test_ethereum_address_without_checksum():
+    result = crypto.validate_ethereum_address("0x5aaeb6053f3e94c9b9a09f33669435e7ef1beaed")
+    assert result["is_valid"] is True
+    assert result["checksum_valid"] is False
+    assert "warning" in result["details"]
+
+
+def test_mixed_case_with_wrong_checksum_is_invalid():
+    # The API reports this as valid with a warning; EIP-55 makes it a typo
+    result = crypto.validate_ethereum_address("0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAeD")
+    assert result["is_valid"] is False
+    assert result["details"]["error"] == "Invalid checksum"
+    assert result["details"]["checksum_address"] == "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed"
+
+
+@pytest.mark.parametrize("address", ["0x1234", "5aaeb6053f3e94c9", "0x" + "g" * 40])
+def test_invalid_ethereum_addresses(address):
+    assert crypto.validate_ethereum_address(address)["is_valid"] is False
+
+
+@pytest.mark.parametrize("validate", [crypto.validate_bitcoin_address, crypto.validate_ethereum_address])
+@pytest.mark.parametrize("address", ["", "   ", "\t\n"])
+def test_empty_addresses(validate, address):
+    result = validate(address)
+    assert result["is_valid"] is False
+    assert result["details"] == {"error": "Address is required"}
+
+
+@pytest.mark.parametrize("address, fmt", [
+    ("1BoatSLRHtKNngkdXEeobR76b53LETtpyT", "P2PKH (Legacy)"),
+    ("3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy", "P2SH (Script Hash)"),
+    ("BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4", "Bech32 (SegWit)"),
+    ("bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0", "Bech32m (Taproot)"),
+])
+def test_valid_bitcoin_addresses(address, fmt):
+    result = crypto.validate_bitcoin_address(address)
+    assert result["is_valid"] is True
+    assert result["format"].startswith(fmt.split(" (")[0])
+    assert result["network"] == "mainnet"
+
+
+@pytest.mark.parametrize("address", [
+    "1BoatSLRHtKNngkdXEeobR76b53LETtpyU",
+    "BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T5",
+    # A v1 program with a Bech32 (not Bech32m) checksum
+    "bc1pw508d6qejxtdg4y5r3zarvary0c5xw7kw508d6qejxtdg4y5r3zarvary0c5xw7k7grplx",
+    "not an address",
+])
+def test_invalid_bitcoin_addresses(address):
+    assert crypto.validate_bitcoin_address(address)["is_valid"] is False
+
+
+def test_transactions():
+    txid = "4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b"
+    assert crypto.validate_bitcoin_transaction(txid)["is_valid"] is True
+    assert crypto.validate_bitcoin_transaction(txid[:-1])["is_valid"] is False
+    assert crypto.validate_ethereum_transaction("0x" + txid)["is_valid"] is True
+    assert crypto.validate_ethereum_transaction(txid)["is_valid"] is False
+
+
+def test_validate_many_keeps_order():
+    addresses = ["1BoatSLRHtKNngkdXEeobR76b53LETtpyT", "bogus"] * 5
+    results = list(crypto.validate_many("bitcoin", addresses, workers=1, batch_size=3))
+    assert [r["value"] for r in results] == addresses
+    assert [r["is_valid"] for r in results] == [True, False] * 5
@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from veribits import daemon
+
+CLI_ROOT = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(not daemon.supported(), reason="needs socket.send_fds")
+
+
+def start_daemon(path, **env):
+    """Run a daemon in a subprocess with this process's settings plus ``env``"""
+    environ = dict(os.environ, PYTHONPATH=str(CLI_ROOT), **env)
+    code = ("import sys; from veribits.daemon import DaemonServer; "
+            "server = DaemonServer(sys.argv[1]); server.bind(); server.serve_forever()")
+    process = subprocess.Popen([sys.executable, "-c", code, path], env=environ,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path):
+        assert process.poll() is None, "daemon exited"
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.02)
+    return process
+
+
+@pytest.fixture
+def socket_dir():
+    # Unix socket paths are limited to about 100 bytes, shorter than many tmp_path values
+    directory = tempfile.mkdtemp(prefix="vb")
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def run_daemon(socket_dir):
+    processes = []
+
+    def run(**env):
+        path = os.path.join(socket_dir, f"{len(processes)}.sock")
+        processes.append(start_daemon(path, **env))
+        return path
+
+    yield run
+    for process in processes:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def test_status_and_stop(run_daemon):
+    path = run_daemon()
+    status = daemon.control("status", path)
+    assert status["requests"] == 0
+    assert status["socket"] == path
+    assert daemon.control("stop", path)["stopped"] is True
+
+
+def test_command_runs_with_the_client_stdio(run_daemon, capfd, monkeypatch):
+    path = run_daemon()
+    monkeypatch.delenv("VERIBITS_OUTPUT", raising=False)
+    assert daemon.forward(["-o", "json", "ipcalc", "10.0.0.5/31"], path) == 0
+    assert json.loads(capfd.readouterr().out)["usable_hosts"] == 2
+    assert daemon.forward(["ipcalc", "not-a-network"], path) == 1
+    assert daemon.control("status", path)["requests"] == 2
+
+
+def test_output_format_follows_the_client_environment(run_daemon, capfd, monkeypatch):
+    path = run_daemon(VERIBITS_OUTPUT="json")
+    monkeypatch.delenv("VERIBITS_OUTPUT", raising=False)
+    assert daemon.forward(["ipcalc", "10.0.0.5/31"], path) == 0
+    out = capfd.readouterr().out
+    assert "usable_hosts" not in out
+    assert "10.0.0.4" in out
+
+    monkeypatch.setenv("VERIBITS_OUTPUT", "csv")
+    assert daemon.forward(["ipcalc", "10.0.0.5/31"], path) == 0
+    assert capfd.readouterr().out.splitlines()[0].startswith("ip_address,cidr,")
+
+
+def test_trace_path_is_forwarded_as_absolute(run_daemon, tmp_path, capfd, monkeypatch):
+    path = run_daemon()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("VERIBITS_TRACE", "trace.json")
+    assert daemon.forward(["ipcalc", "10.0.0.5/31"], path) == 0
+    assert (tmp_path / "trace.json").exists()
+
+
+def test_different_settings_fall_back_to_in_process(run_daemon, monkeypatch):
+    path = run_daemon()
+    monkeypatch.setenv("VERIBITS_API_URL", "http://127.0.0.1:9/api/v1")
+    assert daemon.forward(["ipcalc", "10.0.0.5/31"], path) is None
+
+
+def test_silent_connection_does_not_block_others(run_daemon):
+    path = run_daemon()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+        idle.connect(path)
+        started = time.monotonic()
+        assert daemon.control("status", path, timeout=daemon.REQUEST_TIMEOUT)["requests"] == 0
+        assert time.monotonic() - started < daemon.REQUEST_TIMEOUT / 2
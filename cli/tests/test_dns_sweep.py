@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from veribits import api, dns_sweep
+from veribits.dns_sweep import SweepStats
+from veribits.errors import APIError
+
+
+@pytest.fixture
+def slow_api(monkeypatch):
+    """A mock API answering after 0.2s, so concurrent duplicate queries overlap"""
+    from veribits.client.sync import VeriBitsClient
+    from veribits.mock_server import api_url, make_server
+
+    server = make_server(latency=0.2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(api, "_client", VeriBitsClient(api_url=api_url(server), api_key=""))
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def test_normalize_domain():
+    assert dns_sweep.normalize_domain(" Example.COM. ") == "example.com"
+
+
+def test_merge_records():
+    answers = {
+        "A": {"records": [{"type": "A", "value": "192.0.2.1"}, {"type": "A", "value": "192.0.2.1"}]},
+        "MX": {"records": [{"type": "MX", "value": "mx.example.com"}], "dnssec": {"enabled": True}},
+        "TXT": APIError("HTTP 500", status_code=500, detail="Resolver timeout"),
+    }
+    result = dns_sweep.merge_records("example.com", ("A", "MX", "TXT"), answers)
+    assert result["records"] == [{"type": "A", "value": "192.0.2.1"}, {"type": "MX", "value": "mx.example.com"}]
+    assert result["counts"] == {"A": 1, "MX": 1}
+    assert result["dnssec"] == {"enabled": True}
+    assert result["success"] is False
+    assert result["errors"] == {"TXT": "Resolver timeout"}
+
+
+def test_sweep_keeps_input_order(api_client):
+    domains = [f"host{n}.example.com" for n in range(10)]
+    stats = SweepStats()
+    results = list(dns_sweep.sweep(domains, ("A", "MX"), concurrency=3, stats=stats))
+    assert [result["domain"] for result in results] == domains
+    assert all(set(result["counts"]) == {"A", "MX"} for result in results)
+    assert (stats.total, stats.succeeded, stats.queries) == (10, 10, 20)
+
+
+def test_failed_record_type_is_reported(api_client, monkeypatch):
+    real_call = dns_sweep.call
+
+    def call(endpoint, method, body, *args, **kwargs):
+        if body["record_type"] == "MX":
+            raise APIError("HTTP 502", status_code=502)
+        return real_call(endpoint, method, body, *args, **kwargs)
+
+    monkeypatch.setattr(dns_sweep, "call", call)
+    stats = SweepStats()
+    (result,) = dns_sweep.sweep(["example.com"], ("A", "MX"), stats=stats)
+    assert result["errors"] == {"MX": "HTTP 502"}
+    assert list(result["counts"]) == ["A"]
+    assert stats.failed == 1
+
+
+def test_duplicate_domains_share_requests(slow_api):
+    stats = SweepStats()
+    results = list(dns_sweep.sweep(["Example.com", "example.com."], ("A",), concurrency=4, stats=stats))
+    assert [result["domain"] for result in results] == ["example.com", "example.com"]
+    assert results[0]["records"] == results[1]["records"]
+    assert stats.queries == 2
+    assert stats.coalesced == 1
@@ -0,0 +1,51 @@
+import io
+
+from veribits.engines import hashing
+
+# Known answers for b"abc"
+ABC = {
+    "md5": "900150983cd24fb0d6963f7d28e17f72",
+    "sha1": "a9993e364706816aba3e25717850c26c9cd0d89d",
+    "sha256": "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad",
+    "sha3-256": "3a985da74fe225b2045c172d6bd390bd855f086e3e9d525b46bfe24511431532",
+    "crc32b": "352441c2",
+}
+
+
+def test_known_answers():
+    assert hashing.hash_bytes(b"abc", list(ABC)) == ABC
+
+
+def test_split_algorithms():
+    assert hashing.split_algorithms(["SHA256", "bcrypt", "crc32b", "shake_128"]) == (
+        ["sha256", "crc32b"], ["bcrypt", "shake_128"])
+
+
+def test_blocks_streams_and_files_agree(tmp_path, monkeypatch):
+    monkeypatch.setattr(hashing, "BLOCK_BYTES", 7)
+    data = b"The quick brown fox jumps over the lazy dog" * 3
+    path = tmp_path / "fox.txt"
+    path.write_bytes(data)
+    expected = hashing.hash_bytes(data, list(ABC))
+    assert hashing.hash_stream(io.BytesIO(data), list(ABC)) == expected
+    assert hashing.hash_file(path, list(ABC)) == expected
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    assert hashing.hash_file(path, ["md5"]) == {"md5": "d41d8cd98f00b204e9800998ecf8427e"}
+
+
+def test_hash_files_keeps_order_and_reports_errors(tmp_path):
+    paths = []
+    for n in range(6):
+        path = tmp_path / f"{n}.txt"
+        path.write_bytes(b"abc" if n % 2 else b"")
+        paths.append(str(path))
+    paths.append(str(tmp_path / "missing.txt"))
+
+    records = list(hashing.hash_files(paths, ["md5"], workers=2))
+    assert [record["file"] for record in records] == paths
+    assert records[1]["hashes"]["md5"] == ABC["md5"]
+    assert "error" in records[-1]
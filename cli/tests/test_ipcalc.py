@@ -0,0 +1,64 @@
+import pytest
+
+from veribits.engines import ipcalc
+
+
+def test_slash_26():
+    result = ipcalc.calculate("192.168.1.77/26")
+    assert result == {
+        "ip_address": "192.168.1.77",
+        "cidr": "192.168.1.77/26",
+        "network_address": "192.168.1.64",
+        "broadcast_address": "192.168.1.127",
+        "subnet_mask": "255.255.255.192",
+        "wildcard_mask": "0.0.0.63",
+        "first_usable": "192.168.1.65",
+        "last_usable": "192.168.1.126",
+        "total_hosts": 64,
+        "usable_hosts": 62,
+        "ip_class": "C",
+        "ip_type": "Private",
+    }
+
+
+def test_slash_31_point_to_point():
+    result = ipcalc.calculate("10.0.0.5", "31")
+    assert result["network_address"] == result["first_usable"] == "10.0.0.4"
+    assert result["broadcast_address"] == result["last_usable"] == "10.0.0.5"
+    assert result["usable_hosts"] == result["total_hosts"] == 2
+
+
+def test_slash_32_single_host():
+    result = ipcalc.calculate("8.8.8.8/32")
+    assert result["first_usable"] == result["last_usable"] == result["network_address"] == "8.8.8.8"
+    assert result["usable_hosts"] == 1
+    assert result["ip_type"] == "Public"
+
+
+def test_default_prefix_and_dotted_mask():
+    assert ipcalc.calculate("172.16.5.4")["cidr"] == "172.16.5.4/24"
+    assert ipcalc.calculate("172.16.5.4", "255.255.0.0")["network_address"] == "172.16.0.0"
+
+
+@pytest.mark.parametrize("ip", ["256.1.1.1", "1.2.3", "abc", "10.0.0.1/33"])
+def test_invalid_input(ip):
+    with pytest.raises(ipcalc.IPCalcError):
+        ipcalc.calculate(ip)
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_calculate_many_matches_calculate(vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+    rows = [("10.0.0.5", "31"), ("8.8.8.8", "32"), ("192.168.1.77", "26"), ("bogus", None), ("1.2.3.4", "0")]
+    results = ipcalc.calculate_many(rows, vectorized=vectorized)
+    assert results[3]["ip_address"] == "bogus" and "error" in results[3]
+    for row, result in zip(rows, results):
+        if row[0] != "bogus":
+            assert result == ipcalc.calculate(*row)
+
+
+def test_aggregate():
+    assert ipcalc.aggregate(["10.0.0.0/25", "10.0.0.128/25", "10.0.1.0/24", "10.0.0.7"]) == ["10.0.0.0/23"]
+    assert ipcalc.aggregate(["10.0.0.0/24", "10.0.2.0/24"]) == ["10.0.0.0/24", "10.0.2.0/24"]
+    assert ipcalc.aggregate(["2001:db8::/33", "2001:db8:8000::/33"]) == ["2001:db8::/32"]
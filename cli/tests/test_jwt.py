@@ -0,0 +1,169 @@
+import hashlib
+import hmac
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from veribits.cli import main
+from veribits.engines import jwt
+from veribits.engines.jwt import b64url_decode, b64url_encode
+
+# The jwt.io example token and its secret
+JWT_IO_TOKEN = ("eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJzdWIiOiIxMjM0NTY3ODkwIiwibmFtZSI6IkpvaG4gRG9lIiwi"
+                "aWF0IjoxNTE2MjM5MDIyfQ.SflKxwRJSMeKKF2QT4fwpMeJf36POk6yJV_adQssw5c")
+JWT_IO_SECRET = "your-256-bit-secret"
+
+# RFC 7515 appendix A.1: HS256 with a binary key
+RFC7515_TOKEN = ("eyJ0eXAiOiJKV1QiLA0KICJhbGciOiJIUzI1NiJ9.eyJpc3MiOiJqb2UiLA0KICJleHAiOjEzMDA4MTkzODAsDQog"
+                 "Imh0dHA6Ly9leGFtcGxlLmNvbS9pc19yb290Ijp0cnVlfQ.dBjftJeZ4CVP-mB92K27uhbUJU1p1r_wW1gFWFOEjXk")
+RFC7515_KEY = b64url_decode("AyM1SysPpbyDfgZld3umj1qzKObwVMkoqQ-EstJQLr_T-1qS0gZH75aKtMN3Yj0iPS4hcgUuTwjAzZr1Z9CAow")
+
+
+def hs256_token(payload, key, header=None):
+    """An HS256 token MACed with raw ``key`` bytes, whatever they are"""
+    header = header or {"alg": "HS256", "typ": "JWT"}
+    signing_input = ".".join(b64url_encode(json.dumps(part).encode()) for part in (header, payload))
+    signature = hmac.new(key, signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{b64url_encode(signature)}"
+
+
+def rs256_token(payload, private_key):
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    signing_input = ".".join(b64url_encode(json.dumps(part).encode())
+                             for part in ({"alg": "RS256", "typ": "JWT"}, payload))
+    signature = private_key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+    return f"{signing_input}.{b64url_encode(signature)}"
+
+
+def test_decode_known_token():
+    result = jwt.decode(JWT_IO_TOKEN, JWT_IO_SECRET, verify=True)
+    assert result["signature_verified"] is True
+    assert result["algorithm"] == "HS256"
+    assert result["payload"] == {"sub": "1234567890", "name": "John Doe", "iat": 1516239022}
+    assert result["claims"] == {"subject": "1234567890", "issued_at": "2018-01-18 01:30:22"}
+
+
+def test_decode_rfc7515_binary_key():
+    result = jwt.decode(RFC7515_TOKEN, RFC7515_KEY, verify=True, now=1300819381)
+    assert result["signature_verified"] is True
+    assert result["claims"]["issuer"] == "joe"
+    assert result["claims"]["expired"] is True
+
+
+def test_wrong_secret_fails():
+    result = jwt.decode(JWT_IO_TOKEN, "not-the-secret", verify=True)
+    assert result["signature_verified"] is False
+
+
+def test_verify_without_key():
+    result = jwt.decode(JWT_IO_TOKEN, verify=True)
+    assert result["signature_verified"] is False
+    assert "required" in result["signature_error"]
+
+
+def test_decode_without_verify_has_no_verdict():
+    assert "signature_verified" not in jwt.decode(JWT_IO_TOKEN)
+
+
+@pytest.mark.parametrize("token", ["abc", "a.b", "!!!.e30.", "e30.bm90IGpzb24.", "WzFd.e30."])
+def test_malformed_tokens(token):
+    with pytest.raises(jwt.JWTError):
+        jwt.decode(token)
+
+
+@pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+def test_sign_round_trip(algorithm):
+    signed = jwt.sign("s3cret", {"sub": "alice"}, expires=60, algorithm=algorithm, now=1000)
+    assert signed["payload"] == {"sub": "alice", "iat": 1000, "exp": 1060}
+    result = jwt.decode(signed["token"], "s3cret", verify=True, now=1001)
+    assert result["signature_verified"] is True
+    assert result["algorithm"] == algorithm
+    assert result["claims"]["expired"] is False
+
+
+def test_sign_rejects_asymmetric_algorithms():
+    with pytest.raises(jwt.JWTError):
+        jwt.sign("s3cret", {}, algorithm="RS256")
+
+
+@pytest.mark.parametrize("payload, message", [
+    ([1, 2], "JSON object"),
+    ("sub", "JSON object"),
+    ({"exp": "soon"}, "'exp' must be a number"),
+    ({"nbf": None}, "'nbf' must be a number"),
+    ({"iat": True}, "'iat' must be a number"),
+    ({"exp": 1e300}, "out of range"),
+])
+def test_sign_rejects_invalid_payloads(payload, message):
+    with pytest.raises(jwt.JWTError, match=message):
+        jwt.sign("s3cret", payload)
+
+
+def test_sign_command_reports_invalid_payloads():
+    result = CliRunner().invoke(main, ["jwt-sign", "-s", "k", "-p", '{"exp": "soon"}'])
+    assert result.exit_code == 1
+    assert "Error: Claim 'exp' must be a number" in result.output
+
+
+def test_rs256_with_public_key(rsa_key, rsa_public_pem):
+    token = rs256_token({"sub": "bob"}, rsa_key)
+    assert jwt.decode(token, rsa_public_pem, verify=True)["signature_verified"] is True
+    header, _, signature = token.split(".")
+    tampered = ".".join((header, b64url_encode(b'{"sub": "admin"}'), signature))
+    assert jwt.decode(tampered, rsa_public_pem, verify=True)["signature_verified"] is False
+
+
+def test_algorithm_confusion_is_rejected(rsa_public_pem):
+    # A forged HS256 token MACed with the issuer's public key as the secret
+    forged = hs256_token({"sub": "admin"}, rsa_public_pem)
+    result = jwt.decode(forged, rsa_public_pem, verify=True)
+    assert result["signature_verified"] is False
+    assert "algorithm confusion" in result["signature_error"]
+
+
+def test_algorithm_confusion_with_str_key(rsa_public_pem):
+    forged = hs256_token({"sub": "admin"}, rsa_public_pem)
+    assert jwt.decode(forged, rsa_public_pem.decode(), verify=True)["signature_verified"] is False
+
+
+def test_pinned_algorithms(rsa_key, rsa_public_pem):
+    token = hs256_token({"sub": "alice"}, b"s3cret")
+    pinned = jwt.decode(token, "s3cret", verify=True, algorithms=("RS256",))
+    assert pinned["signature_verified"] is False
+    assert "not allowed" in pinned["signature_error"]
+    assert jwt.decode(token, "s3cret", verify=True, algorithms=("HS256",))["signature_verified"] is True
+
+    rs_token = rs256_token({"sub": "bob"}, rsa_key)
+    assert jwt.decode(rs_token, rsa_public_pem, verify=True, algorithms=("RS256",))["signature_verified"]
+
+
+def test_key_type_must_match_family(rsa_public_pem, ec_public_pem):
+    header = b64url_encode(json.dumps({"alg": "ES256"}).encode())
+    token = f"{header}.{b64url_encode(b'{}')}.{b64url_encode(bytes(64))}"
+    result = jwt.decode(token, rsa_public_pem, verify=True)
+    assert result["signature_verified"] is False
+    assert "does not match" in result["signature_error"]
+
+    es384 = f"{b64url_encode(json.dumps({'alg': 'ES384'}).encode())}.e30.{b64url_encode(bytes(96))}"
+    result = jwt.decode(es384, ec_public_pem, verify=True)
+    assert result["signature_verified"] is False
+    assert "secp384r1" in result["signature_error"]
+
+
+def test_none_algorithm_is_unsupported():
+    header = b64url_encode(json.dumps({"alg": "none"}).encode())
+    result = jwt.decode(f"{header}.e30.", "s3cret", verify=True)
+    assert result["signature_verified"] is False
+    assert "Unsupported" in result["signature_error"]
+
+
+def test_audit_stream_finds_tokens_in_order():
+    lines = ["GET / 200\n", f"Authorization: Bearer {JWT_IO_TOKEN}\n", "noise eyJ.not a token\n",
+             f"a={JWT_IO_TOKEN} b={hs256_token({'sub': 'x'}, b'other')}\n"]
+    records = list(jwt.audit_stream(lines, JWT_IO_SECRET, verify=True, workers=1, batch_size=2))
+    assert [record["line"] for record in records] == [2, 4, 4]
+    assert [record["signature_verified"] for record in records] == [True, True, False]
+    assert all("signature" not in record for record in records)
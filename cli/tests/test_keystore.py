@@ -0,0 +1,111 @@
+import hashlib
+import struct
+
+import pytest
+
+from veribits.engines import keystore
+
+
+@pytest.fixture
+def pair(rsa_key, rsa_cert_pem, rsa_private_pem):
+    return keystore.load_pair(rsa_cert_pem, rsa_private_pem)
+
+
+def read_jks(data, password):
+    """Parse a one-entry JKS store, checking its integrity digest"""
+    body, trailer = data[:-20], data[-20:]
+    assert trailer == hashlib.sha1(password.encode("utf-16-be") + b"Mighty Aphrodite" + body).digest()
+    magic, version, count, tag, alias_length = struct.unpack_from(">IIIIH", body)
+    offset = 18
+    alias = body[offset:offset + alias_length].decode()
+    offset += alias_length
+    timestamp, protected_length = struct.unpack_from(">QI", body, offset)
+    offset += 12
+    protected = body[offset:offset + protected_length]
+    offset += protected_length
+    (cert_count,) = struct.unpack_from(">I", body, offset)
+    return {"header": (magic, version, count, tag), "alias": alias, "timestamp": timestamp,
+            "protected": protected, "certs": cert_count}
+
+
+def test_protect_key_known_answer():
+    password, salt, pkcs8 = "changeit", bytes(range(20)), b"\x30\x03\x02\x01\x00" * 9
+    protected = keystore.protect_key(pkcs8, password, salt)
+    secret = password.encode("utf-16-be")
+    payload = protected[-(20 + len(pkcs8) + 20):]
+    assert payload[:20] == salt
+
+    stream, digest = b"", salt
+    while len(stream) < len(pkcs8):
+        digest = hashlib.sha1(secret + digest).digest()
+        stream += digest
+    encrypted = payload[20:20 + len(pkcs8)]
+    assert bytes(a ^ b for a, b in zip(encrypted, stream)) == pkcs8
+    assert payload[-20:] == hashlib.sha1(secret + pkcs8).digest()
+    assert bytes.fromhex("060a2b060104012a02110101") in protected
+
+
+def test_jks_structure(pair, rsa_key, serialization):
+    key, certs = pair
+    data = keystore.jks(key, certs, "Server", "s3cret", timestamp_ms=1234)
+    store = read_jks(data, "s3cret")
+    assert store["header"] == (keystore.JKS_MAGIC, 2, 1, keystore.JKS_PRIVATE_KEY_ENTRY)
+    assert store["alias"] == "server"
+    assert store["timestamp"] == 1234
+    assert store["certs"] == 1
+
+    pkcs8 = rsa_key.private_bytes(serialization.Encoding.DER, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption())
+    payload = store["protected"][-(20 + len(pkcs8) + 20):]
+    assert payload[-20:] == hashlib.sha1("s3cret".encode("utf-16-be") + pkcs8).digest()
+
+
+def test_jks_default_password(pair):
+    key, certs = pair
+    read_jks(keystore.jks(key, certs, "server", ""), keystore.DEFAULT_JKS_PASSWORD)
+
+
+@pytest.mark.parametrize("legacy", [False, True])
+def test_pkcs12_round_trip(pair, rsa_key, legacy):
+    from cryptography.hazmat.primitives.serialization import pkcs12
+
+    key, certs = pair
+    data = keystore.pkcs12(key, certs, "server", "s3cret", legacy=legacy)
+    loaded_key, loaded_cert, extra = pkcs12.load_key_and_certificates(data, b"s3cret")
+    assert loaded_key.private_numbers() == rsa_key.private_numbers()
+    assert loaded_cert == certs[0]
+    assert extra == []
+
+
+def test_convert(rsa_cert_pem, rsa_private_pem):
+    assert keystore.convert(rsa_cert_pem, rsa_private_pem, "jks", "a", "pw")[:4] == b"\xfe\xed\xfe\xed"
+    assert keystore.convert(rsa_cert_pem, rsa_private_pem, "pkcs12", "a", "pw")[:1] == b"\x30"
+
+
+def test_mismatched_key_is_rejected(rsa_cert_pem, ec_key, serialization):
+    other = ec_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                 serialization.NoEncryption())
+    with pytest.raises(keystore.KeystoreError, match="No certificate matches"):
+        keystore.load_pair(rsa_cert_pem, other)
+
+
+def test_invalid_pem_is_rejected(rsa_private_pem):
+    with pytest.raises(keystore.KeystoreError, match="Invalid certificate"):
+        keystore.load_pair(b"not a certificate", rsa_private_pem)
+
+
+def test_find_pairs(tmp_path, rsa_cert_pem, rsa_private_pem):
+    (tmp_path / "example.com.crt").write_bytes(rsa_cert_pem)
+    (tmp_path / "example.com.key").write_bytes(rsa_private_pem)
+    (tmp_path / "orphan-cert.pem").write_bytes(rsa_cert_pem)
+    live = tmp_path / "site.test"
+    live.mkdir()
+    (live / "fullchain.pem").write_bytes(rsa_cert_pem * 2)
+    (live / "cert.pem").write_bytes(rsa_cert_pem)
+    (live / "privkey.pem").write_bytes(rsa_private_pem)
+
+    pairs = keystore.find_pairs(str(tmp_path))
+    assert [(name, cert.rsplit("/", 1)[1], key.rsplit("/", 1)[1]) for name, cert, key in pairs] == [
+        ("example.com", "example.com.crt", "example.com.key"),
+        ("site.test", "fullchain.pem", "privkey.pem"),
+    ]
@@ -0,0 +1,94 @@
+import hashlib
+import io
+import itertools
+import tarfile
+
+import pytest
+
+from veribits.engines import magic
+from veribits.engines.magic import SIGNATURES
+
+
+def sample(*parts, filler=b"\xee"):
+    """Bytes carrying each (offset, magic) part, padded with ``filler``"""
+    data = bytearray(filler * max(offset + len(value) for offset, value in parts))
+    for offset, value in parts:
+        data[offset:offset + len(value)] = value
+    return bytes(data) + filler * 16
+
+
+def longest_matches(prefix):
+    """Indexes of the longest signatures ``prefix`` matches, comparing every signature"""
+    lengths = {index: sum(len(value) for _, value in parts)
+               for index, (_, _, _, parts) in enumerate(SIGNATURES)
+               if all(prefix[offset:offset + len(value)] == value for offset, value in parts)}
+    longest = max(lengths.values(), default=None)
+    return {index for index, length in lengths.items() if length == longest} or {None}
+
+
+@pytest.mark.parametrize("index", range(len(SIGNATURES)), ids=[signature[0] for signature in SIGNATURES])
+def test_every_signature_is_detected(index):
+    assert magic.match(sample(*SIGNATURES[index][3])) == index
+
+
+def test_trie_agrees_with_comparing_every_signature():
+    for (_, _, _, first), (_, _, _, second) in itertools.product(SIGNATURES, repeat=2):
+        for parts in (first + second, second + first):
+            prefix = sample(*parts)
+            # Equally long matches at different offsets (Matroska and MP4) may go either way
+            assert magic.match(prefix) in longest_matches(prefix), parts
+
+
+@pytest.mark.parametrize("data, extension", [
+    (b"PK\x03\x04\x14\x00\x06\x00" + bytes(32), "docx"),
+    (b"PK\x03\x04\x0a\x00\x00\x00" + bytes(32), "zip"),
+    (b"RIFF\x24\x00\x00\x00WEBPVP8 ", "webp"),
+    (b"RIFF\x24\x00\x00\x00WAVEfmt ", "wav"),
+    (b"RIFF\x24\x00\x00\x00AVI LIST", "avi"),
+    (b"\x00\x00\x00\x20ftypisom", "mp4"),
+])
+def test_longest_and_secondary_parts_decide(data, extension):
+    assert magic.classify(data)["detected_extension"] == extension
+
+
+def test_unmatched_secondary_part_is_not_a_match():
+    result = magic.classify(b"RIFF\x24\x00\x00\x00XXXX" + bytes(8))
+    assert result["detected_type"] == "Unknown File Type"
+    assert result["magic_number_hex"] == "52494646"
+
+
+def test_empty_text_and_unknown():
+    assert magic.classify(b"")["detected_type"] == "Empty File"
+    text = magic.classify("naïve text\n".encode())
+    assert (text["detected_mime"], text["match_confidence"]) == ("text/plain", "low")
+    # A multi-byte character cut off at the end of the prefix is still text
+    assert magic.is_text("é".encode() * 10 + "é".encode()[:1])
+    assert not magic.is_text(b"text\0with a NUL")
+    assert magic.classify(b"\x01\x02\xff\x00\x05")["detected_type"] == "Unknown File Type"
+
+
+def test_extension_from_name():
+    info = magic.classify(b"\x89PNG\r\n\x1a\n", "photo.PNG")["additional_info"]
+    assert (info["extension_from_name"], info["matches_extension"]) == ("PNG", True)
+    assert magic.classify(b"\x89PNG\r\n\x1a\n", "photo.jpg")["additional_info"]["matches_extension"] is False
+
+
+def test_analyze_paths(tmp_path):
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w", format=tarfile.USTAR_FORMAT) as tar:
+        info = tarfile.TarInfo("hello.txt")
+        info.size = 5
+        tar.addfile(info, io.BytesIO(b"hello"))
+    files = {"archive.tar": archive.getvalue(), "image.png": b"\x89PNG\r\n\x1a\n" + bytes(10000),
+             "empty": b""}
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+
+    records = {record["file"].rsplit("/", 1)[-1]: record
+               for record in magic.analyze_paths([str(tmp_path / name) for name in files], workers=1)}
+    assert records["archive.tar"]["detected_extension"] == "tar"
+    png = records["image.png"]
+    assert png["detected_mime"] == "image/png"
+    assert (png["file_size"], png["file_hash"]) == (10008, hashlib.sha256(files["image.png"]).hexdigest())
+    assert png["source"] == "local"
+    assert records["empty"]["detected_type"] == "Empty File"
@@ -0,0 +1,116 @@
+import hashlib
+import os
+
+import pytest
+
+from veribits import manifest
+from veribits.manifest import Entry, Manifest
+
+CALLS = []
+
+
+def count_lines(path, known, digest, suffix=""):
+    """A manifest worker that records every file it reads"""
+    CALLS.append(os.path.basename(path))
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return {"error": e.strerror}
+    stat = os.stat(path)
+    record = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if digest:
+        record["digest"] = hashlib.sha256(data).hexdigest()
+        if record["digest"] == known:
+            return dict(record, unchanged=True)
+    return dict(record, result={"lines": data.count(b"\n"), "suffix": suffix})
+
+
+@pytest.fixture
+def tree(tmp_path):
+    CALLS.clear()
+    root = tmp_path / "tree"
+    root.mkdir()
+    for name, lines in (("a.txt", 1), ("b.txt", 2)):
+        path = root / name
+        path.write_bytes(b"x\n" * lines)
+        os.utime(path, ns=(10**9, 10**9))
+    return root
+
+
+def run(root, store, **kwargs):
+    paths = sorted(str(path) for path in root.iterdir())
+    return list(manifest.scan(paths, count_lines, ("!",), workers=1, manifest=store, root=str(root), **kwargs))
+
+
+def test_unchanged():
+    stat = type("Stat", (), {"st_size": 10, "st_mtime_ns": 5 * 10**9})()
+    assert manifest.unchanged(Entry(10, 5 * 10**9, "d", {}, 8 * 10**9), stat)
+    assert not manifest.unchanged(Entry(11, 5 * 10**9, "d", {}, 8 * 10**9), stat)
+    assert not manifest.unchanged(Entry(10, 4 * 10**9, "d", {}, 8 * 10**9), stat)
+    # Recorded within RACY_NS of the mtime: the file may have changed in the same tick
+    assert not manifest.unchanged(Entry(10, 5 * 10**9, "d", {}, 6 * 10**9), stat)
+    assert not manifest.unchanged(None, stat)
+
+
+def test_unchanged_files_are_not_read(tree, tmp_path):
+    with Manifest("test", tmp_path / "manifest.sqlite") as store:
+        first = run(tree, store)
+        assert CALLS == ["a.txt", "b.txt"]
+        assert [r["lines"] for r in first] == [1, 2]
+        assert not any(r["reused"] for r in first)
+
+        CALLS.clear()
+        second = run(tree, store)
+    assert CALLS == []
+    assert [(r["lines"], r["suffix"], r["reused"]) for r in second] == [(1, "!", True), (2, "!", True)]
+
+
+def test_touched_but_identical_files_are_not_rescanned(tree, tmp_path):
+    with Manifest("test", tmp_path / "manifest.sqlite") as store:
+        run(tree, store)
+        os.utime(tree / "a.txt", ns=(2 * 10**9, 2 * 10**9))
+        CALLS.clear()
+        records = run(tree, store)
+        assert CALLS == ["a.txt"]
+        assert records[0]["reused"] is True
+        assert store.get(tree / "a.txt").mtime_ns == 2 * 10**9
+
+
+def test_changed_content_is_rescanned(tree, tmp_path):
+    with Manifest("test", tmp_path / "manifest.sqlite") as store:
+        run(tree, store)
+        (tree / "b.txt").write_bytes(b"x\n" * 5)
+        os.utime(tree / "b.txt", ns=(10**9, 10**9))
+        CALLS.clear()
+        records = run(tree, store)
+    assert CALLS == ["b.txt"]
+    assert (records[1]["lines"], records[1]["reused"]) == (5, False)
+
+
+def test_rescan_and_scanner_isolation(tree, tmp_path):
+    path = tmp_path / "manifest.sqlite"
+    with Manifest("test", path) as store:
+        run(tree, store)
+        CALLS.clear()
+        run(tree, store, rescan=True)
+        assert CALLS == ["a.txt", "b.txt"]
+    with Manifest("other-rules", path) as store:
+        CALLS.clear()
+        run(tree, store)
+        assert CALLS == ["a.txt", "b.txt"]
+
+
+def test_deleted_files_are_pruned(tree, tmp_path):
+    with Manifest("test", tmp_path / "manifest.sqlite") as store:
+        run(tree, store)
+        (tree / "a.txt").unlink()
+        run(tree, store)
+        assert list(store.entries(tree)) == [str(tree / "b.txt")]
+
+
+def test_errors_are_reported(tmp_path):
+    missing = str(tmp_path / "missing.txt")
+
+    records = list(manifest.scan([missing], count_lines, workers=1))
+    assert records == [{"file": missing, "error": "No such file or directory"}]
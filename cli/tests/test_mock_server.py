@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from veribits import mock_server
+from veribits.client import VeriBitsClient
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+
+
+def post(url, body, content_type="application/json"):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type}, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        with e:
+            return e.code, json.load(e)
+
+
+def test_every_endpoint_answers(mock_api):
+    for endpoint, build in mock_server.RESPONSES.items():
+        status, body = post(f"{mock_api}{endpoint}", b"{}")
+        # Builders that need input answer 400 like the controllers' validation
+        assert status in (200, 400), endpoint
+        assert body["success"] is (status == 200)
+
+
+def test_errors_are_shaped_like_the_api(mock_api):
+    status, body = post(f"{mock_api}/tools/regex-test", json.dumps({"pattern": "(", "text": "x"}).encode())
+    assert status == 400
+    assert body["error"]["message"].startswith("Invalid regex pattern")
+    assert post(f"{mock_api}/tools/whois", b"{not json")[0] == 400
+    status, body = post(f"{mock_api}/no/such", b"{}")
+    assert (status, body["error"]["message"]) == (404, "Unknown endpoint /no/such")
+
+
+def test_items_sets_list_lengths():
+    server = mock_server.make_server(items=7)
+    data = mock_server.RESPONSES["/bgp/asn/peers"]({"asn": "64500"}, server.config["items"])
+    server.server_close()
+    assert data["ipv4_peer_count"] == len(data["ipv4_peers"]) == 7
+
+
+def test_file_magic_reports_the_uploaded_file(mock_api):
+    data = VeriBitsClient(api_url=mock_api, api_key="").file_magic(PNG, "image.png")
+    assert data["filename"] == "image.png"
+    assert data["file_size"] == len(PNG)
+    assert data["file_hash"] == hashlib.sha256(PNG).hexdigest()
+
+
+def test_file_magic_from_the_async_client(mock_api):
+    pytest.importorskip("aiohttp")
+    from veribits.client.aio import AsyncVeriBitsClient
+
+    async def main():
+        async with AsyncVeriBitsClient(api_url=mock_api, api_key="") as client:
+            return await client.file_magic(PNG, "image.png")
+
+    data = asyncio.run(main())
+    assert (data["file_size"], data["file_hash"]) == (len(PNG), hashlib.sha256(PNG).hexdigest())
+
+
+def test_file_magic_without_a_file(mock_api):
+    status, body = post(f"{mock_api}/file-magic", b"{}")
+    assert (status, body["error"]["message"]) == (400, "No file uploaded")
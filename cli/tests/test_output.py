@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from veribits import output
+from veribits.cli import main
+
+DATA = {
+    "asn": 15169,
+    "meta": {"source": "bgp", "count": 2},
+    "prefixes": [{"prefix": "8.8.8.0/24"}, {"prefix": "8.8.4.0/24"}],
+    "peers": [{"asn": 1}, 2],
+}
+
+
+@pytest.fixture
+def machine_format():
+    """Select a machine format for one test, restoring the table format after"""
+    yield output.configure
+    output.configure("table")
+
+
+def test_flatten():
+    assert output.flatten(DATA) == {
+        "asn": 15169, "meta.source": "bgp", "meta.count": 2,
+        "prefixes": '[{"prefix":"8.8.8.0/24"},{"prefix":"8.8.4.0/24"}]', "peers": '[{"asn":1},2]',
+    }
+    assert output.flatten("plain") == {"value": "plain"}
+
+
+def test_iter_rows():
+    assert list(output.iter_rows(DATA)) == [DATA]
+    assert list(output.iter_rows(DATA, "prefixes")) == DATA["prefixes"]
+    assert list(output.iter_rows(DATA, ("prefixes", "peers"))) == [
+        {"section": "prefixes", "prefix": "8.8.8.0/24"}, {"section": "prefixes", "prefix": "8.8.4.0/24"},
+        {"section": "peers", "asn": 1}, {"section": "peers", "value": 2},
+    ]
+    assert list(output.iter_rows(DATA, "meta.missing")) == []
+
+
+def test_write_csv_uses_the_union_of_keys():
+    stream = io.StringIO()
+    output.write_csv([{"a": 1}, {"b": {"c": 2}}], stream)
+    assert list(csv.reader(io.StringIO(stream.getvalue()))) == [["a", "b.c"], ["1", ""], ["", "2"]]
+
+
+def test_table_format_is_not_emitted(capsys):
+    assert output.emit(DATA) is False
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("format, parse", [
+    ("json", json.loads),
+    ("ndjson", lambda text: [json.loads(line) for line in text.splitlines()]),
+    ("csv", lambda text: list(csv.DictReader(io.StringIO(text)))),
+])
+def test_machine_formats(machine_format, capsys, format, parse):
+    machine_format(format)
+    assert output.emit(DATA, "prefixes") is True
+    written = parse(capsys.readouterr().out)
+    if format == "json":
+        assert written == DATA
+    else:
+        assert [row["prefix"] for row in written] == ["8.8.8.0/24", "8.8.4.0/24"]
+
+
+def test_console_writes_plain_text_to_stderr_in_machine_formats(machine_format, capsys):
+    machine_format("ndjson")
+    output.LazyConsole().print("[bold red]Error:[/] [cyan]bad[/] input [1]")
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == "Error: bad input [1]\n"
+
+
+def test_command_output_is_machine_readable(machine_format):
+    result = CliRunner().invoke(main, ["-o", "json", "ipcalc", "10.0.0.5/31"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["usable_hosts"] == 2
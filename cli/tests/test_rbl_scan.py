@@ -0,0 +1,71 @@
+import ipaddress
+
+import pytest
+
+from veribits import rbl_scan
+from veribits.rbl_scan import ListingSummary, RBLScanError, ScanStats
+
+
+def test_parse_targets_drops_nested_networks():
+    networks = rbl_scan.parse_targets(["192.0.2.0/24", "192.0.2.7", "192.0.2.128/25", " 198.51.100.1 ",
+                                       "2001:db8::/126", "2001:db8::1"])
+    assert [str(network) for network in networks] == ["192.0.2.0/24", "198.51.100.1/32", "2001:db8::/126"]
+
+
+def test_parse_targets_accepts_host_bits():
+    assert rbl_scan.parse_targets(["192.0.2.5/30"]) == [ipaddress.ip_network("192.0.2.4/30")]
+
+
+def test_parse_targets_rejects_invalid_and_oversized_targets():
+    with pytest.raises(RBLScanError, match="Invalid IP address or CIDR: 192.0.2.300"):
+        rbl_scan.parse_targets(["192.0.2.300"])
+    with pytest.raises(RBLScanError, match="more than the limit of 256"):
+        rbl_scan.parse_targets(["192.0.2.0/24", "198.51.100.1"], max_addresses=256)
+    assert len(rbl_scan.parse_targets(["10.0.0.0/16"])) == 1
+
+
+@pytest.mark.parametrize("target, addresses", [
+    ("192.0.2.0/30", ["192.0.2.1", "192.0.2.2"]),
+    ("192.0.2.4/31", ["192.0.2.4", "192.0.2.5"]),
+    ("192.0.2.9/32", ["192.0.2.9"]),
+    ("2001:db8::/127", ["2001:db8::", "2001:db8::1"]),
+])
+def test_expand_skips_network_and_broadcast_addresses(target, addresses):
+    assert list(rbl_scan.expand(rbl_scan.parse_targets([target]))) == addresses
+
+
+def test_expand_is_lazy():
+    addresses = rbl_scan.expand([ipaddress.ip_network("10.0.0.0/8")])
+    assert next(addresses) == "10.0.0.1"
+
+
+def test_scan_keeps_address_order(api_client):
+    addresses = list(rbl_scan.expand(rbl_scan.parse_targets(["192.0.2.0/27"])))
+    stats = ScanStats()
+    results = list(rbl_scan.scan(addresses, concurrency=4, stats=stats))
+    assert [result["ip"] for result in results] == addresses
+    assert all(result["success"] and not result["listed"] for result in results)
+    assert (stats.total, stats.succeeded, stats.listed, stats.cached) == (30, 30, 0, 0)
+
+
+def test_scan_answers_repeats_from_the_cache(api_client, monkeypatch, tmp_path):
+    from veribits.cache import ResponseCache
+
+    monkeypatch.setattr(api_client, "cache", ResponseCache(str(tmp_path / "responses.db")))
+    list(rbl_scan.scan(["192.0.2.1", "192.0.2.2"]))
+    stats = ScanStats()
+    results = list(rbl_scan.scan(["192.0.2.1", "192.0.2.2", "192.0.2.3"], stats=stats))
+    assert [result["cached"] for result in results] == [True, True, False]
+    assert stats.cached == 2
+    api_client.cache.close()
+
+
+def test_listing_summary():
+    summary = ListingSummary(examples=1)
+    summary.add({"ip": "192.0.2.1", "listings": [{"rbl": "b.example"}, {"rbl": "a.example"}]})
+    summary.add({"ip": "192.0.2.2", "listings": [{"rbl": "b.example"}]})
+    summary.add({"ip": "192.0.2.3", "listings": []})
+    assert summary.rows() == [
+        {"rbl": "b.example", "listed_ips": 2, "examples": ["192.0.2.1"]},
+        {"rbl": "a.example", "listed_ips": 1, "examples": ["192.0.2.1"]},
+    ]
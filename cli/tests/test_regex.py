@@ -0,0 +1,56 @@
+import io
+import re
+
+import pytest
+
+from veribits.engines import regex
+
+
+def test_global_matches():
+    result = regex.search("a+", "g", b"caaab aa")
+    assert result["match_count"] == 2
+    assert [(m["match"], m["position"], m["index"]) for m in result["matches"]] == [("aaa", 1, 0), ("aa", 6, 1)]
+    assert result["pattern"] == "/a+/"
+    assert result["timeouts"] == []
+
+
+def test_first_match_only_without_g():
+    assert regex.search("a+", "", b"caaab aa")["match_count"] == 1
+
+
+def test_flags_and_byte_positions():
+    result = regex.search("^b+$", "gim", "é\nBb\n".encode())
+    assert result["pattern"] == "/^b+$/im"
+    assert result["matches"] == [{"match": "Bb", "position": 3, "index": 0}]
+
+
+def test_named_groups():
+    result = regex.search(r"(?<q>['\"]).*?\k<q>", "g", b"say 'hi' and \"yo\"")
+    assert [m["match"] for m in result["matches"]] == ["'hi'", '"yo"']
+
+
+def test_line_mode():
+    result = regex.search("b+", "g", lines=io.BytesIO(b"abb\nb\r\nccc\n"))
+    assert [(m["line"], m["position"]) for m in result["matches"]] == [(1, 1), (2, 4)]
+    assert result["stats"]["lines"] == 3
+
+
+def test_invalid_flags_and_patterns():
+    with pytest.raises(ValueError, match="Unknown regex flag"):
+        regex.compile_pattern("a", "gx")
+    with pytest.raises(re.error):
+        regex.compile_pattern("(", "")
+
+
+def test_budget_stops_catastrophic_backtracking():
+    data = b"ok\n" + b"a" * 40 + b"b\nok"
+    result = regex.search("(a+)+$", "gm", data, budget_ms=20)
+    assert result["timeouts"] == [{"position": 0, "line": None}]
+    assert result["stats"]["budget_ms"] == 20
+
+
+def test_budget_skips_runaway_lines():
+    lines = io.BytesIO(b"aaa\n" + b"a" * 40 + b"b\naa\n")
+    result = regex.search("^(a+)+$", "g", lines=lines, budget_ms=20)
+    assert [m["line"] for m in result["matches"]] == [1, 3]
+    assert result["timeouts"] == [{"position": 4, "line": 2}]
@@ -0,0 +1,179 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from veribits import resilience
+from veribits.errors import APIError
+from veribits.ratelimit import TokenBucket
+from veribits.resilience import CircuitBreaker, CircuitOpenError, Resilience, TransientError
+
+
+@pytest.fixture
+def monotonic(monkeypatch):
+    """A settable time.monotonic() for the breaker and token bucket"""
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_backoff_is_bounded():
+    guard = Resilience(backoff=0.5, max_backoff=3.0)
+    for attempt in range(10):
+        for _ in range(20):
+            assert 0 <= guard.delay(attempt) <= min(3.0, 0.5 * 2 ** attempt)
+
+
+def test_retry_after():
+    guard = Resilience(backoff=0.5)
+    assert 7 <= guard.delay(0, retry_after=7) <= 7.5
+    assert guard.delay(0, retry_after=resilience.MAX_RETRY_AFTER + 1) is None
+
+
+@pytest.mark.parametrize("value, seconds", [("12", 12.0), ("-3", 0.0), ("", None), (None, None), ("soon", None),
+                                            ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0)])
+def test_parse_retry_after(value, seconds):
+    assert resilience.parse_retry_after(value) == seconds
+
+
+def test_retryable():
+    assert [status for status in (200, 400, 404, 429, 500, 502, 503, 504) if resilience.retryable(status)] == [
+        429, 500, 502, 503, 504]
+
+
+def test_attempts():
+    guard = Resilience(retries=3)
+    assert guard.attempts() == 4
+    # Streamed uploads cannot be replayed
+    assert guard.attempts(replayable=False) == 1
+
+
+def test_retry_delay_gives_up_after_the_last_attempt():
+    guard = Resilience(retries=2, backoff=0.01)
+    error = TransientError("Service unavailable", status_code=503)
+    attempts = guard.attempts()
+    assert guard.retry_delay(error, 0, attempts) >= 0
+    assert guard.retry_delay(error, 1, attempts) >= 0
+    with pytest.raises(APIError) as raised:
+        guard.retry_delay(error, 2, attempts)
+    assert type(raised.value) is APIError
+    assert raised.value.status_code == 503
+    assert raised.value.__cause__ is error
+    assert guard.retried == 2
+
+
+def test_long_retry_after_is_reported_not_slept():
+    guard = Resilience(retries=5)
+    error = TransientError("Daily quota exceeded", status_code=429, retry_after=3600)
+    with pytest.raises(APIError):
+        guard.retry_delay(error, 0, guard.attempts())
+
+
+def test_rate_limits_do_not_open_the_circuit():
+    guard = Resilience(retries=100, backoff=0, breaker=CircuitBreaker(threshold=3))
+    for attempt in range(10):
+        guard.retry_delay(TransientError("Too many requests", status_code=429), attempt, 100)
+    assert guard.breaker.failures == 0
+    for attempt in range(3):
+        guard.retry_delay(TransientError("Bad gateway", status_code=502), attempt, 100)
+    assert guard.breaker.state == "open"
+
+
+def test_circuit_breaker(monotonic):
+    breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+    breaker.failure()
+    breaker.before()
+    breaker.failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+
+    monotonic[0] += 30
+    assert breaker.state == "half-open"
+    breaker.before()
+    # Only one trial request while half-open
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+    breaker.success()
+    assert breaker.state == "closed"
+    breaker.before()
+
+
+def test_rate_from_limits():
+    assert resilience.rate_from_limits({"rate_limit": {"requests_per_minute": 30}}) == 0.5
+    assert resilience.rate_from_limits({"requests_per_second": 4}) == 4.0
+    assert resilience.rate_from_limits({}) == resilience.TIER_RATES["anonymous"]
+    assert resilience.rate_from_limits({}, authenticated=True) == resilience.TIER_RATES["api_key"]
+
+
+def test_throttling_is_claimed_once():
+    guard = Resilience()
+    assert guard.before_request() == 0.0
+    assert guard.start_throttling() is True
+    assert guard.start_throttling() is False
+    guard.configure_rate({"requests_per_second": 2}, authenticated=False)
+    assert guard.limiter.rate == 2.0
+    assert guard.start_throttling() is False
+
+
+def test_token_bucket_spaces_requests(monotonic):
+    bucket = TokenBucket(rate=2, burst=2)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    monotonic[0] += 1.5
+    assert bucket.reserve() == 0.0
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+@pytest.fixture
+def flaky_api():
+    """A server answering 503 to the first ``failures[0]`` requests, then success"""
+    failures, seen = [2], []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            seen.append(self.path)
+            status, body = (503, {"error": "Service unavailable"}) if len(seen) <= failures[0] else \
+                (200, {"success": True, "data": {"attempt": len(seen)}})
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/v1", failures, seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_retries_transient_failures(flaky_api):
+    from veribits.client.sync import VeriBitsClient
+
+    url, _, seen = flaky_api
+    guard = Resilience(retries=2, backoff=0)
+    client = VeriBitsClient(api_url=url, api_key="", resilience=guard)
+    assert client.request("/tools/whois", "POST", {"query": "example.com"})["data"] == {"attempt": 3}
+    assert len(seen) == 3
+    assert guard.retried == 2
+
+
+def test_client_gives_up_after_the_configured_retries(flaky_api, monkeypatch):
+    from veribits.client.sync import VeriBitsClient
+
+    url, failures, seen = flaky_api
+    failures[0] = 5
+    monkeypatch.setenv("VERIBITS_RETRIES", "1")
+    client = VeriBitsClient(api_url=url, api_key="")
+    assert client.resilience.retries == 1
+    client.resilience.backoff = 0
+    with pytest.raises(APIError) as raised:
+        client.request("/tools/whois", "POST", {"query": "example.com"})
+    assert raised.value.status_code == 503
+    assert len(seen) == 2
@@ -0,0 +1,37 @@
+import pytest
+from click.testing import CliRunner
+
+from veribits import settings
+from veribits.cli import main
+
+
+def test_defaults(monkeypatch):
+    for name in ("VERIBITS_TIMEOUT", "VERIBITS_RETRIES", "VERIBITS_RATE"):
+        monkeypatch.delenv(name, raising=False)
+    assert settings.timeout() == settings.DEFAULT_TIMEOUT
+    assert settings.retries() == settings.DEFAULT_RETRIES
+    assert settings.rate() is None
+
+
+def test_values_are_read_when_used(monkeypatch):
+    monkeypatch.setenv("VERIBITS_TIMEOUT", "2.5")
+    monkeypatch.setenv("VERIBITS_RETRIES", "0")
+    monkeypatch.setenv("VERIBITS_RATE", "4")
+    assert (settings.timeout(), settings.retries(), settings.rate()) == (2.5, 0, 4.0)
+
+
+@pytest.mark.parametrize("name, value, message", [
+    ("VERIBITS_TIMEOUT", "abc", "VERIBITS_TIMEOUT must be a number of at least 0, got 'abc'"),
+    ("VERIBITS_RETRIES", "1.5", "VERIBITS_RETRIES must be an integer of at least 0, got '1.5'"),
+    ("VERIBITS_RATE", "-1", "VERIBITS_RATE must be a number of at least 0, got '-1'"),
+])
+def test_invalid_values_exit_with_an_error(monkeypatch, name, value, message):
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError):
+        {"VERIBITS_TIMEOUT": settings.timeout, "VERIBITS_RETRIES": settings.retries,
+         "VERIBITS_RATE": settings.rate}[name]()
+
+    result = CliRunner().invoke(main, ["ipcalc", "10.0.0.0/30"])
+    assert result.exit_code == 1
+    assert f"Error: {message}" in result.output
+    assert "Traceback" not in result.output
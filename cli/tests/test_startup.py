@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CLI_ROOT = Path(__file__).resolve().parent.parent
+
+# Generous enough for a loaded CI machine; the benchmark holds the tight budget
+BUDGET_SECONDS = 2.0
+
+HEAVY_MODULES = {"requests", "rich", "numpy", "aiohttp", "cryptography"}
+
+
+def test_version_does_not_import_heavy_modules():
+    env = dict(os.environ, PYTHONPATH=str(CLI_ROOT) + os.pathsep + os.getenv("PYTHONPATH", ""))
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "veribits.cli", "--version"],
+                            capture_output=True, text=True, cwd=CLI_ROOT, env=env)
+    elapsed = time.perf_counter() - started
+    assert result.returncode == 0, result.stderr
+    assert "version" in result.stdout
+
+    imported = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            imported.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    assert imported, "no -X importtime output"
+    assert not imported & HEAVY_MODULES
+    assert elapsed < BUDGET_SECONDS
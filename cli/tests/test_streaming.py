@@ -0,0 +1,64 @@
+import hashlib
+import re
+
+import pytest
+
+from veribits import streaming
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"".join(b"line %03d token\n" % n for n in range(1, 101)))
+    return path
+
+
+def test_read_prefix(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 40)
+    assert streaming.read_prefix(path) == (bytes(range(256)) * 40)[:streaming.MAGIC_PREFIX_BYTES]
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    assert streaming.read_prefix(empty) == b""
+
+
+@pytest.mark.parametrize("size", [0, 1, streaming.HASH_BLOCK_BYTES + 7])
+def test_file_digest(tmp_path, size):
+    path = tmp_path / "data.bin"
+    data = bytes(n % 251 for n in range(size))
+    path.write_bytes(data)
+    assert streaming.file_digest(path) == hashlib.sha256(data).hexdigest()
+    assert streaming.file_digest(path, "md5") == hashlib.md5(data).hexdigest()
+
+
+def test_line_chunks_cover_the_file(text_file):
+    data = text_file.read_bytes()
+    chunks = list(streaming.iter_line_chunks(text_file, chunk_bytes=100))
+    assert len(chunks) > 10
+    assert "".join(text for _, _, text in chunks).encode() == data
+    for first_line, offset, text in chunks:
+        assert len(text) <= 100
+        assert text.startswith("line %03d" % first_line)
+        assert data[offset:offset + len(text)] == text.encode()
+
+
+def test_long_lines_become_their_own_chunk(tmp_path):
+    path = tmp_path / "long.txt"
+    path.write_bytes(b"a\n" + b"b" * 500 + b"\nc\n")
+    chunks = list(streaming.iter_line_chunks(path, chunk_bytes=10, decode=False))
+    assert chunks == [(1, 0, b"a\n"), (2, 2, b"b" * 500 + b"\n"), (3, 503, b"c\n")]
+
+
+def test_scan_chunked_maps_findings_to_whole_file_positions(text_file):
+    def scan(text):
+        found = [{"type": "Token", "line": text.count("\n", 0, m.start()) + 1, "position": m.start()}
+                 for m in re.finditer("token", text)]
+        return {"secrets_found": len(found), "secrets": found}
+
+    data = text_file.read_text()
+    result = streaming.scan_chunked(text_file, scan, chunk_bytes=256, concurrency=3)
+    assert result["chunks"] > 1
+    assert result["secrets_found"] == 100
+    assert result["risk_level"] == "high"
+    assert [s["line"] for s in result["secrets"]] == list(range(1, 101))
+    assert [s["position"] for s in result["secrets"]] == [m.start() for m in re.finditer("token", data)]
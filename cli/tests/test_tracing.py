@@ -0,0 +1,103 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from veribits import tracing
+from veribits.cli import main
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    yield
+    tracing.finish()
+
+
+def test_disabled_tracing_records_nothing():
+    assert not tracing.enabled()
+    with tracing.span("GET /x", tracing.KIND_CLIENT) as span:
+        assert span is None
+    tracing.phase("ttfb", 0.0, 1.0)
+    assert tracing.finish() == []
+
+
+def test_spans_nest_under_the_current_span():
+    tracing.enable("veribits whois", command="whois")
+    with tracing.span("POST /tools/whois", tracing.KIND_CLIENT, **{"http.request.method": "POST"}) as request:
+        tracing.phase("connect", 1.0, 1.25)
+        with tracing.span("render"):
+            pass
+    spans = tracing.finish()
+    root, connect, render, client = spans
+    assert root.name == "veribits whois" and root.parent is None
+    assert client is request and client.parent is root
+    assert connect.parent is client and connect.duration_ms == 250.0
+    assert render.parent is client
+    assert tracing.current() is root
+    assert not tracing.enabled()
+
+
+def test_errors_mark_the_span():
+    tracing.enable("veribits")
+    with pytest.raises(RuntimeError):
+        with tracing.span("POST /x", tracing.KIND_CLIENT):
+            raise RuntimeError("connection reset")
+    with pytest.raises(SystemExit):
+        with tracing.span("render"):
+            raise SystemExit(1)
+    _, failed, exited = tracing.finish()
+    assert failed.error == "connection reset"
+    assert exited.error is None
+
+
+def test_summarize():
+    tracing.enable("veribits batch")
+    for cache in ("miss", "hit", "miss"):
+        with tracing.span("POST /x", tracing.KIND_CLIENT, **{"veribits.cache": cache}):
+            tracing.phase("ttfb", 1.0, 1.002)
+    tracing.phase("render", 2.0, 2.010)
+    summary = tracing.summarize(tracing.finish())
+    assert summary["command"] == "veribits batch"
+    assert (summary["requests"], summary["cached"]) == (3, 1)
+    assert [row["phase"] for row in summary["phases"]] == ["ttfb", "render"]
+    ttfb = summary["phases"][0]
+    assert ttfb["count"] == 3
+    assert ttfb["mean_ms"] == pytest.approx(2.0, abs=0.01)
+
+
+def test_otlp_encoding():
+    tracing.enable("veribits", **{"process.command_args": "whois", "veribits.retries": 2})
+    with tracing.span("POST /x", tracing.KIND_CLIENT, **{"http.response.status_code": 200, "skip": None}):
+        pass
+    spans = tracing.finish()
+    resource_spans = tracing.to_otlp(spans)["resourceSpans"][0]
+    assert {"key": "service.name", "value": {"stringValue": "veribits-cli"}} in resource_spans["resource"]["attributes"]
+    root, client = resource_spans["scopeSpans"][0]["spans"]
+    assert len(root["traceId"]) == 32 and root["traceId"] == client["traceId"]
+    assert "parentSpanId" not in root
+    assert client["parentSpanId"] == root["spanId"]
+    assert client["kind"] == tracing.KIND_CLIENT
+    assert client["attributes"] == [{"key": "http.response.status_code", "value": {"intValue": "200"}}]
+    assert client["status"] == {"code": tracing.STATUS_OK}
+    assert int(root["endTimeUnixNano"]) >= int(client["endTimeUnixNano"]) >= int(client["startTimeUnixNano"])
+
+
+def test_export_appends_one_line_per_run(tmp_path):
+    path = tmp_path / "trace.json"
+    for _ in range(2):
+        tracing.enable("veribits")
+        tracing.export(tracing.finish(), path)
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert all("resourceSpans" in json.loads(line) for line in lines)
+
+
+def test_trace_option_exports_request_spans(api_client, tmp_path):
+    path = tmp_path / "trace.json"
+    result = CliRunner().invoke(main, ["--trace", str(path), "whois", "example.com"])
+    assert result.exit_code == 0, result.output
+    (line,) = path.read_text().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    names = [span["name"] for span in spans]
+    assert "POST /tools/whois" in names
+    assert "ttfb" in names and "render" in names
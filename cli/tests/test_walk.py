@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from veribits.walk import walk
+
+CLI_ROOT = Path(__file__).resolve().parent.parent
+
+
+def files(root, **kwargs):
+    return [os.path.relpath(path, root).replace(os.sep, "/") for path in walk(str(root), **kwargs)]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ("a.txt", "debug.log", "keep.log", "build/out.o", "docs/build/page.html", "src/z.py",
+                 "src/a.py", "src/cache/x.bin", "src/deep/nested/tmp.swp", ".git/config", "top.cfg"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+    (tmp_path / ".gitignore").write_text("# comment\n*.log\n!keep.log\n/build/\n**/*.swp\n/top.cfg\n")
+    (tmp_path / "src" / ".gitignore").write_text("cache/\nz.py\n")
+    return tmp_path
+
+
+def test_gitignore_rules(tree):
+    # A directory's files come before its subdirectories, each in sorted order
+    assert files(tree) == [".gitignore", "a.txt", "keep.log", "docs/build/page.html", "src/.gitignore",
+                           "src/a.py"]
+
+
+def test_without_gitignore_only_git_is_skipped(tree):
+    walked = files(tree, gitignore=False)
+    assert len(walked) == 12
+    assert not any(path.startswith(".git/") for path in walked)
+
+
+def test_symlinks_are_skipped(tree):
+    try:
+        os.symlink(tree / "a.txt", tree / "link.txt")
+    except OSError:
+        pytest.skip("symlinks are not supported here")
+    assert "link.txt" not in files(tree)
+
+
+def test_magic_engine_does_not_load_the_secret_rules():
+    code = "import sys, veribits.engines.magic; print('veribits.engines.secrets' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=CLI_ROOT, check=True)
+    assert result.stdout.strip() == "False"
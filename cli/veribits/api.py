@@ -0,0 +1,55 @@
+"""
+VeriBits API transport used by the CLI commands
+
+call() performs a single request against the API and raises APIError on
+failure, leaving presentation and process exit to the caller.
+"""
+
+import os
+import threading
+
+from .settings import API_KEY, API_URL, DEFAULT_API_URL  # noqa: F401
+
+CACHE_MODES = ("use", "refresh", "off")
+
+_client = None
+_client_lock = threading.Lock()
+DEFAULT_CACHE_MODE = "off" if os.getenv("VERIBITS_CACHE", "1") == "0" else "use"
+_cache_mode = DEFAULT_CACHE_MODE
+
+
+def configure(cache_mode=None):
+    """Set how the default client uses the response cache: use, refresh or off"""
+    global _client, _cache_mode
+    if cache_mode is not None and cache_mode != _cache_mode:
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {cache_mode}")
+        _cache_mode = cache_mode
+        _client = None
+
+
+def open_cache(refresh=False):
+    """Open the on-disk response cache for the configured API URL and key"""
+    from .cache import ResponseCache, cache_namespace
+
+    return ResponseCache(namespace=cache_namespace(API_URL, API_KEY), refresh=refresh)
+
+
+def default_client():
+    """Return the client configured from VERIBITS_API_URL / VERIBITS_API_KEY"""
+    global _client
+    if _client is None:
+        from .client.sync import VeriBitsClient
+
+        with _client_lock:
+            if _client is None:
+                cache = None
+                if _cache_mode != "off":
+                    cache = open_cache(refresh=_cache_mode == "refresh")
+                _client = VeriBitsClient(cache=cache)
+    return _client
+
+
+def call(endpoint, method="GET", data=None, files=None):
+    """Make API request to VeriBits and return the decoded JSON response"""
+    return default_client().request(endpoint, method, data, files)
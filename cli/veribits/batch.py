@@ -0,0 +1,98 @@
+"""
+Batch execution of single-input commands with bounded concurrency
+
+Requests are fanned out over a thread pool sharing the pooled session.
+Results are yielded in input order while only a bounded window of
+requests is kept in flight, so very large input files stream through
+without being loaded into memory.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import payloads
+from .api import call, default_client
+from .errors import APIError
+from .session import configure_session, pool_size
+
+
+class BatchStats:
+    """Counters for a batch run
+
+    ``coalesced`` counts duplicate requests that shared an identical
+    request already in flight instead of being sent.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def throughput(self):
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def read_inputs(stream):
+    """Yield non-empty, non-comment lines from a text stream"""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def run_one(command, value, options):
+    """Run a single command and return its result record instead of raising"""
+    endpoint, method, payload = payloads.SINGLE_INPUT[command](value, **options)
+    try:
+        result = call(endpoint, method, payload)
+        return {"input": value, "success": True, "data": result.get("data", {})}
+    except APIError as e:
+        return {
+            "input": value,
+            "success": False,
+            "error": e.detail or str(e),
+            "status_code": e.status_code,
+        }
+
+
+def run_batch(command, inputs, concurrency=8, options=None, stats=None):
+    """Yield one result record per input, preserving input order"""
+    options = options or {}
+    stats = stats if stats is not None else BatchStats()
+    configure_session(pool_size=max(pool_size(), concurrency))
+    coalescer = default_client().coalescer
+    saved = coalescer.saved
+
+    window = concurrency * 4
+    pending = deque()
+
+    def collect(future):
+        record = future.result()
+        stats.total += 1
+        if record["success"]:
+            stats.succeeded += 1
+        else:
+            stats.failed += 1
+        return record
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for value in inputs:
+            pending.append(executor.submit(run_one, command, value, options))
+            if len(pending) >= window:
+                yield collect(pending.popleft())
+
+        while pending:
+            yield collect(pending.popleft())
+
+    stats.coalesced = coalescer.saved - saved
+    stats.finished = time.perf_counter()
@@ -0,0 +1,228 @@
+"""
+Benchmark scenarios for ``veribits bench``
+
+Each scenario drives the real client (pooled session, retries disabled,
+no response cache) against the local mock API started from
+veribits.mock_server, or against ``api_url`` when given. Scenarios run in
+a fresh process each, so the reported peak RSS belongs to that scenario
+alone, and the mock server runs in its own process so it does not
+compete with the client for the GIL.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from . import __version__, payloads
+from .errors import APIError
+
+SCENARIOS = {
+    "single": "Sequential DNS lookups, one request at a time",
+    "batch": "WHOIS lookups fanned out over the connection pool",
+    "bgp-downstreams": "Large BGP downstream lists (--items entries each)",
+    "secrets": "Secret scans of a large generated text file",
+}
+
+# Secret-like tokens planted in the generated scan text, one per this many lines
+SECRET_EVERY = 1000
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of sorted ``values``"""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * q // 100))
+    return values[int(rank) - 1]
+
+
+def latency_summary(seconds):
+    """p50/p95/p99/mean/max in milliseconds"""
+    values = sorted(s * 1000 for s in seconds)
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "mean": round(sum(values) / len(values), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def secrets_text(size_mb):
+    """Deterministic config-like text of about ``size_mb`` MB with planted secrets"""
+    lines = []
+    size = 0
+    target = int(size_mb * 1024 * 1024)
+    n = 0
+    while size < target:
+        if n % SECRET_EVERY == 0:
+            line = f"aws_access_key_id = AKIA{n:016d}\n"
+        else:
+            line = f"setting_{n} = \"value-{n:08x}-lorem-ipsum-dolor-sit-amet\"\n"
+        lines.append(line)
+        size += len(line)
+        n += 1
+    return "".join(lines)
+
+
+def _requests(name, count, options):
+    """The (endpoint, method, payload) tuples a scenario sends"""
+    if name == "single":
+        return [payloads.dns(f"host{n}.bench.invalid") for n in range(count)]
+    if name == "batch":
+        return [payloads.whois(f"domain{n}.bench.invalid") for n in range(count)]
+    if name == "bgp-downstreams":
+        return [payloads.bgp_downstreams(str(64512 + n)) for n in range(count)]
+    if name == "secrets":
+        text = secrets_text(options["secrets_mb"])
+        return [payloads.secrets(text)] * count
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def run_scenario(name, api_url, options):
+    """Run one scenario in this process and return its result dict"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .client.sync import VeriBitsClient
+    from .resilience import Resilience
+    from .session import configure_session
+
+    if name == "batch":
+        count, concurrency = options["requests"], options["concurrency"]
+    elif name == "single":
+        count, concurrency = options["requests"], 1
+    else:
+        # Heavy payloads: fewer, sequential requests
+        count, concurrency = max(1, options["requests"] // 20), 1
+
+    calls = _requests(name, count, options)
+    configure_session(pool_size=concurrency)
+    client = VeriBitsClient(api_url, "", resilience=Resilience(retries=0))
+
+    def timed(call):
+        endpoint, method, payload = call
+        start = time.perf_counter()
+        try:
+            client.request(endpoint, method, payload)
+        except APIError:
+            return None
+        return time.perf_counter() - start
+
+    # Warm the connection pool so connects are not billed to the first calls
+    timed(calls[0])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        timings = list(executor.map(timed, calls))
+    elapsed = time.perf_counter() - start
+
+    latencies = [t for t in timings if t is not None]
+    result = {
+        "name": name,
+        "requests": count,
+        "concurrency": concurrency,
+        "errors": count - len(latencies),
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": latency_summary(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if name == "secrets":
+        result["payload_mb"] = options["secrets_mb"]
+    if name == "bgp-downstreams":
+        result["items"] = options["items"]
+    return result
+
+
+def _run_isolated(name, api_url, options):
+    """Run a scenario in a fresh interpreter so its peak RSS is its own"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_scenario, name, api_url, options).result()
+
+
+class MockServer:
+    """The mock API in a child process, for use as a context manager"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, items=100):
+        self.args = ["--latency", str(latency_ms), "--jitter", str(jitter_ms), "--items", str(items)]
+        self.process = None
+        self.url = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen([sys.executable, "-m", "veribits.mock_server", *self.args],
+                                        stdout=subprocess.PIPE, text=True, env=_child_env())
+        self.url = self.process.stdout.readline().strip()
+        if not self.url:
+            self.process.wait()
+            raise RuntimeError("Mock API server failed to start")
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait()
+        self.process.stdout.close()
+
+
+def _child_env():
+    # Make the package importable in children however the CLI was launched
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.environ.get("PYTHONPATH")
+    return dict(os.environ, PYTHONPATH=package_root + (os.pathsep + path if path else ""))
+
+
+def run(scenarios, options, api_url=None, isolate=True, progress=None):
+    """Run ``scenarios`` and return the report dict
+
+    ``options`` holds requests, concurrency, items, latency_ms, jitter_ms
+    and secrets_mb. ``progress`` is called with each scenario name before
+    it starts.
+    """
+    report = {
+        "veribits": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "server": {"mock": api_url is None},
+        "options": dict(options),
+        "scenarios": [],
+    }
+    runner = _run_isolated if isolate else run_scenario
+
+    def run_all(url):
+        report["server"]["url"] = url
+        for name in scenarios:
+            if progress is not None:
+                progress(name)
+            report["scenarios"].append(runner(name, url, options))
+
+    if api_url is not None:
+        run_all(api_url)
+    else:
+        with MockServer(options["latency_ms"], options["jitter_ms"], options["items"]) as server:
+            run_all(server.url)
+    return report
+
+
+def save(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,223 @@
+"""
+Persistent on-disk response cache
+
+Responses for slowly changing lookups (BGP, WHOIS, DNS, ...) are stored in
+a SQLite database keyed by API URL, API key, endpoint and canonical JSON
+payload, so one key's or account's answers are never served to another.
+Each endpoint has its own TTL; DNS answers are kept for the smallest TTL
+among the returned records. The database is bounded in size and evicts
+least recently used entries first.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .coalesce import request_key
+from .settings import cache_dir
+
+DEFAULT_MAX_MB = 64
+
+# Seconds to keep a successful response, per endpoint
+ENDPOINT_TTLS = {
+    "/bgp/prefix": 6 * 3600,
+    "/bgp/asn": 24 * 3600,
+    "/bgp/asn/prefixes": 6 * 3600,
+    "/bgp/asn/peers": 6 * 3600,
+    "/bgp/asn/upstreams": 6 * 3600,
+    "/bgp/asn/downstreams": 6 * 3600,
+    "/bgp/search": 24 * 3600,
+    "/tools/whois": 24 * 3600,
+    "/tools/dns-validate": 300,
+    "/tools/rbl-check": 900,
+    "/tools/ip-calculate": 30 * 24 * 3600,
+    "/crypto/validate/bitcoin": 30 * 24 * 3600,
+    "/crypto/validate/ethereum": 30 * 24 * 3600,
+}
+
+# DNS lookups that return no records are retried sooner
+DNS_NEGATIVE_TTL = 60
+
+
+def default_cache_path():
+    """Return the cache database path, honoring VERIBITS_CACHE_DIR and XDG_CACHE_HOME"""
+    return Path(cache_dir()) / "responses.sqlite"
+
+
+def cache_namespace(api_url, api_key=""):
+    """Namespace separating the responses of each API URL and key; the key is stored only as a hash"""
+    if not api_key:
+        return api_url
+    return f"{api_url}\0{hashlib.sha256(api_key.encode()).hexdigest()}"
+
+
+def response_ttl(endpoint, payload, response):
+    """Return how long to keep a response, or None if it must not be cached"""
+    ttl = ENDPOINT_TTLS.get(endpoint)
+    if ttl is None:
+        return None
+
+    if endpoint == "/crypto/validate/bitcoin" or endpoint == "/crypto/validate/ethereum":
+        return ttl if (payload or {}).get("type") == "address" else None
+
+    if endpoint == "/tools/dns-validate":
+        records = response.get("data", {}).get("records", [])
+        ttls = [r["ttl"] for r in records if isinstance(r.get("ttl"), (int, float))]
+        if not records:
+            return DNS_NEGATIVE_TTL
+        return min(ttls) if ttls else ttl
+
+    return ttl
+
+
+class ResponseCache:
+    """SQLite-backed TTL + LRU cache of decoded API responses"""
+
+    def __init__(self, path=None, max_bytes=None, namespace="", refresh=False):
+        self.path = Path(path) if path else default_cache_path()
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("VERIBITS_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        self._total_bytes = self._stored_bytes()
+
+    def key(self, endpoint, payload):
+        return hashlib.sha256(f"{self.namespace}\0{request_key(endpoint, payload)}".encode()).hexdigest()
+
+    def cacheable(self, endpoint):
+        return endpoint in ENDPOINT_TTLS
+
+    def get(self, endpoint, payload):
+        """Return the cached response, or None on a miss"""
+        if not self.cacheable(endpoint) or self.refresh:
+            return None
+
+        key = self.key(endpoint, payload)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                self._bump("misses")
+                return None
+
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            self._bump("hits")
+        return json.loads(row[0])
+
+    def put(self, endpoint, payload, response):
+        """Store a successful response if its endpoint is cacheable"""
+        ttl = response_ttl(endpoint, payload, response)
+        if not ttl:
+            return
+
+        body = json.dumps(response, separators=(",", ":")).encode()
+        if len(body) > self.max_bytes:
+            return
+
+        key = self.key(endpoint, payload)
+        now = time.time()
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, size, expires, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, len(body), now + ttl, now),
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _stored_bytes(self):
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones down to 90% of the limit"""
+        self._db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        total = self._stored_bytes()
+        target = int(self.max_bytes * 0.9)
+
+        stale = []
+        if total > target:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC"
+            ).fetchall()
+            for key, size in rows:
+                if total <= target:
+                    break
+                stale.append((key,))
+                total -= size
+            self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+        self._total_bytes = total
+
+    def _bump(self, name):
+        self._db.execute(
+            "INSERT INTO stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,)
+        )
+
+    def stats(self):
+        """Return persisted totals plus counters for this process"""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            totals = dict(self._db.execute("SELECT name, value FROM stats").fetchall())
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": totals.get("hits", 0),
+            "misses": totals.get("misses", 0),
+            "session_hits": self.hits,
+            "session_misses": self.misses,
+        }
+
+    def clear(self):
+        """Remove all cached responses and reset statistics"""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.execute("DELETE FROM stats")
+            self._db.execute("VACUUM")
+            self._total_bytes = 0
+
+    def close(self):
+        self._db.close()
@@ -4,85 +4,141 @@ VeriBits CLI - Command-line interface for all VeriBits tools
 """
 
 import click
-import requests
+import csv
+import inspect
 import json
 import sys
-from rich.console import Console
-from rich.table import Table
-from rich.syntax import Syntax
-from rich.panel import Panel
+import time
+from collections import Counter
 from pathlib import Path
 import os
 
-console = Console()
+from . import api, output, payloads, tracing
+from .api import API_URL, API_KEY, call
+from .errors import APIError
+from .output import LazyConsole, Panel, Syntax, Table
 
-# Default API endpoint
-DEFAULT_API_URL = "https://veribits.com/api/v1"
-API_URL = os.getenv("VERIBITS_API_URL", DEFAULT_API_URL)
-API_KEY = os.getenv("VERIBITS_API_KEY", "")
+console = LazyConsole()
 
 
 def api_request(endpoint, method="GET", data=None, files=None):
-    """Make API request to VeriBits"""
-    url = f"{API_URL}{endpoint}"
-    headers = {}
-
-    if API_KEY:
-        headers["Authorization"] = f"Bearer {API_KEY}"
-
+    """Make API request to VeriBits, exiting with an error message on failure"""
     try:
-        if method == "GET":
-            response = requests.get(url, headers=headers)
-        elif method == "POST":
-            if files:
-                response = requests.post(url, headers=headers, files=files)
-            else:
-                headers["Content-Type"] = "application/json"
-                response = requests.post(url, headers=headers, json=data)
-
-        response.raise_for_status()
-        return response.json()
-
-    except requests.exceptions.RequestException as e:
+        return call(endpoint, method, data, files)
+    except APIError as e:
         console.print(f"[bold red]Error:[/] {str(e)}")
-        if hasattr(e, 'response') and e.response is not None:
-            try:
-                error_data = e.response.json()
-                console.print(f"[red]{error_data.get('error', {}).get('message', 'Unknown error')}[/]")
-            except:
-                pass
+        if e.detail:
+            console.print(f"[red]{e.detail}[/]")
         sys.exit(1)
 
 
 @click.group()
 @click.version_option(version="1.0.0")
-def main():
+@click.option("--no-cache", is_flag=True, help="Bypass the local response cache")
+@click.option("--refresh", is_flag=True, help="Ignore cached responses and fetch fresh ones")
+@click.option("--output", "-o", "output_format", type=click.Choice(output.FORMATS),
+              default="table", envvar="VERIBITS_OUTPUT", show_default=True,
+              help="Output format; json, ndjson and csv write raw results to stdout")
+@click.option("--timings", is_flag=True,
+              help="Print time spent connecting, waiting, downloading, decoding and rendering")
+@click.option("--trace", "trace_path", type=click.Path(dir_okay=False), envvar="VERIBITS_TRACE",
+              help="Append this run's spans to a file as OpenTelemetry (OTLP/JSON) traces")
+def main(no_cache, refresh, output_format, timings, trace_path):
     """VeriBits CLI - Professional security and developer tools"""
-    pass
+    from . import settings
+    from .session import pool_size
+
+    try:
+        pool_size()
+        settings.timeout()
+        settings.retries()
+        settings.rate()
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+    output.configure(output_format)
+    api.configure(cache_mode="off" if no_cache else "refresh" if refresh else api.DEFAULT_CACHE_MODE)
+    if timings or trace_path:
+        ctx = click.get_current_context()
+        tracing.enable(f"veribits {ctx.invoked_subcommand}", **{"veribits.output": output_format})
+        ctx.call_on_close(lambda: _finish_tracing(timings, trace_path))
+
+
+def _finish_tracing(timings, trace_path):
+    """Export the run's spans and print the --timings summary"""
+    spans = tracing.finish()
+    if not spans:
+        return
+    err_console = LazyConsole(stderr=True)
+    if trace_path:
+        try:
+            tracing.export(spans, trace_path)
+        except OSError as e:
+            err_console.print(f"[bold red]Error:[/] Could not write trace: {e}")
+    if not timings:
+        return
+
+    summary = tracing.summarize(spans)
+    table = Table(title=f"Timings: {summary['command']}")
+    table.add_column("Phase", style="cyan")
+    table.add_column("Count", justify="right")
+    table.add_column("Total ms", justify="right", style="yellow")
+    table.add_column("Mean ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    for row in summary["phases"]:
+        table.add_row(row["phase"], str(row["count"]), f"{row['total_ms']:.1f}",
+                      f"{row['mean_ms']:.2f}", f"{row['max_ms']:.1f}")
+    err_console.print(table)
+    err_console.print(f"[bold]Total:[/] {summary['total_ms']:.1f} ms, {summary['requests']} request(s), "
+                      f"{summary['cached']} from cache")
+
+
+def _jwt_key(secret, key_file):
+    """Return the verification key: PEM file contents or the shared secret"""
+    if key_file:
+        with open(key_file, "rb") as f:
+            return f.read()
+    return secret
 
 
 @main.command()
 @click.argument("token")
 @click.option("--secret", "-s", help="Secret key for signature verification")
+@click.option("--key-file", "-k", type=click.Path(exists=True, dir_okay=False),
+              help="PEM public key or certificate for RS*/PS*/ES* verification")
 @click.option("--verify", is_flag=True, help="Verify token signature")
-def jwt_decode(token, secret, verify):
+@click.option("--algorithm", "-a", "algorithms", multiple=True, type=click.Choice(payloads.JWT_ALGORITHMS),
+              help="Accept only this algorithm instead of trusting the token header (repeatable)")
+@click.option("--remote", is_flag=True, help="Decode with the API instead of locally")
+def jwt_decode(token, secret, key_file, verify, algorithms, remote):
     """Decode and verify JWT token"""
+    from .engines import jwt as jwt_engine
+
     console.print("[bold cyan]Decoding JWT Token...[/]\n")
 
-    result = api_request("/jwt/decode", "POST", {
-        "token": token,
-        "secret": secret or "",
-        "verify_signature": verify
-    })
+    if remote:
+        result = api_request(*payloads.jwt_decode(token, secret, verify))
+        data = result.get("data", {})
+        if verify and algorithms and data.get("algorithm") not in algorithms:
+            data["signature_verified"] = False
+            data["signature_error"] = f"Algorithm {data.get('algorithm')} is not allowed"
+    else:
+        try:
+            data = jwt_engine.decode(token, _jwt_key(secret, key_file), verify, algorithms=algorithms)
+        except jwt_engine.JWTError as e:
+            console.print(f"[bold red]Error:[/] Invalid JWT: {e}")
+            sys.exit(1)
 
-    data = result.get("data", {})
+    if output.emit(data):
+        return
 
     # Display header
     console.print(Panel("[bold]Header", style="cyan"))
     console.print(Syntax(json.dumps(data.get("header", {}), indent=2), "json", theme="monokai"))
 
     # Display payload
-    console.print("\n" + Panel("[bold]Payload", style="cyan"))
+    console.print()
+    console.print(Panel("[bold]Payload", style="cyan"))
     console.print(Syntax(json.dumps(data.get("payload", {}), indent=2), "json", theme="monokai"))
 
     # Display claims
@@ -102,14 +158,19 @@ def jwt_decode(token, secret, verify):
         color = "green" if verified else "red"
         icon = "✅" if verified else "❌"
         console.print(f"\n[bold]Signature Verified:[/] [{color}]{verified} {icon}[/]")
+        if data.get("signature_error"):
+            console.print(f"[red]{data['signature_error']}[/]")
 
 
 @main.command()
 @click.option("--secret", "-s", required=True, help="Secret key for signing")
 @click.option("--payload", "-p", required=True, help="JSON payload")
 @click.option("--expires", "-e", default=3600, help="Expiration time in seconds")
-def jwt_sign(secret, payload, expires):
+@click.option("--remote", is_flag=True, help="Sign with the API instead of locally")
+def jwt_sign(secret, payload, expires, remote):
     """Generate new JWT token"""
+    from .engines import jwt as jwt_engine
+
     console.print("[bold cyan]Generating JWT Token...[/]\n")
 
     try:
@@ -118,14 +179,20 @@ def jwt_sign(secret, payload, expires):
         console.print("[bold red]Error:[/] Invalid JSON payload")
         sys.exit(1)
 
-    result = api_request("/jwt/sign", "POST", {
-        "secret": secret,
-        "payload": payload_data,
-        "expires_in": expires
-    })
+    if remote:
+        result = api_request(*payloads.jwt_sign(secret, payload_data, expires))
+    else:
+        try:
+            result = {"data": jwt_engine.sign(secret, payload_data, expires)}
+        except jwt_engine.JWTError as e:
+            console.print(f"[bold red]Error:[/] {e}")
+            sys.exit(1)
 
     data = result.get("data", {})
 
+    if output.emit(data):
+        return
+
     console.print(Panel(data.get("token", ""), title="Generated JWT Token", style="green"))
     console.print(f"\n[bold]Algorithm:[/] {data.get('algorithm')}")
     console.print(f"[bold]Expires In:[/] {data.get('expires_in')} seconds")
@@ -133,21 +200,123 @@ def jwt_sign(secret, payload, expires):
         console.print(f"[bold]Expires At:[/] {data.get('expires_at')}")
 
 
+@main.command()
+@click.option("--input", "-i", "input_file", type=click.File("r"), default="-",
+              help="Tokens or log lines to audit (default: stdin)")
+@click.option("--secret", "-s", help="Secret key for HS* signature verification")
+@click.option("--key-file", "-k", type=click.Path(exists=True, dir_okay=False),
+              help="PEM public key or certificate for RS*/PS*/ES* verification")
+@click.option("--verify", is_flag=True, help="Verify token signatures")
+@click.option("--algorithm", "-a", "algorithms", multiple=True, type=click.Choice(payloads.JWT_ALGORITHMS),
+              help="Accept only this algorithm instead of trusting token headers (repeatable)")
+@click.option("--workers", "-w", default=None, type=click.IntRange(1, 256),
+              help="Worker processes (default: CPU count)")
+def jwt_audit(input_file, secret, key_file, verify, algorithms, workers):
+    """Audit every JWT found in a token list or access log
+
+    Tokens are decoded locally and written as NDJSON, one record per token
+    with its source line number; a summary is printed to stderr.
+
+    Example:
+
+        veribits jwt-audit -i access.log --verify -k issuer.pem -a RS256 > audit.ndjson
+    """
+    from .engines import jwt as jwt_engine
+
+    err_console = LazyConsole(stderr=True)
+    started = time.perf_counter()
+    counts = {"tokens": 0, "malformed": 0, "expired": 0, "not_yet_valid": 0, "bad_signature": 0}
+
+    for record in jwt_engine.audit_stream(input_file, _jwt_key(secret, key_file), verify, workers,
+                                              algorithms=algorithms):
+        counts["tokens"] += 1
+        claims = record.get("claims", {})
+        counts["malformed"] += "error" in record
+        counts["expired"] += bool(claims.get("expired"))
+        counts["not_yet_valid"] += bool(claims.get("not_yet_valid"))
+        counts["bad_signature"] += verify and "error" not in record and not record.get("signature_verified")
+        sys.stdout.write(json.dumps(record) + "\n")
+
+    elapsed = time.perf_counter() - started
+    err_console.print(f"\n[bold]Tokens:[/] {counts['tokens']} in {elapsed:.2f}s "
+                      f"({counts['tokens'] / elapsed if elapsed else 0:,.0f}/s)")
+    err_console.print(f"[bold]Malformed:[/] {counts['malformed']}")
+    err_console.print(f"[bold]Expired:[/] {counts['expired']}")
+    err_console.print(f"[bold]Not Yet Valid:[/] {counts['not_yet_valid']}")
+    if verify:
+        err_console.print(f"[bold]Bad Signatures:[/] {counts['bad_signature']}")
+
+
+# Matches shown in the table; machine formats get all of them
+REGEX_TABLE_ROWS = 1000
+
+
+def _regex_local(pattern, text, flags, input_path, lines, timeout_ms):
+    """Run the local regex engine over TEXT, a file (memory-mapped) or stdin"""
+    import io
+    import mmap
+    import re
+
+    from .engines import regex as regex_engine
+
+    def search(data=None, stream=None):
+        return regex_engine.search(pattern, flags, data, stream, timeout_ms)
+
+    try:
+        if input_path is None:
+            encoded = text.encode("utf-8")
+            return search(stream=io.BytesIO(encoded)) if lines else search(encoded)
+        if input_path == "-":
+            stdin = sys.stdin.buffer
+            return search(stream=stdin) if lines else search(stdin.read())
+        with open(input_path, "rb") as f:
+            if lines:
+                return search(stream=f)
+            if os.fstat(f.fileno()).st_size == 0:
+                return search(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return search(mapped)
+    except (ValueError, re.error) as e:
+        console.print(f"[bold red]Error:[/] Regex error: {e}")
+        sys.exit(1)
+
+
 @main.command()
 @click.argument("pattern")
-@click.argument("text")
-@click.option("--flags", "-f", default="g", help="Regex flags (g, i, m)")
-def regex(pattern, text, flags):
-    """Test regular expression"""
+@click.argument("text", required=False)
+@click.option("--flags", "-f", default="g", help="Regex flags (g, i, m, s)")
+@click.option("--file", "-F", "input_path", type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+              help="Match against a file instead of TEXT ('-' for stdin)")
+@click.option("--lines", is_flag=True, help="Stream the input and match each line separately")
+@click.option("--timeout-ms", default=100.0, type=click.FloatRange(min=0), show_default=True,
+              help="Abandon any single search slower than this (0 disables)")
+@click.option("--remote", is_flag=True, help="Test with the API instead of locally")
+def regex(pattern, text, flags, input_path, lines, timeout_ms, remote):
+    """Test regular expression
+
+    Patterns run locally on the bytes of TEXT, a file or stdin, as the API
+    runs them. A search slower than --timeout-ms, as with catastrophic
+    backtracking, is abandoned and reported.
+    """
+    if (text is None) == (input_path is None):
+        console.print("[bold red]Error:[/] Give either TEXT or --file")
+        sys.exit(1)
+    if remote and lines:
+        console.print("[bold red]Error:[/] --lines runs locally; drop --remote")
+        sys.exit(1)
+
     console.print("[bold cyan]Testing Regex Pattern...[/]\n")
 
-    result = api_request("/tools/regex-test", "POST", {
-        "pattern": pattern,
-        "text": text,
-        "flags": flags
-    })
+    if remote:
+        if input_path is not None:
+            with click.open_file(input_path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        data = api_request(*payloads.regex(pattern, text, flags)).get("data", {})
+    else:
+        data = _regex_local(pattern, text, flags, input_path, lines, timeout_ms)
 
-    data = result.get("data", {})
+    if output.emit(data, "matches"):
+        return
 
     console.print(f"[bold]Pattern:[/] [cyan]{data.get('pattern')}[/]")
     console.print(f"[bold]Matches Found:[/] {data.get('match_count')}\n")
@@ -156,31 +325,102 @@ def regex(pattern, text, flags):
     if matches:
         table = Table(title="Matches")
         table.add_column("#", style="cyan")
+        if lines:
+            table.add_column("Line", style="blue")
         table.add_column("Match", style="yellow")
         table.add_column("Position", style="green")
 
-        for i, match in enumerate(matches, 1):
-            table.add_row(str(i), match["match"], str(match["position"]))
+        for i, match in enumerate(matches[:REGEX_TABLE_ROWS], 1):
+            table.add_row(str(i), *([str(match["line"])] if lines else []), match["match"],
+                          str(match["position"]))
 
         console.print(table)
+        if len(matches) > REGEX_TABLE_ROWS:
+            console.print(f"[dim]... {len(matches) - REGEX_TABLE_ROWS:,} more; use -o ndjson for all[/]")
     else:
         console.print("[yellow]No matches found[/]")
 
+    for timeout in data.get("timeouts", [])[:20]:
+        where = f"line {timeout['line']}" if timeout["line"] else f"byte {timeout['position']}"
+        console.print(f"[yellow]Search at {where} exceeded {timeout_ms:g} ms and was abandoned; "
+                      f"the pattern may backtrack catastrophically[/]")
+
+    stats = data.get("stats")
+    if stats:
+        scanned = f"{stats['bytes']:,} bytes" + (f" in {stats['lines']:,} lines" if lines else "")
+        console.print(f"\n[dim]Searched {scanned} in {stats['search_ms']} ms "
+                      f"({stats['mb_per_s']} MB/s); compiled in {stats['compile_ms']} ms"
+                      f"{' (cached)' if stats['compile_cached'] else ''}; "
+                      f"slowest search {stats['slowest_search_ms']} ms[/]")
 
-@main.command()
-@click.argument("file_path", type=click.Path(exists=True))
-def secrets(file_path):
-    """Scan file for exposed secrets"""
-    console.print("[bold cyan]Scanning for Secrets...[/]\n")
 
-    with open(file_path, 'r') as f:
-        text = f.read()
+@main.command()
+@click.argument("path", type=click.Path(exists=True))
+@click.option("--remote", is_flag=True, help="Scan a single file with the API instead of locally")
+@click.option("--chunk-size", default=4, type=click.IntRange(1, 64),
+              help="Upload chunk size in MB for large files (with --remote)")
+@click.option("--workers", "-w", default=None, type=click.IntRange(1, 256),
+              help="Processes for scanning a directory (default: CPU count)")
+@click.option("--min-entropy", default=0.0, type=click.FloatRange(0, 8),
+              help="Drop findings whose matched text has lower Shannon entropy (bits/byte)")
+@click.option("--no-gitignore", is_flag=True, help="Also scan files ignored by .gitignore")
+@click.option("--max-size", default=20, type=click.IntRange(min=1),
+              help="Skip files larger than this many MB in directories")
+@click.option("--rescan", is_flag=True, help="Scan every file again instead of reusing the manifest")
+@click.option("--manifest", "manifest_path", type=click.Path(dir_okay=False),
+              help="Scan manifest (default: $VERIBITS_MANIFEST or the cache directory)")
+def secrets(path, remote, chunk_size, workers, min_entropy, no_gitignore, max_size, rescan, manifest_path):
+    """Scan a file or directory tree for exposed secrets
+
+    Files are scanned locally with the same rules as the API. Directories
+    are walked recursively, honouring .gitignore and skipping binary
+    files, and scanned in parallel. Large files are read in chunks. Files
+    unchanged since the last scan reuse its results from the scan manifest.
+    """
+    from .engines import secrets as secrets_engine
+    from .manifest import Manifest
 
-    result = api_request("/tools/scan-secrets", "POST", {
-        "text": text
-    })
+    console.print("[bold cyan]Scanning for Secrets...[/]\n")
 
-    data = result.get("data", {})
+    is_dir = os.path.isdir(path)
+    if remote:
+        if is_dir:
+            console.print("[bold red]Error:[/] --remote scans a single file")
+            sys.exit(1)
+        from .streaming import scan_chunked
+
+        def scan(text):
+            return api_request(*payloads.secrets(text)).get("data", {})
+
+        data = scan_chunked(path, scan, chunk_bytes=chunk_size * 1024 * 1024)
+    elif is_dir:
+        findings, skipped, errors = [], 0, []
+        scanned = reused = 0
+        with Manifest(secrets_engine.MANIFEST_SCANNER, manifest_path) as manifest:
+            for record in secrets_engine.scan_tree(path, min_entropy, workers, not no_gitignore,
+                                                   max_size * 1024 * 1024, manifest, rescan):
+                if "error" in record:
+                    errors.append(record)
+                    continue
+                reused += record["reused"]
+                if "skipped" in record:
+                    skipped += 1
+                else:
+                    scanned += 1
+                    findings.extend(dict(secret, file=record["file"]) for secret in record["secrets"])
+        data = dict(secrets_engine.summarize(findings), files_scanned=scanned, files_skipped=skipped,
+                    files_unchanged=reused, errors=errors)
+    else:
+        with Manifest(secrets_engine.MANIFEST_SCANNER, manifest_path) as manifest:
+            record = next(secrets_engine.scan_paths([path], min_entropy, workers=1, skip_binary=False,
+                                                    manifest=manifest, rescan=rescan))
+        if "error" in record:
+            console.print(f"[bold red]Error:[/] {path}: {record['error']}")
+            sys.exit(1)
+        data = secrets_engine.summarize(record["secrets"])
+
+    if output.emit(data, "secrets"):
+        return
 
     secrets_found = data.get("secrets_found", 0)
     risk_level = data.get("risk_level", "low")
@@ -189,12 +429,18 @@ def secrets(file_path):
     risk_colors = {"low": "green", "medium": "yellow", "high": "red"}
     risk_color = risk_colors.get(risk_level, "white")
 
+    if "files_scanned" in data:
+        console.print(f"[bold]Files Scanned:[/] {data['files_scanned']} "
+                      f"({data['files_skipped']} binary or oversized skipped, "
+                      f"{data['files_unchanged']} unchanged since the last scan)")
     console.print(f"[bold]Secrets Found:[/] [{risk_color}]{secrets_found}[/]")
     console.print(f"[bold]Risk Level:[/] [{risk_color}]{risk_level.upper()}[/]\n")
 
     secrets = data.get("secrets", [])
     if secrets:
         table = Table(title="Detected Secrets")
+        if is_dir:
+            table.add_column("File", style="blue")
         table.add_column("Type", style="cyan")
         table.add_column("Value", style="yellow")
         table.add_column("Line", style="green")
@@ -205,58 +451,157 @@ def secrets(file_path):
             severity = secret["severity"]
             severity_style = severity_colors.get(severity, "white")
 
-            table.add_row(
+            row = [
                 secret["type"],
                 secret["value"],
                 str(secret["line"]),
                 f"[{severity_style}]{severity.upper()}[/]"
-            )
+            ]
+            table.add_row(*([secret["file"]] if is_dir else []), *row)
 
         console.print(table)
     else:
         console.print("[bold green]✅ No secrets detected![/]")
 
+    for error in data.get("errors", [])[:20]:
+        console.print(f"[yellow]Could not read {error['file']}: {error['error']}[/]")
+
 
 @main.command()
-@click.argument("text")
+@click.argument("text", required=False)
 @click.option("--algorithms", "-a", multiple=True, default=["md5", "sha256", "sha512"],
               help="Hash algorithms to use")
-def hash(text, algorithms):
-    """Generate hashes for text"""
+@click.option("--file", "-f", "files", multiple=True, type=click.Path(exists=True, dir_okay=False),
+              help="Hash a file instead of text (repeatable)")
+@click.option("--stdin", "use_stdin", is_flag=True, help="Hash data read from standard input")
+@click.option("--workers", "-w", default=None, type=click.IntRange(1, 256),
+              help="Processes for hashing many files (default: CPU count)")
+@click.option("--remote", is_flag=True, help="Compute all hashes with the API")
+def hash(text, algorithms, files, use_stdin, workers, remote):
+    """Generate hashes for text, files or stdin
+
+    Hashes are computed locally in a single pass; algorithms not available
+    locally (e.g. bcrypt) are requested from the API for text input.
+    """
+    from .engines.hashing import hash_bytes, hash_files, hash_stdin, split_algorithms
+
+    if sum(bool(source) for source in (text is not None, files, use_stdin)) != 1:
+        raise click.UsageError("Provide exactly one of TEXT, --file or --stdin")
+
     console.print("[bold cyan]Generating Hashes...[/]\n")
 
-    result = api_request("/tools/generate-hash", "POST", {
-        "text": text,
-        "algorithms": list(algorithms)
-    })
+    local, remote_algorithms = split_algorithms(algorithms)
+    if remote:
+        local, remote_algorithms = [], [a.lower() for a in algorithms]
 
-    data = result.get("data", {})
-    hashes = data.get("hashes", {})
+    if files or use_stdin:
+        if remote_algorithms:
+            console.print(f"[yellow]Not available locally for file input: "
+                          f"{', '.join(remote_algorithms)}[/]\n")
+
+        if use_stdin:
+            records = [{"file": "<stdin>", "hashes": hash_stdin(local)}]
+        else:
+            records = hash_files(files, local, workers)
+
+        if output.emit({"files": records}, "files"):
+            return
+
+        table = Table(title="Generated Hashes")
+        table.add_column("File", style="green")
+        table.add_column("Algorithm", style="cyan")
+        table.add_column("Hash", style="yellow")
+
+        for record in records:
+            if "error" in record:
+                table.add_row(record["file"], "-", f"[red]{record['error']}[/]")
+                continue
+            for algo, hash_value in record["hashes"].items():
+                table.add_row(record["file"], algo.upper(), hash_value)
+
+        console.print(table)
+        return
+
+    hashes = hash_bytes(text.encode(), local)
+    if remote_algorithms:
+        result = api_request(*payloads.hash(text, remote_algorithms))
+        hashes.update(result.get("data", {}).get("hashes", {}))
+
+    if output.emit({"hashes": hashes}):
+        return
 
     table = Table(title="Generated Hashes")
     table.add_column("Algorithm", style="cyan")
     table.add_column("Hash", style="yellow")
 
-    for algo, hash_value in hashes.items():
-        table.add_row(algo.upper(), hash_value)
+    for algo in [a.lower() for a in algorithms]:
+        if algo in hashes:
+            table.add_row(algo.upper(), hashes[algo])
 
     console.print(table)
 
 
+def _validate_addresses(currency, input_file, workers):
+    """Validate addresses from a file locally, writing NDJSON and a summary"""
+    from .batch import read_inputs
+    from .engines.crypto import validate_many
+
+    err_console = LazyConsole(stderr=True)
+    started = time.perf_counter()
+    total = valid = 0
+
+    for record in validate_many(currency, read_inputs(input_file), workers):
+        total += 1
+        valid += record["is_valid"]
+        sys.stdout.write(json.dumps(record) + "\n")
+
+    elapsed = time.perf_counter() - started
+    err_console.print(f"\n[bold]Validated:[/] {total} in {elapsed:.2f}s "
+                      f"({total / elapsed if elapsed else 0:,.0f}/s)")
+    err_console.print(f"[bold]Valid:[/] [green]{valid}[/]")
+    err_console.print(f"[bold]Invalid:[/] [{'red' if total - valid else 'green'}]{total - valid}[/]")
+
+
+def _check_address_args(address, input_file, type):
+    if (address is None) == (input_file is None):
+        raise click.UsageError("Provide exactly one of ADDRESS or --input")
+    if input_file is not None and type != "address":
+        raise click.UsageError("--input validates addresses; use 'veribits batch' for transactions")
+
+
 @main.command()
-@click.argument("address")
+@click.argument("address", required=False)
 @click.option("--type", "-t", type=click.Choice(["address", "transaction"]), default="address",
               help="Validation type")
-def bitcoin(address, type):
-    """Validate Bitcoin address or transaction"""
+@click.option("--input", "-i", "input_file", type=click.File("r"),
+              help="Validate addresses from a file, one per line ('-' for stdin), as NDJSON")
+@click.option("--workers", "-w", default=None, type=click.IntRange(1, 256),
+              help="Processes for --input validation (default: CPU count)")
+@click.option("--remote", is_flag=True, help="Validate with the API instead of locally")
+def bitcoin(address, type, input_file, workers, remote):
+    """Validate Bitcoin address or transaction
+
+    Addresses (Base58Check, Bech32/Bech32m) and transaction ID formats
+    are validated locally. Unlike the API, which only checks an address's
+    characters and length, the local check verifies its checksum.
+    """
+    from .engines.crypto import validate_bitcoin_address, validate_bitcoin_transaction
+
+    _check_address_args(address, input_file, type)
+    if input_file is not None:
+        _validate_addresses("bitcoin", input_file, workers)
+        return
+
     console.print("[bold cyan]Validating Bitcoin...[/]\n")
 
-    result = api_request("/crypto/validate/bitcoin", "POST", {
-        "value": address,
-        "type": type
-    })
+    if not remote:
+        data = (validate_bitcoin_address if type == "address" else validate_bitcoin_transaction)(address)
+    else:
+        result = api_request(*payloads.bitcoin(address, type))
+        data = result.get("data", {})
 
-    data = result.get("data", {})
+    if output.emit(data):
+        return
 
     is_valid = data.get("is_valid", False)
     color = "green" if is_valid else "red"
@@ -277,19 +622,39 @@ def bitcoin(address, type):
 
 
 @main.command()
-@click.argument("address")
+@click.argument("address", required=False)
 @click.option("--type", "-t", type=click.Choice(["address", "transaction"]), default="address",
               help="Validation type")
-def ethereum(address, type):
-    """Validate Ethereum address or transaction"""
+@click.option("--input", "-i", "input_file", type=click.File("r"),
+              help="Validate addresses from a file, one per line ('-' for stdin), as NDJSON")
+@click.option("--workers", "-w", default=None, type=click.IntRange(1, 256),
+              help="Processes for --input validation (default: CPU count)")
+@click.option("--remote", is_flag=True, help="Validate with the API instead of locally")
+def ethereum(address, type, input_file, workers, remote):
+    """Validate Ethereum address or transaction
+
+    Addresses, their EIP-55 checksums and transaction hash formats are
+    validated locally. A mixed-case address whose EIP-55 checksum does not
+    match is invalid here; the API reports it as valid with a warning.
+    All-lowercase or all-uppercase addresses are valid without a checksum.
+    """
+    from .engines.crypto import validate_ethereum_address, validate_ethereum_transaction
+
+    _check_address_args(address, input_file, type)
+    if input_file is not None:
+        _validate_addresses("ethereum", input_file, workers)
+        return
+
     console.print("[bold cyan]Validating Ethereum...[/]\n")
 
-    result = api_request("/crypto/validate/ethereum", "POST", {
-        "value": address,
-        "type": type
-    })
+    if not remote:
+        data = (validate_ethereum_address if type == "address" else validate_ethereum_transaction)(address)
+    else:
+        result = api_request(*payloads.ethereum(address, type))
+        data = result.get("data", {})
 
-    data = result.get("data", {})
+    if output.emit(data):
+        return
 
     is_valid = data.get("is_valid", False)
     checksum_valid = data.get("checksum_valid", False)
@@ -309,17 +674,122 @@ def ethereum(address, type):
             console.print(f"[cyan]{data['details']['checksum_address']}[/]")
 
 
+def _file_magic_remote(file_path, rescan, manifest_path):
+    """API detection of one file, reusing the manifest while its content is unchanged"""
+    from .manifest import Manifest, unchanged
+    from .streaming import file_digest, read_prefix
+
+    with Manifest(f"file-magic:{API_URL}", manifest_path) as manifest:
+        stat = os.stat(file_path)
+        entry = None if rescan else manifest.get(file_path)
+        if unchanged(entry, stat):
+            return entry.result
+        digest = file_digest(file_path)
+        if entry is not None and entry.digest == digest:
+            data = entry.result
+        else:
+            # Only the leading bytes are needed for detection; hash the full file locally
+            files = {'file': (Path(file_path).name, read_prefix(file_path))}
+            result = api_request("/file-magic", "POST", files=files)
+            data = result.get("data", {})
+            data["file_hash"] = digest
+            data["file_size"] = stat.st_size
+        manifest.put(file_path, stat.st_size, stat.st_mtime_ns, digest, data)
+    return data
+
+
+MAGIC_API_FIELDS = ("magic_number_hex", "detected_type", "detected_extension", "detected_mime",
+                    "match_confidence")
+
+
+def _file_magic_fallback(records, manifest):
+    """Ask the API about files no local signature matched, updating records and manifest"""
+    from .streaming import read_prefix
+
+    for record in records:
+        if record.get("source") != "local" or record["detected_extension"] != "unknown":
+            continue
+        files = {'file': (Path(record["file"]).name, read_prefix(record["file"]))}
+        try:
+            data = call("/file-magic", "POST", files=files).get("data", {})
+        except APIError as e:
+            # Usually quota or authentication; the remaining files would fail the same way
+            console.print(f"[yellow]API detection unavailable, unknown types kept: {e}[/]")
+            return
+        record.update({key: data[key] for key in MAGIC_API_FIELDS if key in data}, source="api")
+        manifest.update(record["file"], {k: v for k, v in record.items() if k not in ("file", "reused")})
+
+
 @main.command()
 @click.argument("file_path", type=click.Path(exists=True))
-def file_magic(file_path):
-    """Detect file type by magic number"""
+@click.option("--remote", is_flag=True, help="Detect a single file with the API instead of locally")
+@click.option("--no-fallback", is_flag=True, help="Report unknown types instead of asking the API")
+@click.option("--workers", "-w", default=None, type=click.IntRange(1, 256),
+              help="Processes for analyzing a directory (default: CPU count)")
+@click.option("--no-gitignore", is_flag=True, help="Also analyze files ignored by .gitignore")
+@click.option("--rescan", is_flag=True, help="Analyze every file again instead of reusing the manifest")
+@click.option("--manifest", "manifest_path", type=click.Path(dir_okay=False),
+              help="Scan manifest (default: $VERIBITS_MANIFEST or the cache directory)")
+def file_magic(file_path, remote, no_fallback, workers, no_gitignore, rescan, manifest_path):
+    """Detect file type by magic number
+
+    Files are classified locally from their leading bytes; only files no
+    local signature matches are sent to the API. Directories are walked
+    recursively, honouring .gitignore, and analyzed in parallel. Files
+    unchanged since the last run reuse its results from the scan manifest.
+    """
+    from .engines import magic
+    from .manifest import Manifest
+
     console.print("[bold cyan]Analyzing File Magic Number...[/]\n")
 
-    with open(file_path, 'rb') as f:
-        files = {'file': f}
-        result = api_request("/file-magic", "POST", files=files)
+    is_dir = os.path.isdir(file_path)
+    if remote:
+        if is_dir:
+            console.print("[bold red]Error:[/] --remote analyzes a single file")
+            sys.exit(1)
+        data = _file_magic_remote(file_path, rescan, manifest_path)
+    else:
+        with Manifest(magic.MANIFEST_SCANNER, manifest_path) as manifest:
+            if is_dir:
+                records = list(magic.analyze_tree(file_path, workers, not no_gitignore, manifest, rescan))
+            else:
+                records = list(magic.analyze_paths([file_path], 1, manifest, rescan))
+            if not no_fallback:
+                _file_magic_fallback(records, manifest)
+
+        errors = [record for record in records if "error" in record]
+        files = [record for record in records if "error" not in record]
+        if not is_dir:
+            if errors:
+                console.print(f"[bold red]Error:[/] {file_path}: {errors[0]['error']}")
+                sys.exit(1)
+            data = {k: v for k, v in files[0].items() if k not in ("file", "reused")}
+        else:
+            data = {"files": files, "files_analyzed": len(files),
+                    "files_unknown": sum(r["detected_extension"] == "unknown" for r in files),
+                    "files_unchanged": sum(r["reused"] for r in files), "errors": errors}
 
-    data = result.get("data", {})
+    if output.emit(data, "files" if is_dir else ()):
+        return
+
+    if is_dir:
+        console.print(f"[bold]Files Analyzed:[/] {data['files_analyzed']} "
+                      f"({data['files_unchanged']} unchanged since the last run, "
+                      f"{data['files_unknown']} unknown)\n")
+        if files:
+            table = Table(title="Detected File Types")
+            table.add_column("File", style="blue")
+            table.add_column("Type", style="green")
+            table.add_column("Extension")
+            table.add_column("MIME Type", style="cyan")
+            for record in files:
+                table.add_row(record["file"], record["detected_type"], record["detected_extension"],
+                              record["detected_mime"])
+            console.print(table)
+        for error in errors[:20]:
+            console.print(f"[yellow]Could not read {error['file']}: {error['error']}[/]")
+        return
 
     console.print(f"[bold]Detected Type:[/] [green]{data.get('detected_type')}[/]")
     console.print(f"[bold]Extension:[/] {data.get('detected_extension')}")
@@ -330,22 +800,47 @@ def file_magic(file_path):
 @main.command()
 def config():
     """Show current configuration"""
+    from .cache import default_cache_path
+    from .session import pool_size
+
+    if output.emit({"api_url": API_URL, "api_key_set": bool(API_KEY), "pool_size": pool_size(),
+                    "cache_path": str(default_cache_path())}):
+        return
+
     console.print("[bold cyan]VeriBits CLI Configuration[/]\n")
 
     console.print(f"[bold]API URL:[/] {API_URL}")
     console.print(f"[bold]API Key:[/] {'Set ✅' if API_KEY else 'Not set ❌'}")
+    console.print(f"[bold]Connection Pool:[/] {pool_size()} per host")
+    console.print(f"[bold]Response Cache:[/] {default_cache_path()}")
 
     console.print("\n[bold]Environment Variables:[/]")
     console.print("  VERIBITS_API_URL - Override API endpoint")
     console.print("  VERIBITS_API_KEY - Set API key for authenticated requests")
+    console.print("  VERIBITS_POOL_SIZE - Keep-alive connections per host (default: 10)")
+    console.print("  VERIBITS_TIMEOUT - Seconds to wait for a response (default: 60)")
+    console.print("  VERIBITS_RETRIES - Retries of transient failures (default: 3)")
+    console.print("  VERIBITS_RATE - Fixed client-side limit in requests per second")
+    console.print("  VERIBITS_CACHE - Set to 0 to disable the response cache")
+    console.print("  VERIBITS_CACHE_DIR - Response cache directory")
+    console.print("  VERIBITS_CACHE_MAX_MB - Response cache size limit (default: 64)")
+    console.print("  VERIBITS_OUTPUT - Default output format (table, json, ndjson, csv)")
+    console.print("  VERIBITS_TRACE - Append OTLP/JSON trace spans of every run to this file")
+    console.print("  VERIBITS_MANIFEST - Scan manifest used by 'secrets' and 'file-magic'")
+    console.print("  VERIBITS_BGP_INDEX - Offline BGP index file used by 'bgp-index'")
+    console.print("  VERIBITS_SOCKET - Daemon socket path used by 'vb'")
+    console.print("  VERIBITS_DAEMON - Set to 0 to stop 'vb' from using the daemon")
 
 
 @main.command()
 def limits():
     """Check anonymous usage limits"""
-    result = api_request("/limits/anonymous", "GET")
+    result = api_request(*payloads.limits())
     data = result.get("data", {})
 
+    if output.emit(data):
+        return
+
     console.print("[bold cyan]Anonymous Usage Limits[/]\n")
     console.print(f"[bold]Free Scans:[/] {data.get('free_scans', 5)}")
     console.print(f"[bold]Scans Remaining:[/] [green]{data.get('scans_remaining', 5)}[/]")
@@ -356,18 +851,18 @@ def limits():
 @main.command()
 @click.argument("domain")
 @click.option("--type", "-t", default="A",
-              type=click.Choice(["A", "AAAA", "MX", "TXT", "CNAME", "NS", "SOA", "PTR", "SRV", "CAA"]),
+              type=click.Choice(payloads.DNS_RECORD_TYPES),
               help="DNS record type")
 def dns(domain, type):
     """Validate DNS records for a domain"""
     console.print(f"[bold cyan]Validating DNS Records for {domain}...[/]\n")
 
-    result = api_request("/tools/dns-validate", "POST", {
-        "domain": domain,
-        "record_type": type
-    })
+    result = api_request(*payloads.dns(domain, type))
 
     data = result.get("data", {})
+
+    if output.emit(data, "records"):
+        return
     records = data.get("records", [])
 
     if records:
@@ -397,18 +892,124 @@ def dns(domain, type):
         console.print(f"\n[bold]DNSSEC:[/] [{color}]{icon} {'Enabled' if enabled else 'Not Enabled'}[/]")
 
 
+def _print_sweep(result):
+    """Render the merged record set of one domain"""
+    records = result["records"]
+    if records:
+        table = Table(title=f"DNS Records for {result['domain']}")
+        table.add_column("Type", style="cyan")
+        table.add_column("Value", style="yellow")
+        table.add_column("TTL", style="green")
+        table.add_column("Priority", style="blue")
+
+        for record in records:
+            table.add_row(
+                record.get("type", ""),
+                str(record.get("value", "")),
+                str(record.get("ttl", "")),
+                str(record.get("priority", "")) if record.get("priority") else ""
+            )
+
+        console.print(table)
+    else:
+        console.print("[yellow]No DNS records found[/]")
+
+    enabled = result["dnssec"]["enabled"]
+    icon = "✅" if enabled else "❌"
+    color = "green" if enabled else "yellow"
+    console.print(f"\n[bold]DNSSEC:[/] [{color}]{icon} {'Enabled' if enabled else 'Not Enabled'}[/]")
+
+    for record_type, error in result.get("errors", {}).items():
+        console.print(f"[red]{record_type} lookup failed: {error}[/]")
+
+
+def _print_sweep_summary(results, types):
+    """Render one row of per-type record counts per domain"""
+    table = Table(title="DNS Sweep")
+    table.add_column("Domain", style="cyan")
+    for record_type in types:
+        table.add_column(record_type, justify="right")
+    table.add_column("DNSSEC")
+    table.add_column("Status")
+
+    for result in results:
+        counts = [str(result["counts"][t]) if t in result["counts"] else "[red]error[/]" for t in types]
+        dnssec = "[green]✅[/]" if result["dnssec"]["enabled"] else "[yellow]❌[/]"
+        status = "[green]OK[/]" if result["success"] else f"[red]Failed: {', '.join(result['errors'])}[/]"
+        table.add_row(result["domain"], *counts, dnssec, status)
+
+    console.print(table)
+
+
+@main.command()
+@click.argument("domains", nargs=-1)
+@click.option("--input", "-i", "input_file", type=click.File("r"),
+              help="File of domains, one per line ('-' for stdin)")
+@click.option("--type", "-t", "types", multiple=True, type=click.Choice(payloads.DNS_RECORD_TYPES),
+              help="Record type to query (repeatable; default: all)")
+@click.option("--concurrency", "-c", default=16, show_default=True, type=click.IntRange(1, 256),
+              help="Maximum number of queries in flight")
+def dns_sweep(domains, input_file, types, concurrency):
+    """Query many record types for many domains concurrently
+
+    Each domain gets one merged record set with its DNSSEC status.
+    Duplicate domains share in-flight queries, and answers are cached
+    for their record TTL.
+
+    Examples:
+
+        veribits dns-sweep example.com example.org
+
+        veribits -o ndjson dns-sweep -i domains.txt -t A -t AAAA -t MX
+    """
+    from .batch import read_inputs
+    from .dns_sweep import SweepStats, sweep
+
+    targets = list(domains)
+    if input_file is not None:
+        targets.extend(read_inputs(input_file))
+    if not targets:
+        console.print("[bold red]Error:[/] Provide at least one domain or --input")
+        sys.exit(1)
+    types = tuple(dict.fromkeys(types)) or payloads.DNS_RECORD_TYPES
+
+    console.print(f"[bold cyan]Sweeping {len(types)} record type{'s' if len(types) > 1 else ''} for "
+                  f"{len(targets)} domain{'s' if len(targets) > 1 else ''}...[/]\n")
+
+    stats = SweepStats()
+    results = sweep(targets, types, concurrency, stats)
+
+    if output.current() == "ndjson":
+        output.write_ndjson(results)
+    else:
+        results = list(results)
+        if not output.emit({"domains": results}, "domains"):
+            if len(results) == 1:
+                _print_sweep(results[0])
+            else:
+                _print_sweep_summary(results, types)
+
+    if len(targets) > 1:
+        console.print(f"\n[bold]Swept:[/] {stats.total} domains in {stats.elapsed:.2f}s "
+                      f"({stats.queries} queries, {stats.coalesced} coalesced)")
+    if stats.failed:
+        console.print(f"[bold red]Error:[/] {stats.failed} domain(s) had failed lookups")
+        sys.exit(1)
+
+
 @main.command()
 @click.argument("query")
 def whois(query):
     """WHOIS lookup for domain or IP address"""
     console.print(f"[bold cyan]WHOIS Lookup for {query}...[/]\n")
 
-    result = api_request("/tools/whois", "POST", {
-        "query": query
-    })
+    result = api_request(*payloads.whois(query))
 
     data = result.get("data", {})
 
+    if output.emit(data):
+        return
+
     console.print(f"[bold]Query:[/] {data.get('query')}")
     console.print(f"[bold]Query Type:[/] {data.get('query_type').upper()}")
     console.print(f"[bold]WHOIS Server:[/] {data.get('whois_server')}\n")
@@ -423,7 +1024,8 @@ def whois(query):
     # Display raw response
     raw = data.get("raw_response", "")
     if raw:
-        console.print("\n" + Panel("[bold]Raw WHOIS Response", style="cyan"))
+        console.print()
+        console.print(Panel("[bold]Raw WHOIS Response", style="cyan"))
         # Limit raw output to first 50 lines for readability
         raw_lines = raw.split("\n")[:50]
         console.print("\n".join(raw_lines))
@@ -431,20 +1033,100 @@ def whois(query):
             console.print("[dim]... (truncated, see full response for details)[/]")
 
 
+def _read_ipcalc_rows(input_file):
+    """Yield (ip, subnet) rows from a CSV of addresses or prefixes
+
+    The first column is an address or CIDR, the optional second column a
+    mask. Blank lines, '#' comments and a header row are skipped.
+    """
+    for number, row in enumerate(csv.reader(input_file)):
+        if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+            continue
+        if number == 0 and not row[0].strip()[0].isdigit():
+            continue
+        subnet = row[1].strip() if len(row) > 1 and row[1].strip() else None
+        yield row[0].strip(), subnet
+
+
+def _ipcalc_bulk(input_file, aggregate):
+    """Calculate every row of a CSV locally, writing CSV and a summary"""
+    from .engines import ipcalc as ipcalc_engine
+
+    err_console = LazyConsole(stderr=True)
+    started = time.perf_counter()
+    rows = list(_read_ipcalc_rows(input_file))
+
+    if aggregate:
+        try:
+            prefixes = ipcalc_engine.aggregate(
+                f"{ip}/{ipcalc_engine.parse_prefix(subnet)}" if subnet and "/" not in ip else ip
+                for ip, subnet in rows
+            )
+        except (ValueError, ipcalc_engine.IPCalcError) as e:
+            err_console.print(f"[bold red]Error:[/] {e}")
+            sys.exit(1)
+        sys.stdout.write("".join(f"{prefix}\n" for prefix in prefixes))
+        elapsed = time.perf_counter() - started
+        err_console.print(f"\n[bold]Aggregated:[/] {len(rows)} prefixes into {len(prefixes)} "
+                          f"in {elapsed:.2f}s")
+        return
+
+    header, table = ipcalc_engine.calculate_table(rows)
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(table)
+
+    elapsed = time.perf_counter() - started
+    type_column = header.index("ip_type")
+    by_type = Counter(row[type_column] for row in table)
+    failed = by_type.pop("", 0)
+
+    err_console.print(f"\n[bold]Calculated:[/] {len(table)} in {elapsed:.2f}s "
+                      f"({len(table) / elapsed if elapsed else 0:,.0f}/s)")
+    for name, count in sorted(by_type.items()):
+        err_console.print(f"[bold]{name}:[/] {count}")
+    err_console.print(f"[bold]Invalid:[/] [{'red' if failed else 'green'}]{failed}[/]")
+
+
 @main.command()
-@click.argument("ip")
+@click.argument("ip", required=False)
 @click.option("--subnet", "-s", help="Subnet mask (e.g., 255.255.255.0 or CIDR /24)")
-def ipcalc(ip, subnet):
-    """Calculate IP subnet information"""
-    console.print(f"[bold cyan]Calculating IP Subnet Information...[/]\n")
+@click.option("--input", "-i", "input_file", type=click.File("r"),
+              help="CSV of addresses or prefixes to calculate locally ('-' for stdin)")
+@click.option("--aggregate", is_flag=True,
+              help="With --input, print the input prefixes merged into a minimal CIDR list")
+@click.option("--remote", is_flag=True, help="Calculate with the API instead of locally")
+def ipcalc(ip, subnet, input_file, aggregate, remote):
+    """Calculate IP subnet information
+
+    With --input, every row is calculated locally and written to stdout as
+    CSV, with a summary on stderr.
+    """
+    from .engines import ipcalc as ipcalc_engine
 
-    data_payload = {"ip": ip}
-    if subnet:
-        data_payload["subnet_mask"] = subnet
+    if (ip is None) == (input_file is None):
+        raise click.UsageError("Provide exactly one of IP or --input")
+    if input_file is not None:
+        _ipcalc_bulk(input_file, aggregate)
+        return
+    if aggregate:
+        raise click.UsageError("--aggregate requires --input")
 
-    result = api_request("/tools/ip-calculate", "POST", data_payload)
+    console.print(f"[bold cyan]Calculating IP Subnet Information...[/]\n")
+
+    if remote:
+        result = api_request(*payloads.ipcalc(ip, subnet))
+    else:
+        try:
+            result = {"data": ipcalc_engine.calculate(ip, subnet)}
+        except ipcalc_engine.IPCalcError as e:
+            console.print(f"[bold red]Error:[/] {e}")
+            sys.exit(1)
     data = result.get("data", {})
 
+    if output.emit(data):
+        return
+
     console.print(f"[bold]IP Address:[/] {data.get('ip_address')}")
     console.print(f"[bold]CIDR Notation:[/] [cyan]{data.get('cidr')}[/]")
     console.print(f"[bold]Network Address:[/] {data.get('network_address')}")
@@ -465,12 +1147,13 @@ def rbl(ip):
     """Check if IP is listed on RBL/DNSBL blacklists"""
     console.print(f"[bold cyan]Checking RBL Blacklists for {ip}...[/]\n")
 
-    result = api_request("/tools/rbl-check", "POST", {
-        "ip": ip
-    })
+    result = api_request(*payloads.rbl(ip))
 
     data = result.get("data", {})
 
+    if output.emit(data, "listings"):
+        return
+
     listed = data.get("listed", False)
     icon = "❌" if listed else "✅"
     color = "red" if listed else "green"
@@ -493,18 +1176,118 @@ def rbl(ip):
         console.print("[bold green]✅ IP is clean - not listed on any checked RBLs[/]")
 
 
+@main.command()
+@click.argument("targets", nargs=-1)
+@click.option("--input", "-i", "input_file", type=click.File("r"),
+              help="File of IPs and CIDRs, one per line ('-' for stdin)")
+@click.option("--concurrency", "-c", default=16, show_default=True, type=click.IntRange(1, 256),
+              help="Maximum number of checks in flight")
+@click.option("--rate", "-r", type=click.FloatRange(min=0, min_open=True),
+              help="Maximum checks per second (default: unlimited)")
+@click.option("--max-addresses", default=65536, show_default=True, type=click.IntRange(1),
+              help="Refuse targets covering more addresses than this")
+def rbl_scan(targets, input_file, concurrency, rate, max_addresses):
+    """Check every address in IPs and CIDR ranges against RBL blacklists
+
+    Addresses checked within the RBL cache lifetime (15 minutes) are not
+    checked again. The summary groups listed addresses by RBL.
+
+    Examples:
+
+        veribits rbl-scan 192.0.2.0/24 198.51.100.7
+
+        veribits -o ndjson rbl-scan -i mail-fleet.txt --rate 20 > rbl.ndjson
+    """
+    from .batch import read_inputs
+    from .rbl_scan import ListingSummary, RBLScanError, ScanStats, expand, parse_targets, scan
+
+    targets = list(targets)
+    if input_file is not None:
+        targets.extend(read_inputs(input_file))
+    if not targets:
+        console.print("[bold red]Error:[/] Provide at least one IP, CIDR or --input")
+        sys.exit(1)
+    try:
+        networks = parse_targets(targets, max_addresses)
+    except RBLScanError as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+
+    console.print(f"[bold cyan]Scanning {len(networks)} target{'s' if len(networks) > 1 else ''} "
+                  f"against RBL blacklists...[/]\n")
+
+    stats = ScanStats()
+    summary = ListingSummary()
+    listed, failures = [], []
+    for record in scan(expand(networks), concurrency, rate, stats):
+        summary.add(record)
+        if not record["success"]:
+            failures.append(record)
+        elif record["listed"]:
+            listed.append(record)
+        if output.current() == "ndjson":
+            output.write_ndjson([record])
+
+    data = {
+        "checked": stats.total,
+        "listed": stats.listed,
+        "clean": stats.succeeded - stats.listed,
+        "cached": stats.cached,
+        "failed": stats.failed,
+        "by_rbl": summary.rows(),
+        "listed_ips": listed,
+        "failures": failures,
+    }
+    # ndjson already streamed one record per address
+    if output.current() != "ndjson" and not output.emit(data, "by_rbl"):
+        rows = summary.rows()
+        if rows:
+            table = Table(title="Listings by RBL")
+            table.add_column("RBL", style="cyan")
+            table.add_column("Listed IPs", style="red", justify="right")
+            table.add_column("Examples", style="yellow")
+
+            for row in rows:
+                table.add_row(row["rbl"], str(row["listed_ips"]), ", ".join(row["examples"]))
+
+            console.print(table)
+        else:
+            console.print("[bold green]✅ No scanned address is listed on any checked RBL[/]")
+
+        if listed:
+            title = "Listed Addresses" if len(listed) <= 50 else f"Listed Addresses (First 50 of {len(listed)})"
+            table = Table(title=title)
+            table.add_column("IP", style="cyan")
+            table.add_column("RBLs", style="red")
+
+            for record in listed[:50]:
+                table.add_row(record["ip"], ", ".join(l.get("rbl", "") for l in record["listings"]))
+
+            console.print(table)
+
+    console.print(f"\n[bold]Checked:[/] {stats.total} addresses in {stats.elapsed:.2f}s "
+                  f"({stats.throughput:.1f}/s, {stats.cached} from cache)")
+    color = "red" if stats.listed else "green"
+    console.print(f"[bold]Listed:[/] [{color}]{stats.listed}[/]")
+    if failures:
+        console.print(f"[bold red]Error:[/] {len(failures)} check(s) failed, e.g. "
+                      f"{failures[0]['ip']}: {failures[0]['error']}")
+        sys.exit(1)
+
+
 @main.command()
 @click.argument("target")
 def smtp_relay(target):
     """Check SMTP relay status for domain or email"""
     console.print(f"[bold cyan]Checking SMTP Relay for {target}...[/]\n")
 
-    result = api_request("/tools/smtp-relay-check", "POST", {
-        "target": target
-    })
+    result = api_request(*payloads.smtp_relay(target))
 
     data = result.get("data", {})
 
+    if output.emit(data, "tests_performed"):
+        return
+
     is_relay = data.get("is_open_relay", False)
     icon = "❌" if is_relay else "✅"
     color = "red" if is_relay else "green"
@@ -537,118 +1320,117 @@ def smtp_relay(target):
 
 @main.command()
 @click.argument("cert_file", type=click.Path(exists=True))
-@click.argument("key_file", type=click.Path(exists=True))
+@click.argument("key_file", required=False, type=click.Path(exists=True, dir_okay=False))
 @click.option("--format", "-f", type=click.Choice(["pkcs12", "jks"]), default="pkcs12",
               help="Output format (pkcs12 or jks)")
 @click.option("--password", "-p", default="", help="Password for keystore")
-@click.option("--alias", "-a", default="mycert", help="Certificate alias")
-@click.option("--output", "-o", type=click.Path(), help="Output file path")
-def cert_convert(cert_file, key_file, format, password, alias, output):
+@click.option("--alias", "-a", default=None,
+              help="Certificate alias (default: mycert, or each pair's name for a directory)")
+@click.option("--key-password", default=None, help="Password of an encrypted private key")
+@click.option("--legacy", is_flag=True,
+              help="Encrypt PKCS12 with SHA1/3DES for older Java and Windows versions")
+@click.option("--workers", "-w", default=None, type=click.IntRange(1, 256),
+              help="Processes for converting a directory (default: CPU count)")
+@click.option("--output", "-o", type=click.Path(),
+              help="Output file path, or output directory for a directory of pairs")
+def cert_convert(cert_file, key_file, format, password, alias, key_password, legacy, workers, output):
     """Convert PEM certificate to PKCS12 or JKS format
 
     This command converts PEM-formatted certificates and keys to PKCS12 or JKS keystores.
-    Processing is done locally on your machine for security.
+    Processing is done locally and in memory on your machine; no openssl or keytool
+    is needed. Given a directory instead of CERT_FILE and KEY_FILE, every cert/key pair
+    in it is converted in parallel.
 
     Examples:
 
         veribits cert-convert cert.pem key.pem --format pkcs12 -o cert.p12
 
         veribits cert-convert cert.pem key.pem --format jks --password changeit -o cert.jks
+
+        veribits cert-convert ./certs --format pkcs12 --password s3cret -o ./keystores
     """
-    import subprocess
-    import tempfile
+    from .engines import keystore
 
     console.print("[bold cyan]Converting Certificate...[/]\n")
 
-    # Determine output filename
-    if not output:
-        output = f"certificate.{format if format == 'jks' else 'p12'}"
+    label = "PKCS12" if format == "pkcs12" else "JKS (Java KeyStore)"
+    if os.path.isdir(cert_file):
+        if key_file:
+            console.print("[bold red]Error:[/] KEY_FILE cannot be used with a directory of pairs")
+            sys.exit(1)
+        _cert_convert_many(cert_file, format, password, alias, key_password, legacy, workers, output, label)
+        return
+    if not key_file:
+        console.print("[bold red]Error:[/] KEY_FILE is required unless CERT_FILE is a directory")
+        sys.exit(1)
 
+    alias = alias or "mycert"
+    if not output:
+        output = f"certificate.{keystore.FORMATS[format]}"
     try:
-        if format == "pkcs12":
-            # Convert directly to PKCS12 using openssl
-            cmd = [
-                "openssl", "pkcs12", "-export",
-                "-in", cert_file,
-                "-inkey", key_file,
-                "-out", output,
-                "-name", alias,
-                "-passout", f"pass:{password}"
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if result.returncode != 0:
-                console.print(f"[bold red]Error:[/] {result.stderr}")
-                sys.exit(1)
-
-            console.print(f"[bold green]✅ Certificate converted successfully![/]")
-            console.print(f"[bold]Format:[/] PKCS12")
-            console.print(f"[bold]Output File:[/] {output}")
-            console.print(f"[bold]Alias:[/] {alias}")
-
-        elif format == "jks":
-            # Convert via PKCS12 intermediate
-            with tempfile.NamedTemporaryFile(suffix='.p12', delete=False) as tmp:
-                p12_file = tmp.name
-
-            # First create PKCS12
-            cmd = [
-                "openssl", "pkcs12", "-export",
-                "-in", cert_file,
-                "-inkey", key_file,
-                "-out", p12_file,
-                "-name", alias,
-                "-passout", f"pass:{password or 'changeit'}"
-            ]
+        with open(cert_file, "rb") as f:
+            cert_pem = f.read()
+        with open(key_file, "rb") as f:
+            key_pem = f.read()
+        keystore.write_private(output, keystore.convert(cert_pem, key_pem, format, alias, password,
+                                                        key_password, legacy))
+    except keystore.KeystoreError as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+    except OSError as e:
+        console.print(f"[bold red]Error:[/] {e.filename or output}: {e.strerror or e}")
+        sys.exit(1)
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+    console.print(f"[bold green]✅ Certificate converted successfully![/]")
+    console.print(f"[bold]Format:[/] {label}")
+    console.print(f"[bold]Output File:[/] {output}")
+    console.print(f"[bold]Alias:[/] {alias.lower() if format == 'jks' else alias}")
+    _keystore_security_note()
 
-            if result.returncode != 0:
-                console.print(f"[bold red]Error creating PKCS12:[/] {result.stderr}")
-                os.unlink(p12_file)
-                sys.exit(1)
 
-            # Then convert PKCS12 to JKS using keytool
-            cmd = [
-                "keytool", "-importkeystore",
-                "-srckeystore", p12_file,
-                "-srcstoretype", "PKCS12",
-                "-srcstorepass", password or 'changeit',
-                "-destkeystore", output,
-                "-deststoretype", "JKS",
-                "-deststorepass", password or 'changeit'
-            ]
+def _keystore_security_note():
+    console.print("\n[bold yellow]⚠️  Security Note:[/]")
+    console.print("Store the keystore file securely and use a strong password.")
+    console.print("This conversion was performed locally on your machine.")
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
 
-            # Clean up temp file
-            os.unlink(p12_file)
+def _cert_convert_many(directory, format, password, alias, key_password, legacy, workers, output_dir, label):
+    """cert-convert for every cert/key pair under a directory"""
+    from .engines import keystore
 
-            if result.returncode != 0:
-                console.print(f"[bold red]Error creating JKS:[/] {result.stderr}")
-                console.print("\n[yellow]Note: keytool (Java) must be installed for JKS conversion[/]")
-                sys.exit(1)
+    pairs = keystore.find_pairs(directory)
+    if not pairs:
+        console.print(f"[bold red]Error:[/] No certificate and private key pairs found in {directory}")
+        sys.exit(1)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
 
-            console.print(f"[bold green]✅ Certificate converted successfully![/]")
-            console.print(f"[bold]Format:[/] JKS (Java KeyStore)")
-            console.print(f"[bold]Output File:[/] {output}")
-            console.print(f"[bold]Alias:[/] {alias}")
-
-        # Security reminder
-        console.print("\n[bold yellow]⚠️  Security Note:[/]")
-        console.print("Store the keystore file securely and use a strong password.")
-        console.print("This conversion was performed locally on your machine.")
-
-    except FileNotFoundError as e:
-        console.print(f"[bold red]Error:[/] Required tool not found")
-        if "openssl" in str(e):
-            console.print("Please install OpenSSL: https://www.openssl.org/")
-        elif "keytool" in str(e):
-            console.print("Please install Java JDK for keytool: https://www.oracle.com/java/")
+    start = time.perf_counter()
+    try:
+        records = list(keystore.convert_many(pairs, output_dir, format, alias, password, key_password,
+                                             legacy, workers))
+    except keystore.KeystoreError as e:
+        console.print(f"[bold red]Error:[/] {e}")
         sys.exit(1)
-    except Exception as e:
-        console.print(f"[bold red]Error:[/] {str(e)}")
+    elapsed = time.perf_counter() - start
+
+    failed = [record for record in records if "error" in record]
+    data = {"format": format, "files": records, "converted": len(records) - len(failed),
+            "failed": len(failed), "elapsed_ms": round(elapsed * 1000, 1)}
+    if not output.emit(data, "files"):
+        console.print(f"[bold]Format:[/] {label}")
+        console.print(f"[bold]Converted:[/] [green]{data['converted']}[/] of {len(records)} pairs "
+                      f"in {elapsed:.2f}s\n")
+        table = Table(title="Keystores")
+        table.add_column("Name", style="blue")
+        table.add_column("Certificate")
+        table.add_column("Output", style="green")
+        for record in records:
+            table.add_row(record["name"], record["cert"],
+                          f"[red]{record['error']}[/]" if "error" in record else record["output"])
+        console.print(table)
+        _keystore_security_note()
+    if failed:
         sys.exit(1)
 
 
@@ -660,12 +1442,12 @@ def traceroute(target, max_hops):
     console.print(f"[bold cyan]Tracing route to {target}...[/]\n")
     console.print("[dim]This may take 30-60 seconds...[/]\n")
 
-    result = api_request("/tools/traceroute", "POST", {
-        "target": target,
-        "max_hops": max_hops
-    })
+    result = api_request(*payloads.traceroute(target, max_hops))
 
     data = result.get("data", {})
+
+    if output.emit(data, "hops"):
+        return
     hops = data.get("hops", [])
 
     console.print(f"[bold]Target:[/] {data.get('target')}")
@@ -718,12 +1500,13 @@ def bgp_prefix(query):
     """Lookup BGP prefix or IP address"""
     console.print(f"[bold cyan]BGP Prefix Lookup for {query}...[/]\n")
 
-    result = api_request("/bgp/prefix", "POST", {
-        "query": query
-    })
+    result = api_request(*payloads.bgp_prefix(query))
 
     data = result.get("data", {})
 
+    if output.emit(data):
+        return
+
     console.print(f"[bold]Prefix:[/] [cyan]{data.get('prefix')}[/]")
     console.print(f"[bold]Name:[/] {data.get('name', 'N/A')}")
     console.print(f"[bold]Description:[/] {data.get('description', 'N/A')}")
@@ -747,12 +1530,13 @@ def bgp_asn(asn):
     """Lookup AS (Autonomous System) information"""
     console.print(f"[bold cyan]BGP AS Lookup for {asn}...[/]\n")
 
-    result = api_request("/bgp/asn", "POST", {
-        "asn": asn
-    })
+    result = api_request(*payloads.bgp_asn(asn))
 
     data = result.get("data", {})
 
+    if output.emit(data):
+        return
+
     console.print(f"[bold]ASN:[/] AS{data.get('asn')}")
     console.print(f"[bold]Name:[/] {data.get('name', 'N/A')}")
     console.print(f"[bold]Description:[/] {data.get('description', 'N/A')}")
@@ -783,12 +1567,13 @@ def bgp_prefixes(asn):
     """Get prefixes announced by an AS"""
     console.print(f"[bold cyan]Getting Prefixes for AS{asn}...[/]\n")
 
-    result = api_request("/bgp/asn/prefixes", "POST", {
-        "asn": asn
-    })
+    result = api_request(*payloads.bgp_prefixes(asn))
 
     data = result.get("data", {})
 
+    if output.emit(data, ("ipv4_prefixes", "ipv6_prefixes")):
+        return
+
     console.print(f"[bold]IPv4 Prefixes:[/] {data.get('ipv4_count', 0)}")
     console.print(f"[bold]IPv6 Prefixes:[/] {data.get('ipv6_count', 0)}\n")
 
@@ -818,12 +1603,13 @@ def bgp_peers(asn):
     """Get BGP peers for an AS"""
     console.print(f"[bold cyan]Getting BGP Peers for AS{asn}...[/]\n")
 
-    result = api_request("/bgp/asn/peers", "POST", {
-        "asn": asn
-    })
+    result = api_request(*payloads.bgp_peers(asn))
 
     data = result.get("data", {})
 
+    if output.emit(data, ("ipv4_peers", "ipv6_peers")):
+        return
+
     console.print(f"[bold]IPv4 Peers:[/] {data.get('ipv4_peer_count', 0)}")
     console.print(f"[bold]IPv6 Peers:[/] {data.get('ipv6_peer_count', 0)}\n")
 
@@ -850,12 +1636,13 @@ def bgp_upstreams(asn):
     """Get transit providers (upstreams) for an AS"""
     console.print(f"[bold cyan]Getting Transit Providers for AS{asn}...[/]\n")
 
-    result = api_request("/bgp/asn/upstreams", "POST", {
-        "asn": asn
-    })
+    result = api_request(*payloads.bgp_upstreams(asn))
 
     data = result.get("data", {})
 
+    if output.emit(data, ("ipv4_upstreams", "ipv6_upstreams")):
+        return
+
     console.print(f"[bold]IPv4 Upstreams:[/] {data.get('ipv4_upstream_count', 0)}")
     console.print(f"[bold]IPv6 Upstreams:[/] {data.get('ipv6_upstream_count', 0)}\n")
 
@@ -884,12 +1671,13 @@ def bgp_downstreams(asn):
     """Get customers (downstreams) for an AS"""
     console.print(f"[bold cyan]Getting Customers for AS{asn}...[/]\n")
 
-    result = api_request("/bgp/asn/downstreams", "POST", {
-        "asn": asn
-    })
+    result = api_request(*payloads.bgp_downstreams(asn))
 
     data = result.get("data", {})
 
+    if output.emit(data, ("ipv4_downstreams", "ipv6_downstreams")):
+        return
+
     console.print(f"[bold]IPv4 Downstreams:[/] {data.get('ipv4_downstream_count', 0)}")
     console.print(f"[bold]IPv6 Downstreams:[/] {data.get('ipv6_downstream_count', 0)}\n")
 
@@ -921,11 +1709,12 @@ def bgp_search(query):
     """Search for AS by name or description"""
     console.print(f"[bold cyan]Searching BGP for '{query}'...[/]\n")
 
-    result = api_request("/bgp/search", "POST", {
-        "query": query
-    })
+    result = api_request(*payloads.bgp_search(query))
 
     data = result.get("data", {})
+
+    if output.emit(data, ("results.asns", "results.ipv4_prefixes", "results.ipv6_prefixes")):
+        return
     results = data.get("results", {})
 
     asns = results.get("asns", [])
@@ -972,5 +1761,647 @@ def bgp_search(query):
         console.print(table)
 
 
+def _print_profile(report):
+    """Render a single merged AS profile"""
+    console.print(f"[bold]ASN:[/] AS{report.get('asn')}")
+    console.print(f"[bold]Name:[/] {report.get('name', 'N/A')}")
+    console.print(f"[bold]Description:[/] {report.get('description', 'N/A')}")
+    console.print(f"[bold]Country:[/] {report.get('country_code', 'N/A')}\n")
+
+    table = Table(title="Routing Profile")
+    table.add_column("", style="cyan")
+    table.add_column("IPv4", style="yellow", justify="right")
+    table.add_column("IPv6", style="yellow", justify="right")
+    for label, key in (("Prefixes", "count"), ("Peers", "peer_count"),
+                       ("Upstreams", "upstream_count"), ("Downstreams", "downstream_count")):
+        table.add_row(label, str(report.get(f"ipv4_{key}", "-")), str(report.get(f"ipv6_{key}", "-")))
+    console.print(table)
+
+    upstreams = report.get("ipv4_upstreams", [])
+    if upstreams:
+        table = Table(title="IPv4 Transit Providers")
+        table.add_column("ASN", style="cyan")
+        table.add_column("Name", style="yellow")
+        table.add_column("Country", style="green")
+
+        for upstream in upstreams:
+            table.add_row(
+                f"AS{upstream.get('asn', '')}",
+                upstream.get("name", ""),
+                upstream.get("country_code", "")
+            )
+
+        console.print(table)
+
+
+def _print_profile_summary(reports):
+    """Render one row per AS profile"""
+    table = Table(title="AS Profiles")
+    table.add_column("ASN", style="cyan")
+    table.add_column("Name", style="yellow")
+    table.add_column("Country", style="green")
+    table.add_column("IPv4 Prefixes", justify="right")
+    table.add_column("IPv6 Prefixes", justify="right")
+    table.add_column("Peers", justify="right")
+    table.add_column("Upstreams", justify="right")
+    table.add_column("Downstreams", justify="right")
+    table.add_column("Status")
+
+    for report in reports:
+        peers = report.get("ipv4_peer_count", 0) + report.get("ipv6_peer_count", 0)
+        upstreams = report.get("ipv4_upstream_count", 0) + report.get("ipv6_upstream_count", 0)
+        downstreams = report.get("ipv4_downstream_count", 0) + report.get("ipv6_downstream_count", 0)
+        if report["success"]:
+            status = "[green]OK[/]"
+        elif len(report["errors"]) < 5:
+            status = "[yellow]Partial[/]"
+        else:
+            status = "[red]Failed[/]"
+        table.add_row(
+            f"AS{report.get('asn')}",
+            report.get("name", ""),
+            report.get("country_code", ""),
+            str(report.get("ipv4_count", 0)),
+            str(report.get("ipv6_count", 0)),
+            str(peers),
+            str(upstreams),
+            str(downstreams),
+            status
+        )
+
+    console.print(table)
+
+    failures = [(report, part, error) for report in reports
+                for part, error in report.get("errors", {}).items()]
+    if failures:
+        table = Table(title="Failed Lookups (First 20)")
+        table.add_column("ASN", style="cyan")
+        table.add_column("Lookup", style="yellow")
+        table.add_column("Error", style="red")
+
+        for report, part, error in failures[:20]:
+            table.add_row(f"AS{report.get('asn')}", part, error)
+
+        console.print(table)
+
+
+@main.command()
+@click.argument("asns", nargs=-1)
+@click.option("--input", "-i", "input_file", type=click.File("r"),
+              help="File of ASNs, one per line ('-' for stdin)")
+@click.option("--concurrency", "-c", default=10, show_default=True, type=click.IntRange(1, 256),
+              help="Maximum number of API requests in flight")
+def bgp_profile(asns, input_file, concurrency):
+    """Profile one or more ASes: info, prefixes, peers, upstreams and downstreams
+
+    The five lookups for each AS are issued concurrently and merged into
+    one report.
+
+    Examples:
+
+        veribits bgp-profile AS13335
+
+        veribits bgp-profile 13335 15169 32934 --concurrency 20
+
+        veribits -o ndjson bgp-profile -i asns.txt
+    """
+    from .batch import BatchStats, read_inputs
+    from .bgp import profile_many
+
+    targets = list(asns)
+    if input_file is not None:
+        targets.extend(read_inputs(input_file))
+    if not targets:
+        console.print("[bold red]Error:[/] Provide at least one ASN or --input")
+        sys.exit(1)
+
+    console.print(f"[bold cyan]Profiling {len(targets)} AS{'es' if len(targets) > 1 else ''}...[/]\n")
+
+    stats = BatchStats()
+    reports = profile_many(targets, concurrency, stats)
+
+    if output.current() == "ndjson":
+        output.write_ndjson(reports)
+    else:
+        reports = list(reports)
+        if not output.emit({"profiles": reports}, "profiles"):
+            if len(reports) == 1 and reports[0]["success"]:
+                _print_profile(reports[0])
+            else:
+                _print_profile_summary(reports)
+
+    if len(targets) > 1:
+        console.print(f"\n[bold]Profiled:[/] {stats.total} in {stats.elapsed:.2f}s "
+                      f"({stats.throughput:.1f}/s, {stats.coalesced} duplicate requests coalesced)")
+    if stats.failed:
+        console.print(f"[bold red]Error:[/] {stats.failed} profile(s) incomplete")
+        sys.exit(1)
+
+
+_bgp_index_option = click.option(
+    "--index", "index_path", type=click.Path(dir_okay=False),
+    help="Index file (default: $VERIBITS_BGP_INDEX or the cache directory)")
+
+
+def _open_snapshot(source):
+    """Text lines of a local file, '-' (stdin) or http(s) URL; gzip is detected"""
+    import gzip
+    import io
+
+    if source == "-":
+        return sys.stdin
+    if source.startswith(("http://", "https://")):
+        from .session import get_session
+
+        response = get_session().get(source, stream=True, timeout=300)
+        if response.status_code != 200:
+            raise OSError(f"HTTP {response.status_code} fetching {source}")
+        response.raw.decode_content = True
+        raw = io.BufferedReader(response.raw)
+    else:
+        raw = open(source, "rb")
+    if raw.peek(2)[:2] == b"\x1f\x8b":
+        raw = gzip.GzipFile(fileobj=raw)
+    return io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+
+
+def _open_bgp_index(index_path):
+    from .engines.bgp_index import BGPIndexError, PrefixIndex
+
+    try:
+        return PrefixIndex(index_path)
+    except BGPIndexError as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+
+
+@main.group("bgp-index")
+def bgp_index_group():
+    """Offline prefix-to-origin lookups from a local BGP snapshot"""
+    pass
+
+
+@bgp_index_group.command("build")
+@click.argument("source")
+@_bgp_index_option
+def bgp_index_build(source, index_path):
+    """Compile a routing snapshot (file, URL or '-') into the local index
+
+    Accepts CAIDA pfx2as files, 'prefix asn [name]' lines and iptoasn
+    range files, optionally gzip-compressed.
+
+    Example:
+
+        veribits bgp-index build https://iptoasn.com/data/ip2asn-combined.tsv.gz
+    """
+    from .engines.bgp_index import BGPIndexError, build_index, default_index_path
+
+    index_path = index_path or default_index_path()
+    console.print(f"[bold cyan]Building BGP index from {source}...[/]\n")
+    started = time.perf_counter()
+    try:
+        with _open_snapshot(source) as lines:
+            header = build_index(index_path, lines, source=source)
+    except (BGPIndexError, OSError) as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+
+    console.print(f"[bold green]✅ Indexed {header['ipv4_prefixes']} IPv4 and "
+                  f"{header['ipv6_prefixes']} IPv6 prefixes from {header['asns']} ASes "
+                  f"in {time.perf_counter() - started:.1f}s[/]")
+    console.print(f"[bold]Index:[/] {index_path}")
+
+
+@bgp_index_group.command("update")
+@click.argument("delta")
+@_bgp_index_option
+def bgp_index_update(delta, index_path):
+    """Apply a delta of announcements and withdrawals to the index
+
+    Delta lines are '+ PREFIX ASN [NAME]' or '- PREFIX'.
+    """
+    from .engines.bgp_index import BGPIndexError, default_index_path, update_index
+
+    index_path = index_path or default_index_path()
+    try:
+        with _open_snapshot(delta) as lines:
+            header, announced, withdrawn = update_index(index_path, lines)
+    except (BGPIndexError, OSError) as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+
+    console.print(f"[bold green]✅ Applied {announced} announcements and {withdrawn} withdrawals[/]")
+    console.print(f"[bold]Prefixes:[/] {header['ipv4_prefixes']} IPv4, {header['ipv6_prefixes']} IPv6")
+
+
+@bgp_index_group.command("lookup")
+@click.argument("ips", nargs=-1)
+@click.option("--input", "-i", "input_file", type=click.File("r"),
+              help="File of addresses, one per line ('-' for stdin)")
+@_bgp_index_option
+def bgp_index_lookup(ips, input_file, index_path):
+    """Longest-prefix match addresses against the local index
+
+    Examples:
+
+        veribits bgp-index lookup 1.1.1.1 2606:4700::1111
+
+        veribits -o csv bgp-index lookup -i flows.txt > origins.csv
+    """
+    from .batch import read_inputs
+
+    addresses = iter(ips)
+    if input_file is not None:
+        from itertools import chain
+        addresses = chain(ips, read_inputs(input_file))
+
+    with _open_bgp_index(index_path) as index:
+        records = index.lookup_many(addresses)
+        if output.current() == "ndjson":
+            output.write_ndjson(records)
+            return
+        records = list(records)
+        if output.emit({"results": records}, "results"):
+            return
+
+        table = Table(title="Prefix Origins")
+        table.add_column("IP", style="cyan")
+        table.add_column("Prefix", style="yellow")
+        table.add_column("ASN", style="green")
+        table.add_column("Name")
+
+        for record in records:
+            if "error" in record:
+                table.add_row(record["ip"], f"[red]{record['error']}[/]", "", "")
+            elif record["prefix"] is None:
+                table.add_row(record["ip"], "[dim]not routed[/]", "", "")
+            else:
+                table.add_row(record["ip"], record["prefix"], f"AS{record['asn']}", record["name"] or "")
+
+        console.print(table)
+
+
+@bgp_index_group.command("search")
+@click.argument("query")
+@click.option("--limit", "-n", default=50, show_default=True, type=click.IntRange(1))
+@_bgp_index_option
+def bgp_index_search(query, limit, index_path):
+    """Find ASes in the local index by name substring or number"""
+    with _open_bgp_index(index_path) as index:
+        results = index.search(query, limit)
+
+    if output.emit({"asns": results}, "asns"):
+        return
+
+    if not results:
+        console.print("[yellow]No results found[/]")
+        return
+
+    table = Table(title="Autonomous Systems")
+    table.add_column("ASN", style="cyan")
+    table.add_column("Name", style="yellow")
+
+    for result in results:
+        table.add_row(f"AS{result['asn']}", result["name"] or "")
+
+    console.print(table)
+
+
+@bgp_index_group.command("info")
+@_bgp_index_option
+def bgp_index_info(index_path):
+    """Show the index source, age and size"""
+    with _open_bgp_index(index_path) as index:
+        info = index.info()
+
+    if output.emit(info):
+        return
+
+    console.print("[bold cyan]BGP Index[/]\n")
+    console.print(f"[bold]Path:[/] {info['path']}")
+    console.print(f"[bold]Source:[/] {info.get('source') or 'N/A'}")
+    console.print(f"[bold]Built:[/] {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(info['created']))}")
+    console.print(f"[bold]Updated:[/] {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(info['updated']))} "
+                  f"({info.get('deltas', 0)} deltas applied)")
+    console.print(f"[bold]Prefixes:[/] {info['ipv4_prefixes']} IPv4, {info['ipv6_prefixes']} IPv6")
+    console.print(f"[bold]ASes:[/] {info['asns']} ({info['named_asns']} named)")
+    console.print(f"[bold]Size:[/] {info['size_bytes'] / 1024 / 1024:.2f} MB")
+
+
+@main.group("cache")
+def cache_group():
+    """Manage the local response cache"""
+    pass
+
+
+@cache_group.command("stats")
+def cache_stats():
+    """Show response cache size and hit/miss statistics"""
+    stats = api.open_cache().stats()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+
+    if output.emit(dict(stats, hit_rate=round(hit_rate, 1))):
+        return
+
+    console.print("[bold cyan]Response Cache[/]\n")
+    console.print(f"[bold]Path:[/] {stats['path']}")
+    console.print(f"[bold]Entries:[/] {stats['entries']}")
+    console.print(f"[bold]Size:[/] {stats['size_bytes'] / 1024 / 1024:.2f} MB "
+                  f"of {stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    console.print(f"[bold]Hits:[/] [green]{stats['hits']}[/]")
+    console.print(f"[bold]Misses:[/] [yellow]{stats['misses']}[/]")
+    console.print(f"[bold]Hit Rate:[/] {hit_rate:.1f}%")
+
+
+@cache_group.command("clear")
+def cache_clear():
+    """Remove all cached responses"""
+    api.open_cache().clear()
+    console.print("[bold green]✅ Response cache cleared[/]")
+
+
+@main.group("bench")
+def bench_group():
+    """Measure CLI performance against a local mock API"""
+    pass
+
+
+@bench_group.command("run")
+@click.option("--scenario", "-s", "scenarios", multiple=True,
+              type=click.Choice(["single", "batch", "bgp-downstreams", "secrets"]),
+              help="Scenario to run (repeatable; default: all)")
+@click.option("--requests", "-n", "count", type=click.IntRange(min=1), default=200,
+              help="Requests per scenario (heavy-payload scenarios send 1/20 as many)")
+@click.option("--concurrency", "-c", type=click.IntRange(min=1), default=16,
+              help="Concurrent requests for the batch scenario")
+@click.option("--latency", type=click.FloatRange(min=0), default=20.0, help="Mock API latency (ms)")
+@click.option("--jitter", type=click.FloatRange(min=0), default=0.0, help="Random extra mock latency (ms)")
+@click.option("--items", type=click.IntRange(min=0), default=10000,
+              help="Entries in large list payloads such as BGP downstreams")
+@click.option("--secrets-mb", type=click.FloatRange(min=0.001), default=5.0,
+              help="Size of the text sent by the secrets scenario (MB)")
+@click.option("--api-url", help="Benchmark this API instead of starting the mock server")
+@click.option("--save", "save_path", type=click.Path(dir_okay=False, writable=True),
+              help="Also write the JSON report to this file")
+@click.option("--in-process", is_flag=True,
+              help="Run scenarios in this process (faster; peak RSS is cumulative)")
+def bench_run(scenarios, count, concurrency, latency, jitter, items, secrets_mb, api_url, save_path,
+              in_process):
+    """Run benchmark scenarios and report latency percentiles, throughput and peak RSS
+
+    Scenarios run against a bundled mock API with the given latency and
+    payload sizes. Use '-o json' or --save to record the report for
+    regression tracking.
+
+    Examples:
+
+        veribits bench run
+
+        veribits -o json bench run -s batch -n 1000 -c 32 --latency 5
+
+        veribits bench run -s bgp-downstreams --items 50000 --save bench.json
+    """
+    from . import bench
+
+    options = {"requests": count, "concurrency": concurrency, "latency_ms": latency,
+               "jitter_ms": jitter, "items": items, "secrets_mb": secrets_mb}
+    scenarios = list(scenarios) or list(bench.SCENARIOS)
+
+    try:
+        report = bench.run(scenarios, options, api_url, isolate=not in_process,
+                           progress=lambda name: console.print(f"[bold cyan]Running {name}...[/]"))
+    except (RuntimeError, OSError) as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+
+    if save_path:
+        bench.save(report, save_path)
+
+    if not output.emit(report, "scenarios"):
+        table = Table(title=f"Benchmark ({report['server']['url']})")
+        table.add_column("Scenario", style="cyan")
+        table.add_column("Requests", justify="right")
+        table.add_column("Errors", justify="right")
+        table.add_column("Req/s", justify="right", style="green")
+        table.add_column("p50 ms", justify="right")
+        table.add_column("p95 ms", justify="right")
+        table.add_column("p99 ms", justify="right", style="yellow")
+        table.add_column("Peak RSS MB", justify="right")
+
+        def fmt(value):
+            return "N/A" if value is None else f"{value:.1f}"
+
+        for result in report["scenarios"]:
+            latency_ms = result["latency_ms"]
+            table.add_row(result["name"], f"{result['requests']} x{result['concurrency']}",
+                          str(result["errors"]), fmt(result["throughput_rps"]), fmt(latency_ms["p50"]),
+                          fmt(latency_ms["p95"]), fmt(latency_ms["p99"]), fmt(result["peak_rss_mb"]))
+
+        console.print(table)
+        if save_path:
+            console.print(f"[bold green]✅ Report saved to {save_path}[/]")
+
+    if any(result["errors"] for result in report["scenarios"]):
+        console.print("[bold red]Error:[/] Some benchmark requests failed")
+        sys.exit(1)
+
+
+@bench_group.command("serve")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=click.IntRange(min=0, max=65535), default=8080, show_default=True)
+@click.option("--latency", type=click.FloatRange(min=0), default=0.0, help="Added latency per request (ms)")
+@click.option("--jitter", type=click.FloatRange(min=0), default=0.0, help="Random extra latency (ms)")
+@click.option("--items", type=click.IntRange(min=0), default=100, help="Entries in list payloads")
+def bench_serve(host, port, latency, jitter, items):
+    """Run the mock VeriBits API in the foreground
+
+    Point the CLI at it to try commands or profile them offline:
+
+        VERIBITS_API_URL=http://127.0.0.1:8080/api/v1 veribits bgp-downstreams 13335
+    """
+    from .mock_server import api_url, make_server
+
+    try:
+        server = make_server(host, port, latency / 1000, jitter / 1000, items)
+    except OSError as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+    console.print(f"[bold green]Mock API listening on {api_url(server)}[/] (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@main.group("daemon")
+def daemon_group():
+    """Serve 'vb' invocations from a warm background process"""
+    pass
+
+
+@daemon_group.command("start")
+@click.option("--socket", "path", type=click.Path(dir_okay=False),
+              help="Socket path (default: $VERIBITS_SOCKET or the runtime/cache directory)")
+@click.option("--detach", is_flag=True, help="Run in the background")
+@click.option("--idle-timeout", type=click.FloatRange(min=1), default=None,
+              help="Exit after this many seconds without requests")
+def daemon_start(path, detach, idle_timeout):
+    """Start the daemon; 'vb' forwards commands to it while it runs
+
+    The daemon keeps the interpreter, HTTP connection pool and response
+    cache warm and runs commands in forked worker processes. 'vb' falls
+    back to running in-process when it is not running, is busy or was
+    started with different VERIBITS_* settings.
+    """
+    from .daemon import DaemonError, DaemonServer
+
+    server = DaemonServer(path, idle_timeout)
+    try:
+        server.bind()
+    except (DaemonError, OSError) as e:
+        console.print(f"[bold red]Error:[/] {e}")
+        sys.exit(1)
+    server.warm_up()
+
+    if detach:
+        if os.fork():
+            console.print(f"[bold green]✅ Daemon started[/] on {server.path}")
+            os._exit(0)
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.close(devnull)
+    else:
+        console.print(f"[bold cyan]VeriBits daemon listening on {server.path}[/] (Ctrl-C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+@daemon_group.command("stop")
+@click.option("--socket", "path", type=click.Path(dir_okay=False), help="Socket path")
+def daemon_stop(path):
+    """Stop a running daemon"""
+    from .daemon import control
+
+    try:
+        reply = control("stop", path)
+    except OSError:
+        console.print("[yellow]No daemon is running[/]")
+        sys.exit(1)
+    console.print(f"[bold green]✅ Daemon stopped[/] (pid {reply.get('pid')})")
+
+
+@daemon_group.command("status")
+@click.option("--socket", "path", type=click.Path(dir_okay=False), help="Socket path")
+def daemon_status(path):
+    """Show whether the daemon is running and how many requests it served"""
+    from .daemon import control, socket_path
+
+    try:
+        status = control("status", path)
+    except OSError:
+        if output.emit({"running": False, "socket": path or socket_path()}):
+            sys.exit(1)
+        console.print(f"[yellow]No daemon is running[/] on {path or socket_path()}")
+        sys.exit(1)
+
+    if output.emit(dict(status, running=True)):
+        return
+
+    console.print("[bold cyan]VeriBits Daemon[/]\n")
+    console.print(f"[bold]PID:[/] {status['pid']}")
+    console.print(f"[bold]Socket:[/] {status['socket']}")
+    console.print(f"[bold]Uptime:[/] {status['uptime']:.0f}s")
+    console.print(f"[bold]Requests Served:[/] {status['requests']}")
+    console.print(f"[bold]Workers:[/] {status['workers']} ({status['busy']} busy)")
+
+
+def _parse_batch_options(command, options):
+    """Turn NAME=VALUE pairs into keyword arguments for the command's payload builder"""
+    kwargs = {}
+    for option in options:
+        name, sep, value = option.partition("=")
+        if not sep:
+            raise click.BadParameter(f"expected NAME=VALUE, got '{option}'", param_hint="--option")
+        try:
+            kwargs[name] = json.loads(value)
+        except json.JSONDecodeError:
+            kwargs[name] = value
+
+    try:
+        inspect.signature(payloads.SINGLE_INPUT[command]).bind("input", **kwargs)
+    except TypeError as e:
+        raise click.BadParameter(f"{command}: {e}", param_hint="--option")
+    return kwargs
+
+
+@main.command()
+@click.argument("command", type=click.Choice(sorted(payloads.SINGLE_INPUT)))
+@click.option("--input", "-i", "input_file", type=click.File("r"), required=True,
+              help="File with one input per line ('-' for stdin)")
+@click.option("--concurrency", "-c", default=8, type=click.IntRange(1, 256),
+              help="Maximum requests in flight")
+@click.option("--option", "-O", "options", multiple=True, metavar="NAME=VALUE",
+              help="Extra option passed to the command (e.g. -O type=MX)")
+@click.option("--out-file", type=click.File("w"), default="-",
+              help="NDJSON output file (default: stdout)")
+def batch(command, input_file, concurrency, options, out_file):
+    """Run a command over a file of inputs with bounded concurrency
+
+    Each input produces one NDJSON line, in input order. Failed items are
+    recorded and reported at the end instead of aborting the run.
+
+    Examples:
+
+        veribits batch rbl --input ips.txt --concurrency 16
+
+        veribits batch dns -i domains.txt -O type=MX --out-file mx.ndjson
+    """
+    from .batch import BatchStats, read_inputs, run_batch
+
+    kwargs = _parse_batch_options(command, options)
+    err_console = LazyConsole(stderr=True)
+    stats = BatchStats()
+    failures = []
+
+    for record in run_batch(command, read_inputs(input_file), concurrency, kwargs, stats):
+        out_file.write(json.dumps(record) + "\n")
+        if not record["success"]:
+            failures.append(record)
+
+    out_file.flush()
+
+    color = "red" if stats.failed else "green"
+    err_console.print(f"\n[bold]Processed:[/] {stats.total} in {stats.elapsed:.2f}s "
+                      f"({stats.throughput:.1f}/s)")
+    err_console.print(f"[bold]Succeeded:[/] [green]{stats.succeeded}[/]")
+    err_console.print(f"[bold]Failed:[/] [{color}]{stats.failed}[/]")
+
+    cache = api.default_client().cache
+    if cache is not None:
+        err_console.print(f"[bold]Cache:[/] {cache.hits} hits, {cache.misses} misses")
+    if stats.coalesced:
+        err_console.print(f"[bold]Coalesced:[/] {stats.coalesced} duplicate request(s) not sent")
+
+    if failures:
+        table = Table(title="Failures (First 20)")
+        table.add_column("Input", style="cyan")
+        table.add_column("Status", style="yellow")
+        table.add_column("Error", style="red")
+
+        for record in failures[:20]:
+            table.add_row(record["input"], str(record["status_code"] or ""), record["error"])
+
+        err_console.print(table)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,11 @@
+"""
+VeriBits Python client library
+
+    from veribits.client import VeriBitsClient, AsyncVeriBitsClient
+"""
+
+from ..errors import APIError, VeriBitsError
+from .aio import AsyncVeriBitsClient
+from .sync import VeriBitsClient
+
+__all__ = ["APIError", "AsyncVeriBitsClient", "VeriBitsClient", "VeriBitsError"]
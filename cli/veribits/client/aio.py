@@ -0,0 +1,157 @@
+"""
+Asyncio VeriBits client
+
+Requires aiohttp (``pip install 'veribits[async]'``). A single client
+multiplexes many concurrent requests over one keep-alive connection pool:
+
+    async with AsyncVeriBitsClient(concurrency=200) as client:
+        results = await asyncio.gather(*(client.rbl_check(ip) for ip in ips))
+"""
+
+from typing import Any, Awaitable, Dict, Optional
+import asyncio
+import json
+
+from .. import settings
+from ..coalesce import Coalescer
+from ..errors import APIError, VeriBitsError
+from ..resilience import Resilience, TransientError, parse_retry_after, retryable
+from ..settings import API_KEY, API_URL, CONNECT_TIMEOUT
+from .endpoints import Endpoints, FileInput, error_detail, read_upload
+
+
+class AsyncVeriBitsClient(Endpoints[Awaitable[Dict[str, Any]]]):
+    """Asyncio client; endpoint methods return awaitables of the response ``data`` dict"""
+
+    def __init__(self, api_url: Optional[str] = None, api_key: Optional[str] = None,
+                 concurrency: int = 100, timeout: Optional[float] = None,
+                 resilience: Optional[Resilience] = None, coalescer: Optional[Coalescer] = None):
+        self.api_url = (api_url or API_URL).rstrip("/")
+        self.api_key = API_KEY if api_key is None else api_key
+        self.concurrency = concurrency
+        self.timeout = settings.timeout() if timeout is None else timeout
+        self.resilience = resilience or Resilience(retries=settings.retries(), rate=settings.rate())
+        self.coalescer = coalescer or Coalescer()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _aiohttp(self):
+        try:
+            import aiohttp
+        except ImportError:
+            raise VeriBitsError("AsyncVeriBitsClient requires aiohttp: pip install 'veribits[async]'")
+        return aiohttp
+
+    def _get_session(self):
+        if self._session is None:
+            aiohttp = self._aiohttp()
+            headers = {"User-Agent": "veribits-cli"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=self.timeout),
+                headers=headers,
+            )
+        return self._session
+
+    async def request(self, endpoint: str, method: str = "GET", data: Optional[Dict[str, Any]] = None,
+                      files: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make API request to VeriBits and return the decoded JSON response
+
+        ``files`` maps field names to (filename, bytes) tuples. Transient
+        failures are retried with backoff, and identical concurrent
+        requests are sent once, as in VeriBitsClient.
+        """
+        if files:
+            return await self._fetch(endpoint, method, data, files)
+        return await self.coalescer.run_async(endpoint, data,
+                                              lambda: self._fetch(endpoint, method, data, None))
+
+    async def _fetch(self, endpoint, method, data, files):
+        """Send the request, retrying transient failures"""
+        guard = self.resilience
+        # Uploads are not replayed: the body may be large and the scan not idempotent
+        attempts = guard.attempts(replayable=not files)
+        for attempt in range(attempts):
+            wait = guard.before_request()
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                result = await self._send(endpoint, method, data, files)
+            except TransientError as e:
+                if e.status_code == 429 and guard.start_throttling():
+                    guard.configure_rate(await self._limits(), bool(self.api_key))
+                await asyncio.sleep(guard.retry_delay(e, attempt, attempts))
+            except APIError:
+                guard.breaker.success()
+                raise
+            else:
+                guard.breaker.success()
+                return result
+
+    async def _send(self, endpoint, method, data, files):
+        """One HTTP exchange; raises TransientError for failures worth retrying"""
+        aiohttp = self._aiohttp()
+        session = self._get_session()
+        url = f"{self.api_url}{endpoint}"
+        kwargs = {}
+
+        if files:
+            form = aiohttp.FormData()
+            for field, (filename, content) in files.items():
+                form.add_field(field, content, filename=filename)
+            kwargs["data"] = form
+        elif method == "POST":
+            kwargs["json"] = data
+
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                body = await response.read()
+                if response.status >= 400:
+                    detail = retry_after = None
+                    try:
+                        parsed = json.loads(body)
+                        detail = error_detail(parsed)
+                        retry_after = parsed.get("reset_in_seconds")
+                    except (ValueError, AttributeError):
+                        pass
+                    message = f"{response.status} {response.reason} for url: {url}"
+                    if not retryable(response.status):
+                        raise APIError(message, status_code=response.status, detail=detail)
+                    raise TransientError(message, response.status, detail,
+                                          parse_retry_after(response.headers.get("Retry-After", retry_after)))
+                return json.loads(body)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            raise TransientError(str(e) or type(e).__name__) from e
+        except aiohttp.ClientError as e:
+            raise APIError(str(e)) from e
+        except ValueError as e:
+            raise APIError(f"Invalid JSON response from {url}: {e}") from e
+
+    async def _limits(self):
+        """/limits/anonymous data for sizing the rate limit; empty for API keys or on failure"""
+        if self.api_key:
+            return {}
+        try:
+            return (await self._send("/limits/anonymous", "GET", None, None)).get("data", {})
+        except APIError:
+            return {}
+
+    async def _dispatch(self, endpoint, method, data):
+        return (await self.request(endpoint, method, data)).get("data", {})
+
+    async def _upload(self, endpoint, file: FileInput, filename):
+        result = await self.request(endpoint, "POST", files={"file": read_upload(file, filename)})
+        return result.get("data", {})
+
+    async def close(self):
+        """Close the underlying connection pool"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
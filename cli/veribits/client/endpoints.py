@@ -0,0 +1,147 @@
+"""
+Typed endpoint methods shared by the sync and async clients
+
+Every method builds its request with veribits.payloads and hands it to
+the client's _dispatch(), which returns the response ``data`` dict
+(directly for VeriBitsClient, as an awaitable for AsyncVeriBitsClient).
+"""
+
+from typing import Any, BinaryIO, Dict, Generic, Iterable, Optional, TypeVar, Union
+import os
+
+from .. import payloads
+
+R = TypeVar("R")
+
+FileInput = Union[str, "os.PathLike[str]", bytes, BinaryIO]
+
+
+class Endpoints(Generic[R]):
+    """API endpoint methods; subclasses implement _dispatch() and _upload()"""
+
+    def _dispatch(self, endpoint: str, method: str, data: Optional[Dict[str, Any]]) -> R:
+        raise NotImplementedError
+
+    def _upload(self, endpoint: str, file: FileInput, filename: Optional[str]) -> R:
+        raise NotImplementedError
+
+    # JWT
+
+    def jwt_decode(self, token: str, secret: Optional[str] = None, verify: bool = False) -> R:
+        """POST /jwt/decode"""
+        return self._dispatch(*payloads.jwt_decode(token, secret, verify))
+
+    def jwt_sign(self, secret: str, payload: Dict[str, Any], expires: int = 3600) -> R:
+        """POST /jwt/sign"""
+        return self._dispatch(*payloads.jwt_sign(secret, payload, expires))
+
+    # Developer tools
+
+    def regex_test(self, pattern: str, text: str, flags: str = "g") -> R:
+        """POST /tools/regex-test"""
+        return self._dispatch(*payloads.regex(pattern, text, flags))
+
+    def scan_secrets(self, text: str) -> R:
+        """POST /tools/scan-secrets"""
+        return self._dispatch(*payloads.secrets(text))
+
+    def generate_hash(self, text: str,
+                      algorithms: Iterable[str] = ("md5", "sha256", "sha512")) -> R:
+        """POST /tools/generate-hash"""
+        return self._dispatch(*payloads.hash(text, algorithms))
+
+    # Cryptocurrency
+
+    def validate_bitcoin(self, value: str, type: str = "address") -> R:
+        """POST /crypto/validate/bitcoin"""
+        return self._dispatch(*payloads.bitcoin(value, type))
+
+    def validate_ethereum(self, value: str, type: str = "address") -> R:
+        """POST /crypto/validate/ethereum"""
+        return self._dispatch(*payloads.ethereum(value, type))
+
+    # Files
+
+    def file_magic(self, file: FileInput, filename: Optional[str] = None) -> R:
+        """POST /file-magic with a path, bytes or binary file object"""
+        return self._upload("/file-magic", file, filename)
+
+    # Account
+
+    def anonymous_limits(self) -> R:
+        """GET /limits/anonymous"""
+        return self._dispatch(*payloads.limits())
+
+    # Network tools
+
+    def dns_validate(self, domain: str, record_type: str = "A") -> R:
+        """POST /tools/dns-validate"""
+        return self._dispatch(*payloads.dns(domain, record_type))
+
+    def whois(self, query: str) -> R:
+        """POST /tools/whois"""
+        return self._dispatch(*payloads.whois(query))
+
+    def ip_calculate(self, ip: str, subnet: Optional[str] = None) -> R:
+        """POST /tools/ip-calculate"""
+        return self._dispatch(*payloads.ipcalc(ip, subnet))
+
+    def rbl_check(self, ip: str) -> R:
+        """POST /tools/rbl-check"""
+        return self._dispatch(*payloads.rbl(ip))
+
+    def smtp_relay_check(self, target: str) -> R:
+        """POST /tools/smtp-relay-check"""
+        return self._dispatch(*payloads.smtp_relay(target))
+
+    def traceroute(self, target: str, max_hops: int = 30) -> R:
+        """POST /tools/traceroute"""
+        return self._dispatch(*payloads.traceroute(target, max_hops))
+
+    # BGP
+
+    def bgp_prefix(self, query: str) -> R:
+        """POST /bgp/prefix"""
+        return self._dispatch(*payloads.bgp_prefix(query))
+
+    def bgp_asn(self, asn: Union[str, int]) -> R:
+        """POST /bgp/asn"""
+        return self._dispatch(*payloads.bgp_asn(asn))
+
+    def bgp_asn_prefixes(self, asn: Union[str, int]) -> R:
+        """POST /bgp/asn/prefixes"""
+        return self._dispatch(*payloads.bgp_prefixes(asn))
+
+    def bgp_asn_peers(self, asn: Union[str, int]) -> R:
+        """POST /bgp/asn/peers"""
+        return self._dispatch(*payloads.bgp_peers(asn))
+
+    def bgp_asn_upstreams(self, asn: Union[str, int]) -> R:
+        """POST /bgp/asn/upstreams"""
+        return self._dispatch(*payloads.bgp_upstreams(asn))
+
+    def bgp_asn_downstreams(self, asn: Union[str, int]) -> R:
+        """POST /bgp/asn/downstreams"""
+        return self._dispatch(*payloads.bgp_downstreams(asn))
+
+    def bgp_search(self, query: str) -> R:
+        """POST /bgp/search"""
+        return self._dispatch(*payloads.bgp_search(query))
+
+
+def error_detail(body):
+    """Message of an API error body: {"error": {"message": ...}} or {"error": ..., "message": ...}"""
+    error = body.get("error")
+    if isinstance(error, dict):
+        return error.get("message", "Unknown error")
+    return body.get("message") or error or "Unknown error"
+
+
+def read_upload(file: FileInput, filename: Optional[str]):
+    """Return (filename, content) for an upload argument"""
+    if isinstance(file, bytes):
+        return filename or "upload.bin", file
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            return filename or os.path.basename(os.fspath(file)), f.read()
+    return filename or os.path.basename(getattr(file, "name", "upload.bin")), file.read()
@@ -0,0 +1,166 @@
+"""
+Synchronous VeriBits client built on the shared pooled session
+"""
+
+from typing import Any, Dict, Optional
+import os
+import time
+
+import requests
+
+from .. import settings, tracing
+from ..coalesce import Coalescer
+from ..errors import APIError
+from ..resilience import Resilience, TransientError, parse_retry_after, retryable
+from ..session import get_session
+from ..settings import API_KEY, API_URL, CONNECT_TIMEOUT
+from .endpoints import Endpoints, FileInput, error_detail, read_upload
+
+
+class VeriBitsClient(Endpoints[Dict[str, Any]]):
+    """Blocking client; endpoint methods return the response ``data`` dict
+
+        client = VeriBitsClient()
+        records = client.dns_validate("example.com", "MX")["records"]
+
+    Pass a veribits.cache.ResponseCache as ``cache`` to serve repeated
+    lookups from disk. Identical requests made concurrently from several
+    threads are sent once; ``coalescer.saved`` counts the others.
+    """
+
+    def __init__(self, api_url: Optional[str] = None, api_key: Optional[str] = None,
+                 timeout: Optional[float] = None, cache=None, resilience: Optional[Resilience] = None,
+                 coalescer: Optional[Coalescer] = None):
+        self.api_url = (api_url or API_URL).rstrip("/")
+        self.api_key = API_KEY if api_key is None else api_key
+        self.timeout = settings.timeout() if timeout is None else timeout
+        self.cache = cache
+        self.resilience = resilience or Resilience(retries=settings.retries(), rate=settings.rate())
+        self.coalescer = coalescer or Coalescer()
+
+    def request(self, endpoint: str, method: str = "GET", data: Optional[Dict[str, Any]] = None,
+                files: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make API request to VeriBits and return the decoded JSON response
+
+        Connection errors, timeouts, 429 and 5xx responses are retried with
+        backoff; uploads are sent once because their file streams are
+        consumed.
+        """
+        with tracing.span(f"{method} {endpoint}", tracing.KIND_CLIENT,
+                          **{"http.request.method": method, "url.path": endpoint}) as span:
+            if files:
+                return self._fetch(endpoint, method, data, files)
+
+            if self.cache is not None:
+                cached = self.cache.get(endpoint, data)
+                if span is not None:
+                    span.attributes["veribits.cache"] = "miss" if cached is None else "hit"
+                if cached is not None:
+                    return cached
+            return self.coalescer.run(endpoint, data, lambda: self._fetch_and_store(endpoint, method, data))
+
+    def _fetch_and_store(self, endpoint, method, data):
+        result = self._fetch(endpoint, method, data, None)
+        if self.cache is not None:
+            self.cache.put(endpoint, data, result)
+        return result
+
+    def _fetch(self, endpoint, method, data, files):
+        """Send the request, retrying transient failures"""
+        guard = self.resilience
+        attempts = guard.attempts(replayable=not files)
+        for attempt in range(attempts):
+            wait = guard.before_request()
+            if wait:
+                time.sleep(wait)
+            try:
+                result = self._send(endpoint, method, data, files)
+            except TransientError as e:
+                if e.status_code == 429 and guard.start_throttling():
+                    guard.configure_rate(self._limits(), bool(self.api_key))
+                time.sleep(guard.retry_delay(e, attempt, attempts))
+            except APIError:
+                guard.breaker.success()
+                raise
+            else:
+                guard.breaker.success()
+                return result
+
+    def _send(self, endpoint, method, data, files):
+        """One HTTP exchange; raises TransientError for failures worth retrying"""
+        url = f"{self.api_url}{endpoint}"
+        headers = {}
+
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        session = get_session()
+        timeout = (min(CONNECT_TIMEOUT, self.timeout), self.timeout) if self.timeout else None
+
+        try:
+            start = time.perf_counter()
+            if method == "GET":
+                response = session.get(url, headers=headers, timeout=timeout)
+            elif method == "POST":
+                if files:
+                    response = session.post(url, headers=headers, files=files, timeout=timeout)
+                else:
+                    headers["Content-Type"] = "application/json"
+                    response = session.post(url, headers=headers, json=data, timeout=timeout)
+            else:
+                raise ValueError(f"Unsupported method: {method}")
+            received = time.perf_counter()
+
+            if tracing.enabled():
+                # The traced connection notes when getresponse() parsed the headers;
+                # the body has been read by the time requests returns
+                headers_at = tracing.headers_received_since(start, received)
+                tracing.phase("ttfb", tracing.connected_since(start), headers_at,
+                              **{"http.response.status_code": response.status_code})
+                tracing.phase("download", headers_at, received,
+                              **{"http.response.body.size": len(response.content)})
+            response.raise_for_status()
+            decode_start = time.perf_counter()
+            result = response.json()
+            tracing.phase("json_decode", decode_start)
+            return result
+
+        except requests.exceptions.RequestException as e:
+            status_code = None
+            detail = None
+            retry_after = None
+            if e.response is not None:
+                status_code = e.response.status_code
+                try:
+                    body = e.response.json()
+                    detail = error_detail(body)
+                    retry_after = body.get("reset_in_seconds")
+                except (ValueError, AttributeError):
+                    pass
+                retry_after = parse_retry_after(e.response.headers.get("Retry-After", retry_after))
+            if status_code is None:
+                transient = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+            else:
+                transient = retryable(status_code)
+            if transient:
+                raise TransientError(str(e), status_code, detail, retry_after) from e
+            raise APIError(str(e), status_code=status_code, detail=detail) from e
+
+    def _limits(self):
+        """/limits/anonymous data for sizing the rate limit; empty for API keys or on failure"""
+        if self.api_key:
+            return {}
+        try:
+            return self._send("/limits/anonymous", "GET", None, None).get("data", {})
+        except APIError:
+            return {}
+
+    def _dispatch(self, endpoint, method, data):
+        return self.request(endpoint, method, data).get("data", {})
+
+    def _upload(self, endpoint: str, file: FileInput, filename: Optional[str]):
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as f:
+                name = filename or os.path.basename(os.fspath(file))
+                return self.request(endpoint, "POST", files={"file": (name, f)}).get("data", {})
+        return self.request(endpoint, "POST", files={"file": read_upload(file, filename)}).get("data", {})
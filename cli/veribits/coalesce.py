@@ -0,0 +1,75 @@
+"""
+Coalescing of identical concurrent API requests
+
+Requests are keyed on the endpoint and the canonical JSON of their
+payload. While one request for a key is in flight, further callers with
+the same key wait for its outcome instead of sending their own, so a
+batch with repeated targets costs one request per distinct target in
+flight. Outcomes are not kept once the request completes; the response
+cache covers repeats spread further apart.
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+
+
+def request_key(endpoint, payload):
+    """Key identifying a request by endpoint and canonical JSON payload"""
+    return f"{endpoint}\0{json.dumps(payload, sort_keys=True, separators=(',', ':'))}"
+
+
+class Coalescer:
+    """Share one in-flight request among concurrent callers with the same key
+
+    ``saved`` counts the requests that were answered by another caller's
+    request instead of being sent.
+    """
+
+    def __init__(self):
+        self.saved = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def run(self, endpoint, payload, fetch):
+        """Return fetch(), or the result of an identical call already in flight
+
+        Exceptions are shared the same way: every waiting caller raises the
+        error of the request it joined.
+        """
+        key = request_key(endpoint, payload)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.saved += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def run_async(self, endpoint, payload, fetch):
+        """Coroutine version of run(); ``fetch`` is a coroutine function"""
+        import asyncio
+
+        key = request_key(endpoint, payload)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.saved += 1
+        else:
+            task = self._inflight[key] = asyncio.ensure_future(fetch())
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
@@ -0,0 +1,602 @@
+"""
+Background daemon for near-zero-latency CLI invocations
+
+``veribits daemon start`` keeps one warm interpreter with the pooled HTTP
+session and the response cache open behind a Unix domain socket. The
+``vb`` entry point connects to it, passes its stdin, stdout and stderr
+file descriptors along with argv and the working directory, and waits
+for the exit status; the daemon runs the command with those descriptors
+so output, colors and piped input behave as if it ran in-process. When
+no daemon is listening, ``vb`` runs the command in-process as before.
+
+Commands run in worker processes forked from the warm daemon. A worker
+runs one command at a time and keeps its HTTP session and in-memory
+caches between commands, so concurrent ``vb`` calls each get their own
+worker instead of queueing. When a client disconnects (Ctrl-C) before
+its command finishes, the worker and everything it started are killed.
+A client whose request is not accepted within ACCEPT_TIMEOUT, for example
+because all workers are busy, runs the command in-process instead.
+
+Passing descriptors needs socket.send_fds(), new in Python 3.9; on older
+versions ``vb`` always runs in-process.
+"""
+
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+import time
+
+SOCKET_NAME = "daemon.sock"
+MAX_MESSAGE = 1024 * 1024
+
+# Seconds vb waits for the daemon to accept a command before running it itself
+ACCEPT_TIMEOUT = 2.0
+# Seconds the daemon waits for a connected client's request
+REQUEST_TIMEOUT = 5.0
+# Seconds a cancelled worker gets to exit after SIGTERM before SIGKILL
+KILL_GRACE = 1.0
+
+# Client environment that changes results; a daemon started with different
+# values cannot serve the request
+FORWARDED_SETTINGS = ("VERIBITS_API_URL", "VERIBITS_API_KEY", "VERIBITS_CACHE",
+                      "VERIBITS_CACHE_DIR", "VERIBITS_CACHE_MAX_MB", "VERIBITS_POOL_SIZE",
+                      "VERIBITS_TIMEOUT", "VERIBITS_RETRIES", "VERIBITS_RATE", "VERIBITS_MANIFEST",
+                      "VERIBITS_BGP_INDEX", "XDG_CACHE_HOME")
+
+# Terminal settings applied per request so Rich renders for the client's terminal
+TERMINAL_ENV = ("TERM", "COLORTERM", "NO_COLOR", "FORCE_COLOR", "COLUMNS", "LINES")
+
+# Per-command defaults applied per request, unset when the client has none,
+# so the daemon's own environment never leaks into a command
+REQUEST_ENV = ("VERIBITS_OUTPUT", "VERIBITS_TRACE")
+
+
+class DaemonError(Exception):
+    """The daemon could not be reached or returned an invalid reply"""
+
+
+def socket_path():
+    """Return the daemon socket path, honoring VERIBITS_SOCKET and XDG_RUNTIME_DIR"""
+    path = os.getenv("VERIBITS_SOCKET")
+    if path:
+        return path
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "veribits", SOCKET_NAME)
+    from .settings import cache_dir
+
+    return os.path.join(cache_dir(), SOCKET_NAME)
+
+
+def supported():
+    """True when this Python can pass file descriptors over Unix sockets"""
+    return hasattr(socket, "send_fds")
+
+
+def _settings():
+    return {name: os.environ[name] for name in FORWARDED_SETTINGS if name in os.environ}
+
+
+def _send(sock, message, fds=()):
+    data = json.dumps(message).encode() + b"\n"
+    if fds:
+        socket.send_fds(sock, [data], list(fds))
+    else:
+        sock.sendall(data)
+
+
+def _receive(sock, with_fds=False):
+    """Read one newline-terminated JSON message (and any passed descriptors)"""
+    fds = []
+    if with_fds:
+        data, fds, _, _ = socket.recv_fds(sock, MAX_MESSAGE, 3)
+    else:
+        data = sock.recv(MAX_MESSAGE)
+    while data and not data.endswith(b"\n"):
+        chunk = sock.recv(MAX_MESSAGE)
+        if not chunk:
+            break
+        data += chunk
+    if not data:
+        raise DaemonError("daemon closed the connection")
+    return json.loads(data), fds
+
+
+def _connect(path=None, timeout=None):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path or socket_path())
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def control(command, path=None, timeout=5.0):
+    """Send a control message ("status" or "stop") and return the reply"""
+    with _connect(path, timeout) as sock:
+        _send(sock, {"control": command})
+        reply, _ = _receive(sock)
+    return reply
+
+
+def forward(argv, path=None, accept_timeout=ACCEPT_TIMEOUT):
+    """Run argv in the daemon and return its exit status
+
+    Returns None when no daemon is available, it cannot serve this
+    environment or it does not accept the command within
+    ``accept_timeout`` seconds, so the caller can run the command
+    in-process. The command only starts once this side confirms, so a
+    command given up on is never run twice.
+    """
+    if not supported():
+        return None
+    try:
+        sock = _connect(path, timeout=1.0)
+    except OSError:
+        return None
+
+    with sock:
+        sock.settimeout(accept_timeout)
+        request = {
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "settings": _settings(),
+            "terminal": {name: os.environ[name] for name in TERMINAL_ENV if name in os.environ},
+            "env": {name: os.environ[name] for name in REQUEST_ENV if os.getenv(name)},
+        }
+        if "COLUMNS" not in request["terminal"] and os.isatty(1):
+            request["terminal"]["COLUMNS"] = str(os.get_terminal_size(1).columns)
+        if os.getenv("VERIBITS_TRACE"):
+            request["env"]["VERIBITS_TRACE"] = os.path.abspath(os.environ["VERIBITS_TRACE"])
+
+        try:
+            _send(sock, request)
+            reply, _ = _receive(sock)
+        except socket.timeout:
+            return None
+        if reply.get("fallback"):
+            return None
+
+        # stdio goes along only once the daemon has accepted, so a daemon
+        # that never answers cannot keep the client's pipes open. Commands
+        # may run for as long as they need; Ctrl-C closes the connection,
+        # which makes the daemon kill the command.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sock.settimeout(None)
+        _send(sock, {"start": True}, fds=(0, 1, 2))
+        reply, _ = _receive(sock)
+    return reply.get("exit", 1)
+
+
+def vb_main():
+    """Entry point for ``vb``: forward to a running daemon or run in-process"""
+    argv = sys.argv[1:]
+    if os.getenv("VERIBITS_DAEMON", "1") != "0" and "daemon" not in argv:
+        try:
+            status = forward(argv)
+        except (OSError, ValueError, DaemonError) as e:
+            sys.stderr.write(f"veribits: daemon request failed: {e}\n")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            sys.exit(130)
+        if status is not None:
+            sys.exit(status)
+
+    from .cli import main
+    main()
+
+
+# Server
+
+
+class _Request:
+    """Swap process-wide stdio, cwd and per-request env to the client's for one command"""
+
+    def __init__(self, request, fds):
+        self.request = request
+        self.fds = fds
+        self.saved_env = {}
+
+    def __enter__(self):
+        stdin_fd, stdout_fd, stderr_fd = self.fds
+        self.saved = (sys.stdin, sys.stdout, sys.stderr, os.getcwd())
+        sys.stdin = open(stdin_fd, "r", encoding="utf-8", errors="replace")
+        sys.stdout = open(stdout_fd, "w", encoding="utf-8", errors="replace", buffering=1)
+        sys.stderr = open(stderr_fd, "w", encoding="utf-8", errors="replace", buffering=1)
+
+        client_env = {**self.request.get("terminal", {}), **self.request.get("env", {})}
+        for name in TERMINAL_ENV + REQUEST_ENV:
+            self.saved_env[name] = os.environ.get(name)
+            value = client_env.get(name)
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        os.chdir(self.request["cwd"])
+        return self
+
+    def __exit__(self, *exc):
+        for stream in (sys.stdout, sys.stderr, sys.stdin):
+            try:
+                if stream.writable():
+                    stream.flush()
+            except (OSError, ValueError):
+                pass
+            try:
+                stream.close()
+            except OSError:
+                pass
+        sys.stdin, sys.stdout, sys.stderr, cwd = self.saved
+        os.chdir(cwd)
+        for name, value in self.saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_command(argv):
+    """Run the CLI in this process and return its exit status"""
+    from .cli import main
+
+    try:
+        main.main(args=argv, prog_name="vb", standalone_mode=True)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        sys.stderr.write(f"{e.code}\n")
+        return 1
+    except Exception:
+        import traceback
+
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _exit_code(status):
+    """Shell-style exit code for a waitpid() status"""
+    if os.WIFSIGNALED(status):
+        return 128 + os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _worker_main(channel):
+    """Run the commands the daemon sends over ``channel`` until it closes"""
+    # Own process group, so cancelling a command also stops its pools and subprocesses
+    os.setpgid(0, 0)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    while True:
+        try:
+            request, fds = _receive(channel, with_fds=True)
+        except (OSError, DaemonError):
+            return
+        with _Request(request, fds):
+            status = run_command(request["argv"])
+        _send(channel, {"exit": status})
+
+
+class _Worker:
+    """A forked copy of the warm daemon running one command at a time"""
+
+    def __init__(self, pid, channel):
+        self.pid = pid
+        self.channel = channel
+        # Client connection of the running command, or None when idle
+        self.conn = None
+
+
+class DaemonServer:
+    """Unix socket server that runs CLI commands in warm worker processes"""
+
+    def __init__(self, path=None, idle_timeout=None, max_workers=None):
+        self.path = path or socket_path()
+        self.idle_timeout = idle_timeout
+        self.max_workers = max_workers or max(4, 2 * (os.cpu_count() or 1))
+        self.started = time.time()
+        self.requests = 0
+        self.settings = _settings()
+        self.running = False
+        self.workers = []
+        self._sock = None
+        self._selector = None
+        # Connections whose request has not arrived yet: conn -> deadline
+        self._connecting = {}
+        # Accepted connections waiting for the client's start: conn -> request
+        self._pending = {}
+        # Client descriptors being handed to a worker
+        self._handoff = []
+
+    def bind(self):
+        """Create the socket (owner-only permissions), replacing a stale one"""
+        if not supported():
+            raise DaemonError("daemon mode needs Python 3.9 or later (socket.send_fds)")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.path):
+            try:
+                _connect(self.path, timeout=1.0).close()
+            except OSError:
+                os.unlink(self.path)
+            else:
+                raise DaemonError(f"a daemon is already listening on {self.path}")
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            self._sock.bind(self.path)
+        finally:
+            os.umask(umask)
+        self._sock.listen(64)
+
+    def warm_up(self):
+        """Import the CLI and open the HTTP session and cache before the first request"""
+        import multiprocessing
+
+        from . import api, cli  # noqa: F401
+        from .output import Table
+        from .session import get_session
+
+        # Worker pools started from a long-lived process should not fork its state
+        try:
+            multiprocessing.set_start_method("forkserver")
+        except (RuntimeError, ValueError):
+            pass
+        Table()
+        get_session()
+        api.default_client()
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "workers": len(self.workers),
+            "busy": sum(worker.conn is not None for worker in self.workers),
+            "api_url": self.settings.get("VERIBITS_API_URL"),
+        }
+
+    def serve_forever(self):
+        self.running = True
+        # Stop the workers on SIGTERM too, not only on Ctrl-C or "daemon stop"
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._sock, selectors.EVENT_READ, ("accept", None))
+        last_active = time.monotonic()
+        try:
+            while self.running:
+                busy = self._connecting or self._pending or any(worker.conn for worker in self.workers)
+                timeout = None
+                if self._connecting:
+                    timeout = max(0.0, min(self._connecting.values()) - time.monotonic())
+                elif self.idle_timeout and not busy:
+                    timeout = max(0.0, last_active + self.idle_timeout - time.monotonic())
+                    if not timeout:
+                        break
+                for key, _ in self._selector.select(timeout):
+                    kind, item = key.data
+                    try:
+                        if kind == "accept":
+                            self._accept()
+                        elif kind == "request":
+                            self._request_event(key.fileobj)
+                        elif kind == "client":
+                            self._client_event(key.fileobj, item)
+                        else:
+                            self._worker_event(item)
+                    except (OSError, ValueError, DaemonError):
+                        pass
+                    last_active = time.monotonic()
+                self._expire_connecting()
+        finally:
+            self.close()
+
+    def _accept(self):
+        """Wait for a new connection's request without blocking other clients"""
+        conn, _ = self._sock.accept()
+        # Only bounds reading the rest of a request that arrived in pieces
+        conn.settimeout(REQUEST_TIMEOUT)
+        self._connecting[conn] = time.monotonic() + REQUEST_TIMEOUT
+        self._selector.register(conn, selectors.EVENT_READ, ("request", None))
+
+    def _request_event(self, conn):
+        """A new connection sent its request"""
+        del self._connecting[conn]
+        try:
+            accepted = self.handle(conn)
+        except BaseException:
+            self._drop(conn)
+            raise
+        if accepted:
+            self._selector.modify(conn, selectors.EVENT_READ, ("client", None))
+        else:
+            self._drop(conn)
+
+    def _expire_connecting(self):
+        """Drop connections that sent no request within REQUEST_TIMEOUT"""
+        now = time.monotonic()
+        for conn, deadline in list(self._connecting.items()):
+            if deadline <= now:
+                del self._connecting[conn]
+                self._drop(conn)
+
+    def handle(self, conn):
+        """Answer a new connection; True when a command awaits the client's start"""
+        request, fds = _receive(conn, with_fds=True)
+        try:
+            if "control" in request:
+                if request["control"] == "stop":
+                    self.running = False
+                    _send(conn, {"stopped": True, "pid": os.getpid()})
+                else:
+                    _send(conn, self.status())
+                return False
+
+            if request.get("settings", {}) != self.settings:
+                _send(conn, {"fallback": "environment differs from the daemon's"})
+                return False
+            if all(worker.conn for worker in self.workers) and len(self.workers) >= self.max_workers:
+                _send(conn, {"fallback": "all workers are busy"})
+                return False
+
+            _send(conn, {"accepted": True})
+            self._pending[conn] = request
+            return True
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _client_event(self, conn, worker):
+        """The client started its command with its stdio, or disconnected"""
+        if conn in self._pending:
+            request = self._pending.pop(conn)
+            fds = []
+            try:
+                message, fds = _receive(conn, with_fds=True)
+                if message.get("start") and len(fds) == 3:
+                    worker = self._dispatch(conn, request, fds)
+                    self._selector.modify(conn, selectors.EVENT_READ, ("client", worker))
+                    return
+            except (OSError, ValueError, DaemonError):
+                pass
+            finally:
+                # The worker has its own copies now
+                for fd in fds:
+                    os.close(fd)
+            self._drop(conn)
+            return
+
+        try:
+            message = conn.recv(MAX_MESSAGE)
+        except OSError:
+            message = b""
+        if worker is not None and not message:
+            # The client went away before its command finished
+            self._retire(worker, kill=True)
+
+    def _dispatch(self, conn, request, fds):
+        """Hand a command and the client's stdio to an idle worker"""
+        self._handoff = fds
+        try:
+            worker = next((worker for worker in self.workers if worker.conn is None), None) or self._spawn()
+        finally:
+            self._handoff = []
+        _send(worker.channel, request, fds)
+        worker.conn = conn
+        self.requests += 1
+        return worker
+
+    def _spawn(self):
+        parent_end, child_end = socket.socketpair()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                parent_end.close()
+                self._close_inherited()
+                _worker_main(child_end)
+                status = 0
+            finally:
+                os._exit(status)
+        child_end.close()
+        worker = _Worker(pid, parent_end)
+        self.workers.append(worker)
+        self._selector.register(parent_end, selectors.EVENT_READ, ("worker", worker))
+        return worker
+
+    def _close_inherited(self):
+        """In a new worker, drop the daemon's sockets so only the daemon holds them"""
+        self._selector.close()
+        self._sock.close()
+        for conn in (*self._connecting, *self._pending):
+            conn.close()
+        for fd in self._handoff:
+            os.close(fd)
+        for worker in self.workers:
+            worker.channel.close()
+            if worker.conn is not None:
+                worker.conn.close()
+
+    def _worker_event(self, worker):
+        """A worker finished its command, or died"""
+        try:
+            reply, _ = _receive(worker.channel)
+        except (OSError, ValueError, DaemonError):
+            self._retire(worker)
+            return
+        if worker.conn is not None:
+            conn, worker.conn = worker.conn, None
+            try:
+                _send(conn, {"exit": reply.get("exit", 1)})
+            finally:
+                self._drop(conn)
+
+    def _retire(self, worker, kill=False):
+        """Stop a worker (killing its process group) and report its exit to its client"""
+        self.workers.remove(worker)
+        self._selector.unregister(worker.channel)
+        worker.channel.close()
+        if kill:
+            try:
+                os.killpg(worker.pid, signal.SIGTERM)
+            except OSError:
+                pass
+        deadline = time.monotonic() + KILL_GRACE
+        while True:
+            pid, status = os.waitpid(worker.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.monotonic() > deadline:
+                try:
+                    os.killpg(worker.pid, signal.SIGKILL)
+                except OSError:
+                    pass
+                _, status = os.waitpid(worker.pid, 0)
+                break
+            time.sleep(0.01)
+        if worker.conn is not None:
+            try:
+                _send(worker.conn, {"exit": _exit_code(status)})
+            except OSError:
+                pass
+            self._drop(worker.conn)
+            worker.conn = None
+
+    def _drop(self, conn):
+        try:
+            self._selector.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+        conn.close()
+
+    def close(self):
+        for conn in (*self._connecting, *self._pending):
+            self._drop(conn)
+        self._connecting.clear()
+        self._pending.clear()
+        for worker in list(self.workers):
+            # Idle workers exit when their channel closes; busy ones are stopped
+            self._retire(worker, kill=worker.conn is not None)
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
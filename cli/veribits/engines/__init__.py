@@ -0,0 +1,7 @@
+"""
+Local engines for VeriBits tools
+
+Engines compute results on this machine for tools whose work is pure
+computation, returning the same fields as the corresponding API endpoint
+so the CLI can render either source unchanged.
+"""
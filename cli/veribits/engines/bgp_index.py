@@ -0,0 +1,537 @@
+"""
+Local BGP prefix-to-origin index
+
+A routing snapshot (CAIDA pfx2as, "prefix asn [name]" lines or iptoasn
+ranges) is compiled into a single memory-mapped file. Nested prefixes are
+flattened into sorted, disjoint address ranges, each pointing at its most
+specific covering prefix, so a longest-prefix match is one binary search:
+bisect for single addresses, numpy.searchsorted over whole arrays for
+bulk lookups. IPv6 prefixes are indexed on their upper 64 bits (longer
+prefixes are treated as /64).
+
+The source prefix table is stored alongside the ranges so delta files of
+announcements and withdrawals can be applied without the full snapshot.
+AS names are kept in a lowercase, newline-separated blob with an offset
+table, which is scanned for substring search directly from the mapping.
+"""
+
+import array
+import bisect
+import ipaddress
+import json
+import mmap
+import os
+import socket
+import struct
+import sys
+import time
+
+from ..errors import VeriBitsError
+
+MAGIC = b"VBBGPIX1"
+FORMAT_VERSION = 1
+INDEX_NAME = "bgp-index.bin"
+
+NO_MATCH = 0xFFFFFFFF
+
+# Indexed key width per address family
+KEY_BITS = {4: 32, 6: 64}
+KEY_TYPE = {4: "I", 6: "Q"}
+NUMPY_TYPE = {"I": "<u4", "Q": "<u8", "B": "u1"} if sys.byteorder == "little" else \
+             {"I": ">u4", "Q": ">u8", "B": "u1"}
+
+
+class BGPIndexError(VeriBitsError):
+    """Missing or unreadable BGP index, or an invalid snapshot line"""
+
+
+def default_index_path():
+    from ..settings import cache_dir
+
+    return os.getenv("VERIBITS_BGP_INDEX") or os.path.join(cache_dir(), INDEX_NAME)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def address_key(text):
+    """Return (version, key) for an address, or (None, None) if it is invalid"""
+    text = text.strip()
+    try:
+        if ":" in text:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, text), "big") >> 64
+        if text.count(".") == 3:
+            return 4, int.from_bytes(socket.inet_aton(text), "big")
+    except OSError:
+        pass
+    return None, None
+
+
+def _prefix_key(prefix):
+    """Return (version, network key, length) for 'a.b.c.d/nn' or 'x::/nn'"""
+    address, _, length = prefix.partition("/")
+    version, key = address_key(address)
+    if version is None or not length.isdigit() or int(length) > (32 if version == 4 else 128):
+        raise BGPIndexError(f"Invalid prefix: {prefix}")
+    bits = KEY_BITS[version]
+    length = min(int(length), bits)
+    mask = ((1 << bits) - 1) ^ ((1 << (bits - length)) - 1)
+    return version, key & mask, length
+
+
+def format_prefix(version, key, length):
+    if version == 4:
+        return f"{socket.inet_ntoa(key.to_bytes(4, 'big'))}/{length}"
+    return f"{socket.inet_ntop(socket.AF_INET6, (key << 64).to_bytes(16, 'big'))}/{length}"
+
+
+def _asn(field):
+    """First origin of 'AS13335', '13335', '123_456' (MOAS) or '{123,456}' (AS set)"""
+    if field.isdigit():
+        return int(field)
+    field = field.strip().strip("{}").upper()
+    if field.startswith("AS"):
+        field = field[2:]
+    for separator in ("_", ","):
+        field = field.split(separator)[0]
+    return int(field) if field.isdigit() else None
+
+
+def parse_snapshot(lines):
+    """Yield (prefix, asn, name) from pfx2as, CIDR or iptoasn range lines
+
+    Supported line formats (whitespace or tab separated):
+
+        1.0.0.0<TAB>24<TAB>13335                  CAIDA pfx2as
+        1.0.0.0/24 13335 [AS name]                CIDR and origin
+        1.0.0.0<TAB>1.0.0.255<TAB>13335<TAB>US<TAB>CLOUDFLARENET   iptoasn
+
+    Unrouted iptoasn ranges (AS 0) are skipped.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if "/" in line.split(None, 1)[0]:
+            fields = line.split(None, 2)
+            if len(fields) < 2:
+                raise BGPIndexError(f"Line {number}: expected 'prefix asn [name]'")
+            asn = _asn(fields[1])
+            if asn is not None:
+                yield fields[0], asn, fields[2].strip() if len(fields) > 2 else None
+            continue
+
+        fields = line.split("\t") if "\t" in line else line.split()
+        if len(fields) >= 3 and fields[1].isdigit():
+            asn = _asn(fields[2])
+            if asn is not None:
+                yield f"{fields[0]}/{fields[1]}", asn, None
+        elif len(fields) >= 3 and ("." in fields[1] or ":" in fields[1]):
+            asn = _asn(fields[2])
+            if not asn:
+                continue
+            name = fields[4].strip() if len(fields) > 4 else None
+            try:
+                networks = ipaddress.summarize_address_range(
+                    ipaddress.ip_address(fields[0]), ipaddress.ip_address(fields[1]))
+                for network in networks:
+                    yield str(network), asn, name
+            except ValueError as e:
+                raise BGPIndexError(f"Line {number}: {e}")
+        else:
+            raise BGPIndexError(f"Line {number}: unrecognized snapshot format")
+
+
+def parse_delta(lines):
+    """Yield ('+', prefix, asn, name) announcements and ('-', prefix, None, None) withdrawals
+
+    Lines look like '+ 192.0.2.0/24 64500 [name]' or '- 192.0.2.0/24';
+    'A' and 'W' may be used instead of '+' and '-', and unsigned lines are
+    announcements.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        action = "+"
+        if line[0] in "+-AW" and (len(line) == 1 or line[1] in " \t"):
+            action = "-" if line[0] in "-W" else "+"
+            line = line[1:].strip()
+        fields = line.split(None, 2)
+        if action == "-":
+            if not fields:
+                raise BGPIndexError(f"Line {number}: expected '- prefix'")
+            yield "-", fields[0], None, None
+            continue
+        asn = _asn(fields[1]) if len(fields) > 1 else None
+        if asn is None:
+            raise BGPIndexError(f"Line {number}: expected '+ prefix asn [name]'")
+        yield "+", fields[0], asn, fields[2].strip() if len(fields) > 2 else None
+
+
+def _flatten(table, bits, code):
+    """Split sorted (network, length) prefixes into disjoint (start, prefix index) ranges
+
+    ``table`` is sorted by network then length, so enclosing prefixes come
+    before the prefixes nested in them. Uncovered gaps map to NO_MATCH.
+    """
+    starts, owners = array.array(code), array.array("I")
+
+    def emit(start, end, owner):
+        if start <= end:
+            if owners and owners[-1] == owner:
+                return
+            starts.append(start)
+            owners.append(owner)
+
+    stack = []
+    cursor = 0
+    for index, (network, length) in enumerate(table):
+        end = network | ((1 << (bits - length)) - 1)
+        while stack and stack[-1][0] < network:
+            top_end, top_index = stack.pop()
+            emit(cursor, top_end, top_index)
+            cursor = top_end + 1
+        emit(cursor, network - 1, stack[-1][1] if stack else NO_MATCH)
+        stack.append((end, index))
+        cursor = network
+    while stack:
+        top_end, top_index = stack.pop()
+        emit(cursor, top_end, top_index)
+        cursor = top_end + 1
+    if cursor <= (1 << bits) - 1:
+        emit(cursor, (1 << bits) - 1, NO_MATCH)
+    return starts, owners
+
+
+def write_index(path, prefixes, names, meta=None):
+    """Compile {(version, network, length): asn} and {asn: name} into an index file
+
+    The file is written next to ``path`` and renamed over it, so open
+    readers keep their old mapping.
+    """
+    sections = {}
+    for version in (4, 6):
+        entries = sorted((network, length, asn) for (v, network, length), asn in prefixes.items()
+                         if v == version)
+        code = KEY_TYPE[version]
+        starts, owners = _flatten([(n, l) for n, l, _ in entries], KEY_BITS[version], code)
+        sections[f"v{version}_network"] = array.array(code, (n for n, _, _ in entries))
+        sections[f"v{version}_length"] = array.array("B", (l for _, l, _ in entries))
+        sections[f"v{version}_asn"] = array.array("I", (a for _, _, a in entries))
+        sections[f"v{version}_starts"] = starts
+        sections[f"v{version}_owner"] = owners
+
+    ordered = sorted((asn, name) for asn, name in names.items() if name)
+    sections["names_asn"] = array.array("I", (asn for asn, _ in ordered))
+    for section, transform in (("names", str), ("search", str.lower)):
+        blob, offsets = bytearray(), array.array("I", [0])
+        for _, name in ordered:
+            blob += transform(name).encode("utf-8", "replace") + b"\n"
+            offsets.append(len(blob))
+        sections[section] = bytes(blob)
+        sections[f"{section}_offsets"] = offsets
+
+    header = dict(meta or {})
+    header.update({
+        "format": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "ipv4_prefixes": len(sections["v4_length"]),
+        "ipv6_prefixes": len(sections["v6_length"]),
+        "asns": len(set(prefixes.values())),
+        "named_asns": len(ordered),
+    })
+    header.setdefault("created", time.time())
+
+    # Section offsets are relative to the 8-byte aligned end of the header
+    layout, offset = {}, 0
+    for name, data in sections.items():
+        size = len(data) * data.itemsize if isinstance(data, array.array) else len(data)
+        code = data.typecode if isinstance(data, array.array) else "bytes"
+        layout[name] = [offset, code, len(data)]
+        offset += (size + 7) & ~7
+    header["sections"] = layout
+    encoded = json.dumps(header).encode()
+    base = _data_offset(len(encoded))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        f.write(b"\0" * (base - f.tell()))
+        for name, data in sections.items():
+            f.write(data.tobytes() if isinstance(data, array.array) else data)
+            f.write(b"\0" * (-f.tell() % 8))
+    os.replace(temporary, path)
+    return header
+
+
+def _data_offset(header_length):
+    return (len(MAGIC) + 4 + header_length + 7) & ~7
+
+
+def build_index(path, lines, source=None):
+    """Compile a snapshot into an index file and return its header"""
+    prefixes, names = {}, {}
+    for prefix, asn, name in parse_snapshot(lines):
+        prefixes[_prefix_key(prefix)] = asn
+        if name:
+            names[asn] = name
+    now = time.time()
+    return write_index(path, prefixes, names,
+                       {"source": source, "created": now, "updated": now, "deltas": 0})
+
+
+def update_index(path, lines):
+    """Apply a delta file to an existing index; returns (header, announced, withdrawn)"""
+    with PrefixIndex(path) as index:
+        prefixes = dict(index.iter_prefixes())
+        names = dict(index.iter_names())
+        meta = {key: index.header.get(key) for key in ("source", "created", "deltas")}
+
+    announced = withdrawn = 0
+    for action, prefix, asn, name in parse_delta(lines):
+        key = _prefix_key(prefix)
+        if action == "-":
+            withdrawn += prefixes.pop(key, None) is not None
+        else:
+            prefixes[key] = asn
+            announced += 1
+            if name:
+                names[asn] = name
+
+    meta["updated"] = time.time()
+    meta["deltas"] = (meta.get("deltas") or 0) + 1
+    return write_index(path, prefixes, names, meta), announced, withdrawn
+
+
+class PrefixIndex:
+    """Read-only view of an index file through a shared memory mapping"""
+
+    def __init__(self, path=None):
+        self.path = path or default_index_path()
+        try:
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise BGPIndexError(f"No BGP index at {self.path}; "
+                                "build one with 'veribits bgp-index build SNAPSHOT'")
+        except ValueError:
+            raise BGPIndexError(f"BGP index {self.path} is empty")
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise BGPIndexError(f"{self.path} is not a VeriBits BGP index")
+        (length,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        self.header = json.loads(self._mm[len(MAGIC) + 4:len(MAGIC) + 4 + length])
+        if self.header.get("format") != FORMAT_VERSION or self.header.get("byteorder") != sys.byteorder:
+            self._mm.close()
+            raise BGPIndexError(f"{self.path} was built by an incompatible version; rebuild it")
+
+        self._base = _data_offset(length)
+        self._views = {}
+        self._arrays = {}
+        self._prefix_memo = {}
+        self._name_memo = {}
+        self._np = _numpy()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._arrays.clear()
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        try:
+            self._mm.close()
+        except BufferError:
+            # A caller still holds an array view; the mapping closes with it
+            pass
+
+    def _view(self, name):
+        """Zero-copy memoryview of a numeric section"""
+        view = self._views.get(name)
+        if view is None:
+            offset, code, count = self.header["sections"][name]
+            offset += self._base
+            view = memoryview(self._mm)[offset:offset + count * struct.calcsize(code)].cast(code)
+            self._views[name] = view
+        return view
+
+    def _array(self, name):
+        """Zero-copy NumPy array of a numeric section"""
+        data = self._arrays.get(name)
+        if data is None:
+            offset, code, count = self.header["sections"][name]
+            offset += self._base
+            data = self._np.frombuffer(self._mm, dtype=NUMPY_TYPE[code], count=count, offset=offset)
+            self._arrays[name] = data
+        return data
+
+    def _blob(self, name):
+        offset, _, count = self.header["sections"][name]
+        return self._base + offset, self._base + offset + count
+
+    # Lookups
+
+    def find(self, version, key):
+        """Index of the longest matching prefix for an address key, or None"""
+        starts = self._view(f"v{version}_starts")
+        owner = self._view(f"v{version}_owner")[bisect.bisect_right(starts, key) - 1]
+        return None if owner == NO_MATCH else owner
+
+    def find_many(self, version, keys):
+        """Longest-match prefix indexes for a sequence of keys (NO_MATCH where unrouted)"""
+        if self._np is None:
+            return [self.find(version, key) for key in keys]
+        np = self._np
+        starts = self._array(f"v{version}_starts")
+        keys = np.asarray(keys, dtype=starts.dtype)
+        owners = self._array(f"v{version}_owner")[np.searchsorted(starts, keys, side="right") - 1]
+        return [None if owner == NO_MATCH else owner for owner in owners.tolist()]
+
+    def origin_asns(self, keys, version=4):
+        """Origin ASN per address key as a NumPy array, 0 where unrouted
+
+        The fast path for enrichment pipelines that already hold addresses
+        as integers; requires NumPy.
+        """
+        np = self._np
+        if np is None:
+            raise BGPIndexError("origin_asns requires NumPy (pip install 'veribits[bulk]')")
+        starts = self._array(f"v{version}_starts")
+        owners = self._array(f"v{version}_owner")[
+            np.searchsorted(starts, np.asarray(keys, dtype=starts.dtype), side="right") - 1]
+        asns = self._array(f"v{version}_asn")
+        if not len(asns):
+            return np.zeros(len(owners), dtype=np.uint32)
+        matched = owners != NO_MATCH
+        return np.where(matched, asns[np.where(matched, owners, 0)], 0)
+
+    def prefix(self, version, index):
+        """(prefix string, origin ASN) of a prefix index"""
+        memo = self._prefix_memo.get((version, index))
+        if memo is None:
+            network = self._view(f"v{version}_network")[index]
+            length = self._view(f"v{version}_length")[index]
+            memo = (format_prefix(version, network, length), self._view(f"v{version}_asn")[index])
+            self._prefix_memo[(version, index)] = memo
+        return memo
+
+    def name(self, asn):
+        """AS name from the snapshot, or None"""
+        if asn in self._name_memo:
+            return self._name_memo[asn]
+        asns = self._view("names_asn")
+        position = bisect.bisect_left(asns, asn)
+        name = None
+        if position < len(asns) and asns[position] == asn:
+            offsets = self._view("names_offsets")
+            start, _ = self._blob("names")
+            name = self._mm[start + offsets[position]:start + offsets[position + 1] - 1].decode()
+        self._name_memo[asn] = name
+        return name
+
+    def _record(self, ip, version, index):
+        if index is None:
+            return {"ip": ip, "prefix": None, "asn": None, "name": None}
+        prefix, asn = self.prefix(version, index)
+        return {"ip": ip, "prefix": prefix, "asn": asn, "name": self.name(asn)}
+
+    def lookup(self, ip):
+        """Longest-prefix match for one address"""
+        ip = ip.strip()
+        version, key = address_key(ip)
+        if version is None:
+            return {"ip": ip, "error": "Invalid IP address"}
+        return self._record(ip, version, self.find(version, key))
+
+    def lookup_many(self, ips, chunk_size=65536):
+        """Yield lookup() records for an iterable of addresses, in input order
+
+        IPv4 addresses are matched a chunk at a time with array searches.
+        """
+        chunk = []
+        for ip in ips:
+            chunk.append(ip.strip())
+            if len(chunk) >= chunk_size:
+                yield from self._lookup_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._lookup_chunk(chunk)
+
+    def _lookup_chunk(self, chunk):
+        results = [None] * len(chunk)
+        rows, keys = {4: [], 6: []}, {4: [], 6: []}
+        for row, ip in enumerate(chunk):
+            version, key = address_key(ip)
+            if version is None:
+                results[row] = {"ip": ip, "error": "Invalid IP address"}
+            else:
+                rows[version].append(row)
+                keys[version].append(key)
+        for version in (4, 6):
+            if rows[version]:
+                for row, index in zip(rows[version], self.find_many(version, keys[version])):
+                    results[row] = self._record(chunk[row], version, index)
+        return results
+
+    # Name search
+
+    def search(self, query, limit=50):
+        """AS records whose name contains ``query`` (case-insensitive) or whose number matches it"""
+        query = query.strip()
+        results, seen = [], set()
+        asn = _asn(query)
+        if asn is not None:
+            seen.add(asn)
+            results.append({"asn": asn, "name": self.name(asn)})
+
+        needle = query.lower().encode()
+        if not needle or b"\n" in needle:
+            return results
+        start, end = self._blob("search")
+        offsets = self._view("search_offsets")
+        asns = self._view("names_asn")
+        position = self._mm.find(needle, start, end)
+        while position != -1 and len(results) < limit:
+            record = bisect.bisect_right(offsets, position - start) - 1
+            if asns[record] not in seen:
+                seen.add(asns[record])
+                results.append({"asn": asns[record], "name": self.name(asns[record])})
+            position = self._mm.find(needle, start + offsets[record + 1], end)
+        return results
+
+    # Export for delta updates
+
+    def iter_prefixes(self):
+        """Yield ((version, network, length), asn) for every stored prefix"""
+        for version in (4, 6):
+            networks = self._view(f"v{version}_network")
+            lengths = self._view(f"v{version}_length")
+            asns = self._view(f"v{version}_asn")
+            for network, length, asn in zip(networks, lengths, asns):
+                yield (version, network, length), asn
+
+    def iter_names(self):
+        asns = self._view("names_asn")
+        offsets = self._view("names_offsets")
+        start, _ = self._blob("names")
+        for position, asn in enumerate(asns):
+            yield asn, self._mm[start + offsets[position]:start + offsets[position + 1] - 1].decode()
+
+    def info(self):
+        header = {key: value for key, value in self.header.items() if key != "sections"}
+        header["path"] = self.path
+        header["size_bytes"] = len(self._mm)
+        return header
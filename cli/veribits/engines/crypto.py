@@ -0,0 +1,410 @@
+"""
+Local Bitcoin and Ethereum address validation engine
+
+Implements full Base58Check (double SHA-256 checksum), Bech32/Bech32m
+(BIP-173/BIP-350) and EIP-55 (Keccak-256) checks and returns the same
+fields as /crypto/validate/bitcoin and /crypto/validate/ethereum. The
+verdicts are stricter than the API's, which only checks the character
+set and length of Bitcoin addresses and treats a mixed-case Ethereum
+address with a wrong checksum as valid (with a warning); here such an
+address is invalid, as EIP-55 intends.
+Large address lists are split into batches and validated on a process
+pool.
+"""
+
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE58_INDEX = {c: i for i, c in enumerate(BASE58_ALPHABET)}
+
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+BECH32_INDEX = {c: i for i, c in enumerate(BECH32_CHARSET)}
+BECH32_CONST = 1
+BECH32M_CONST = 0x2bc830a3
+
+# Base58Check version byte -> (format, network)
+BASE58_VERSIONS = {
+    0x00: ("P2PKH (Legacy)", "mainnet"),
+    0x05: ("P2SH (Script Hash)", "mainnet"),
+    0x6f: ("P2PKH (Legacy)", "testnet"),
+    0xc4: ("P2SH (Script Hash)", "testnet"),
+}
+
+BECH32_NETWORKS = {"bc": "mainnet", "tb": "testnet", "bcrt": "regtest"}
+
+ETH_ADDRESS_RE = re.compile(r"^0x[a-fA-F0-9]{40}$")
+ETH_TX_RE = re.compile(r"^0x[a-fA-F0-9]{64}$")
+BTC_TX_RE = re.compile(r"^[a-fA-F0-9]{64}$")
+
+BATCH_SIZE = 2048
+
+
+# Keccak-256 (the pre-standard SHA-3 padding used by Ethereum)
+
+_KECCAK_RC = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+_KECCAK_ROT = [
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+]
+_MASK64 = (1 << 64) - 1
+
+
+# (source lane, destination lane, rotation) of the rho and pi steps
+_KECCAK_PI = [(x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5), _KECCAK_ROT[x + 5 * y])
+              for y in range(5) for x in range(5)]
+
+
+def _keccak_f(state):
+    """keccak-f[1600] over 25 64-bit lanes"""
+    a = list(state)
+    b = [0] * 25
+    mask = _MASK64
+    for rc in _KECCAK_RC:
+        # theta
+        c = [a[x] ^ a[x + 5] ^ a[x + 10] ^ a[x + 15] ^ a[x + 20] for x in range(5)]
+        d = [c[x - 1] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63)) & mask) for x in range(5)]
+        # rho and pi
+        for source, destination, rotation in _KECCAK_PI:
+            t = a[source] ^ d[source % 5]
+            b[destination] = ((t << rotation) | (t >> (64 - rotation))) & mask
+        # chi
+        for y in range(0, 25, 5):
+            b0, b1, b2, b3, b4 = b[y:y + 5]
+            a[y] = b0 ^ (~b1 & b2)
+            a[y + 1] = b1 ^ (~b2 & b3)
+            a[y + 2] = b2 ^ (~b3 & b4)
+            a[y + 3] = b3 ^ (~b4 & b0)
+            a[y + 4] = b4 ^ (~b0 & b1)
+        # iota
+        a[0] ^= rc
+    return a
+
+
+def _keccak256_python(data):
+    rate = 136
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(b"\x00" * (-len(padded) % rate))
+    padded[-1] |= 0x80
+
+    state = [0] * 25
+    for start in range(0, len(padded), rate):
+        block = padded[start:start + rate]
+        for i in range(rate // 8):
+            state[i] ^= int.from_bytes(block[i * 8:i * 8 + 8], "little")
+        state = _keccak_f(state)
+
+    return b"".join(lane.to_bytes(8, "little") for lane in state[:4])
+
+
+def _load_keccak256():
+    try:
+        from Crypto.Hash import keccak
+    except ImportError:
+        return _keccak256_python
+    return lambda data: keccak.new(digest_bits=256, data=data).digest()
+
+
+_keccak256 = None
+
+
+def keccak256(data):
+    """Keccak-256 digest; uses pycryptodome when installed, loaded on first use"""
+    global _keccak256
+    if _keccak256 is None:
+        _keccak256 = _load_keccak256()
+    return _keccak256(data)
+
+
+# Bitcoin
+
+def base58_decode(value):
+    """Decode a Base58 string, raising ValueError on invalid characters"""
+    number = 0
+    for char in value:
+        if char not in BASE58_INDEX:
+            raise ValueError(f"Invalid Base58 character: {char}")
+        number = number * 58 + BASE58_INDEX[char]
+
+    leading_zeros = len(value) - len(value.lstrip("1"))
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big") if number else b""
+    return b"\x00" * leading_zeros + body
+
+
+def base58check_decode(value):
+    """Return the payload of a Base58Check string, or None if the checksum fails"""
+    try:
+        raw = base58_decode(value)
+    except ValueError:
+        return None
+    if len(raw) < 5:
+        return None
+    payload, checksum = raw[:-4], raw[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        return None
+    return payload
+
+
+def _bech32_polymod(values):
+    generator = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            if (top >> i) & 1:
+                checksum ^= generator[i]
+    return checksum
+
+
+def _bech32_hrp_expand(hrp):
+    return [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+
+
+def _convert_bits(data, from_bits, to_bits):
+    accumulator = 0
+    bits = 0
+    result = []
+    max_value = (1 << to_bits) - 1
+    for value in data:
+        accumulator = (accumulator << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((accumulator >> bits) & max_value)
+    if bits >= from_bits or ((accumulator << (to_bits - bits)) & max_value):
+        return None
+    return result
+
+
+def decode_segwit(address):
+    """Return (hrp, witness_version, program, encoding) or None if invalid"""
+    if address.lower() != address and address.upper() != address:
+        return None
+    address = address.lower()
+    separator = address.rfind("1")
+    if separator < 1 or separator + 7 > len(address) or len(address) > 90:
+        return None
+
+    hrp = address[:separator]
+    try:
+        data = [BECH32_INDEX[c] for c in address[separator + 1:]]
+    except KeyError:
+        return None
+
+    constant = _bech32_polymod(_bech32_hrp_expand(hrp) + data)
+    if constant == BECH32_CONST:
+        encoding = "bech32"
+    elif constant == BECH32M_CONST:
+        encoding = "bech32m"
+    else:
+        return None
+
+    data = data[:-6]
+    if not data or data[0] > 16:
+        return None
+    version = data[0]
+    program = _convert_bits(data[1:], 5, 8)
+    if program is None or not 2 <= len(program) <= 40:
+        return None
+    if version == 0 and len(program) not in (20, 32):
+        return None
+    if (version == 0) != (encoding == "bech32"):
+        return None
+    return hrp, version, bytes(program), encoding
+
+
+def validate_bitcoin_address(address):
+    """Validate a Bitcoin address (P2PKH, P2SH, SegWit v0 and Taproot)"""
+    result = {
+        "value": address,
+        "type": "bitcoin_address",
+        "is_valid": False,
+        "format": None,
+        "network": None,
+        "details": {},
+    }
+
+    if not address.strip():
+        result["details"]["error"] = "Address is required"
+        return result
+
+    hrp = address[:address.rfind("1")].lower() if "1" in address else ""
+    if hrp in BECH32_NETWORKS:
+        decoded = decode_segwit(address)
+        result["network"] = BECH32_NETWORKS[hrp]
+        if decoded is None:
+            result["format"] = "Bech32 (SegWit)"
+            result["details"] = {"error": "Invalid Bech32 checksum or witness program"}
+            return result
+
+        _, version, program, encoding = decoded
+        result["is_valid"] = True
+        result["format"] = "Bech32 (SegWit)" if version == 0 else "Bech32m (Taproot)"
+        result["details"] = {
+            "version": "Native SegWit" if version == 0 else f"Witness v{version}",
+            "encoding": encoding.capitalize(),
+            "witness_program_bytes": len(program),
+            "length": f"{len(address)} characters",
+        }
+        return result
+
+    payload = base58check_decode(address)
+    if payload is not None and len(payload) == 21 and payload[0] in BASE58_VERSIONS:
+        result["format"], result["network"] = BASE58_VERSIONS[payload[0]]
+        result["is_valid"] = True
+        result["details"] = {
+            "encoding": "Base58Check",
+            "length": f"{len(address)} characters",
+            "checksum": "Valid",
+        }
+        return result
+
+    if address[:1] in "13mn2" and all(c in BASE58_INDEX for c in address):
+        result["details"] = {
+            "encoding": "Base58Check",
+            "length": f"{len(address)} characters",
+            "checksum": "Invalid",
+        }
+        return result
+
+    result["details"]["error"] = "Invalid Bitcoin address format"
+    return result
+
+
+def validate_bitcoin_transaction(txid):
+    """Check a transaction ID's format (existence requires the API)"""
+    result = {"value": txid, "type": "bitcoin_transaction", "is_valid": False, "details": {}}
+    if BTC_TX_RE.match(txid):
+        result["is_valid"] = True
+        result["details"] = {
+            "format": "Hexadecimal",
+            "length": "64 characters",
+            "byte_order": "Little-endian (display format)",
+        }
+    else:
+        result["details"]["error"] = "Invalid transaction ID format (must be 64 hex characters)"
+    return result
+
+
+# Ethereum
+
+def to_checksum_address(address):
+    """Return the EIP-55 mixed-case form of a 0x-prefixed hex address"""
+    lower = address[2:].lower()
+    digest = keccak256(lower.encode()).hex()
+    return "0x" + "".join(
+        char.upper() if char.isalpha() and int(digest[i], 16) >= 8 else char
+        for i, char in enumerate(lower)
+    )
+
+
+def validate_ethereum_address(address):
+    """Validate an Ethereum address and its EIP-55 checksum"""
+    result = {
+        "value": address,
+        "type": "ethereum_address",
+        "is_valid": False,
+        "checksum_valid": False,
+        "details": {},
+    }
+
+    if not address.strip():
+        result["details"]["error"] = "Address is required"
+        return result
+
+    if not ETH_ADDRESS_RE.match(address):
+        result["details"]["error"] = ("Invalid Ethereum address format "
+                                      "(must be 0x followed by 40 hex characters)")
+        return result
+
+    result["is_valid"] = True
+    result["details"]["format"] = "Hexadecimal"
+    result["details"]["length"] = "42 characters (including 0x prefix)"
+
+    checksum_address = to_checksum_address(address)
+    result["checksum_valid"] = address == checksum_address
+    result["details"]["checksum_address"] = checksum_address
+
+    if not result["checksum_valid"]:
+        body = address[2:]
+        if body == body.lower() or body == body.upper():
+            result["details"]["warning"] = "Address is valid but checksum is incorrect or missing"
+        else:
+            result["details"]["error"] = "Invalid checksum"
+            result["is_valid"] = False
+
+    return result
+
+
+def validate_ethereum_transaction(txhash):
+    """Check a transaction hash's format (existence requires the API)"""
+    result = {"value": txhash, "type": "ethereum_transaction", "is_valid": False, "details": {}}
+    if ETH_TX_RE.match(txhash):
+        result["is_valid"] = True
+        result["details"] = {
+            "format": "Hexadecimal",
+            "length": "66 characters (including 0x prefix)",
+            "bytes": "32 bytes",
+        }
+    else:
+        result["details"]["error"] = ("Invalid transaction hash format "
+                                      "(must be 0x followed by 64 hex characters)")
+    return result
+
+
+VALIDATORS = {
+    "bitcoin": validate_bitcoin_address,
+    "ethereum": validate_ethereum_address,
+}
+
+
+def _validate_batch(currency, addresses):
+    validate = VALIDATORS[currency]
+    return [validate(address) for address in addresses]
+
+
+def _batches(values, size):
+    batch = []
+    for value in values:
+        batch.append(value)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validate_many(currency, addresses, workers=None, batch_size=BATCH_SIZE):
+    """Yield validation results for an iterable of addresses, in input order
+
+    Addresses are grouped into batches so each process-pool task amortizes
+    its IPC cost over thousands of validations.
+    """
+    if workers == 1:
+        for batch in _batches(addresses, batch_size):
+            yield from _validate_batch(currency, batch)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for batch in _batches(addresses, batch_size):
+            pending.append(executor.submit(_validate_batch, currency, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
@@ -0,0 +1,138 @@
+"""
+Local hash engine
+
+All requested algorithms are computed in a single pass over the data:
+each block is read once and fed to every digest. Files are read through
+a memory map, and many files can be hashed in parallel on a process pool.
+Algorithms hashlib cannot provide (e.g. bcrypt) are left for the API.
+"""
+
+import hashlib
+import mmap
+import os
+import stat
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+BLOCK_BYTES = 1024 * 1024
+
+# API (PHP hash_algos) names that differ from hashlib names
+ALGORITHM_ALIASES = {
+    "sha3-224": "sha3_224",
+    "sha3-256": "sha3_256",
+    "sha3-384": "sha3_384",
+    "sha3-512": "sha3_512",
+    "sha512/224": "sha512_224",
+    "sha512/256": "sha512_256",
+}
+
+# Variable-length digests have no fixed hexdigest()
+UNSUPPORTED = {"shake_128", "shake_256"}
+
+
+class _Crc32:
+    """hashlib-style wrapper around zlib.crc32 (PHP's crc32b)"""
+
+    def __init__(self):
+        self.value = 0
+
+    def update(self, data):
+        self.value = zlib.crc32(data, self.value)
+
+    def hexdigest(self):
+        return f"{self.value & 0xffffffff:08x}"
+
+
+def _new_digest(algorithm):
+    name = ALGORITHM_ALIASES.get(algorithm, algorithm)
+    if name == "crc32b":
+        return _Crc32()
+    if name in UNSUPPORTED or name not in hashlib.algorithms_available:
+        return None
+    return hashlib.new(name)
+
+
+def split_algorithms(algorithms):
+    """Return (local, remote) lists of lowercase algorithm names"""
+    local, remote = [], []
+    for algorithm in algorithms:
+        algorithm = algorithm.lower()
+        (local if _new_digest(algorithm) is not None else remote).append(algorithm)
+    return local, remote
+
+
+def _digests(algorithms):
+    return {algorithm: _new_digest(algorithm) for algorithm in algorithms}
+
+
+def _finish(digests):
+    return {algorithm: digest.hexdigest() for algorithm, digest in digests.items()}
+
+
+def hash_bytes(data, algorithms):
+    """Hash a bytes-like object with every local algorithm"""
+    digests = _digests(algorithms)
+    view = memoryview(data)
+    for start in range(0, len(view), BLOCK_BYTES):
+        block = view[start:start + BLOCK_BYTES]
+        for digest in digests.values():
+            digest.update(block)
+    return _finish(digests)
+
+
+def hash_stream(stream, algorithms):
+    """Hash a binary stream block by block"""
+    digests = _digests(algorithms)
+    while True:
+        block = stream.read(BLOCK_BYTES)
+        if not block:
+            break
+        for digest in digests.values():
+            digest.update(block)
+    return _finish(digests)
+
+
+def hash_fd(fd, algorithms):
+    """Hash an open file descriptor, memory-mapping it when it is a regular file"""
+    info = os.fstat(fd)
+    if not stat.S_ISREG(info.st_mode):
+        with os.fdopen(os.dup(fd), "rb") as stream:
+            return hash_stream(stream, algorithms)
+
+    if info.st_size == 0:
+        return hash_bytes(b"", algorithms)
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+        return hash_bytes(mapped, algorithms)
+
+
+def hash_file(path, algorithms):
+    """Hash a file with every local algorithm in one read"""
+    with open(path, "rb") as f:
+        return hash_fd(f.fileno(), algorithms)
+
+
+def hash_stdin(algorithms):
+    """Hash standard input (memory-mapped when redirected from a file)"""
+    return hash_fd(sys.stdin.buffer.fileno(), algorithms)
+
+
+def _hash_file_record(path, algorithms):
+    try:
+        return {"file": path, "hashes": hash_file(path, algorithms)}
+    except OSError as e:
+        return {"file": path, "error": str(e)}
+
+
+def hash_files(paths, algorithms, workers=None):
+    """Yield {"file", "hashes"|"error"} records in input order, using a process pool"""
+    paths = list(paths)
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            yield _hash_file_record(path, algorithms)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+        yield from executor.map(_hash_file_record, paths, [algorithms] * len(paths),
+                                chunksize=chunksize)
@@ -0,0 +1,308 @@
+"""
+Local IPv4 subnet calculator
+
+calculate() returns the same fields as /tools/ip-calculate. For bulk
+input, calculate_many() parses addresses into a uint32 array and derives
+every field with whole-array integer operations when NumPy is installed
+(``pip install 'veribits[bulk]'``), falling back to a per-row loop
+otherwise. aggregate() merges overlapping and adjacent prefixes.
+"""
+
+import ipaddress
+import socket
+import struct
+from functools import lru_cache
+
+from ..errors import VeriBitsError
+
+DEFAULT_PREFIX = 24
+
+FIELDS = [
+    "ip_address", "cidr", "network_address", "broadcast_address", "subnet_mask",
+    "wildcard_mask", "first_usable", "last_usable", "total_hosts", "usable_hosts",
+    "ip_class", "ip_type",
+]
+
+
+class IPCalcError(VeriBitsError):
+    """Invalid address or subnet specification"""
+
+
+def _parse_ipv4(value):
+    try:
+        return int.from_bytes(socket.inet_aton(value), "big") if value.count(".") == 3 else None
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=256)
+def parse_prefix(subnet):
+    """Return the prefix length for '/24', '24' or a dotted mask like '255.255.255.0'"""
+    subnet = subnet.strip().lstrip("/")
+    if subnet.isdigit():
+        prefix = int(subnet)
+    else:
+        mask = _parse_ipv4(subnet)
+        if mask is None:
+            raise IPCalcError("Invalid subnet mask")
+        prefix = bin(mask).count("1")
+        if mask != (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF:
+            raise IPCalcError("Invalid subnet mask")
+    if not 0 <= prefix <= 32:
+        raise IPCalcError("Invalid CIDR notation")
+    return prefix
+
+
+def split_input(ip, subnet=None):
+    """Split 'a.b.c.d/nn' or an address plus optional mask into (address, prefix)"""
+    if "/" in ip:
+        address, _, cidr = ip.partition("/")
+        return address.strip(), parse_prefix(cidr)
+    return ip.strip(), parse_prefix(subnet) if subnet else DEFAULT_PREFIX
+
+
+def ip_class(first_octet):
+    if 1 <= first_octet <= 126:
+        return "A"
+    if 128 <= first_octet <= 191:
+        return "B"
+    if 192 <= first_octet <= 223:
+        return "C"
+    if 224 <= first_octet <= 239:
+        return "D (Multicast)"
+    if 240 <= first_octet <= 255:
+        return "E (Reserved)"
+    return "Unknown"
+
+
+def ip_type(first_octet, second_octet):
+    if first_octet == 10 or (first_octet == 172 and 16 <= second_octet <= 31) \
+            or (first_octet == 192 and second_octet == 168):
+        return "Private"
+    if first_octet == 127:
+        return "Loopback"
+    if first_octet == 169 and second_octet == 254:
+        return "APIPA"
+    return "Public"
+
+
+def _dotted(value):
+    return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+
+def calculate(ip, subnet=None):
+    """Calculate subnet information for an IPv4 address"""
+    address, prefix = split_input(ip, subnet)
+    value = _parse_ipv4(address)
+    if value is None:
+        raise IPCalcError("Invalid IPv4 address")
+
+    mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+    network = value & mask
+    broadcast = network | (~mask & 0xFFFFFFFF)
+    total = 1 << (32 - prefix)
+
+    # RFC 3021: /31 links use both addresses, /32 is a single host
+    if prefix >= 31:
+        first, last, usable = network, broadcast, total
+    else:
+        first, last, usable = network + 1, broadcast - 1, total - 2
+
+    return {
+        "ip_address": address,
+        "cidr": f"{address}/{prefix}",
+        "network_address": _dotted(network),
+        "broadcast_address": _dotted(broadcast),
+        "subnet_mask": _dotted(mask),
+        "wildcard_mask": _dotted(~mask & 0xFFFFFFFF),
+        "first_usable": _dotted(first),
+        "last_usable": _dotted(last),
+        "total_hosts": total,
+        "usable_hosts": usable,
+        "ip_class": ip_class(value >> 24),
+        "ip_type": ip_type(value >> 24, (value >> 16) & 0xFF),
+    }
+
+
+def _calculate_rows(rows):
+    for ip, subnet in rows:
+        try:
+            yield calculate(ip, subnet)
+        except IPCalcError as e:
+            yield {"ip_address": ip, "error": str(e)}
+
+
+def _dotted_column(array):
+    raw = array.astype(">u4").tobytes()
+    return [socket.inet_ntoa(packed) for (packed,) in struct.iter_unpack("4s", raw)]
+
+
+# Masks depend only on the prefix length, so format each one once
+_MASKS = [_dotted((0xFFFFFFFF << (32 - p)) & 0xFFFFFFFF) for p in range(33)]
+_WILDCARDS = [_dotted(~(0xFFFFFFFF << (32 - p)) & 0xFFFFFFFF) for p in range(33)]
+
+
+def _numpy():
+    """Import NumPy on first bulk use; None when it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _calculate_columns(rows):
+    """Compute every field for all rows with NumPy array operations
+
+    Returns one list per FIELDS entry plus {row_index: error_record} for
+    rows that could not be parsed (their column values are placeholders).
+    """
+    addresses, prefixes, packed, errors = [], [], [], {}
+    inet_aton = socket.inet_aton
+    for index, (ip, subnet) in enumerate(rows):
+        try:
+            address, prefix = split_input(ip, subnet)
+            if address.count(".") != 3:
+                raise IPCalcError("Invalid IPv4 address")
+            try:
+                raw = inet_aton(address)
+            except OSError:
+                raise IPCalcError("Invalid IPv4 address")
+        except IPCalcError as e:
+            # Keep a placeholder so array positions still line up with rows
+            errors[index] = {"ip_address": ip, "error": str(e)}
+            address, prefix, raw = ip, 32, b"\0\0\0\0"
+        addresses.append(address)
+        prefixes.append(prefix)
+        packed.append(raw)
+
+    if not addresses:
+        return [[] for _ in FIELDS], errors
+
+    np = _numpy()
+    values = np.frombuffer(b"".join(packed), dtype=">u4").astype(np.uint64)
+    prefix = np.array(prefixes, dtype=np.uint64)
+    full = np.uint64(0xFFFFFFFF)
+
+    mask = (full << (np.uint64(32) - prefix)) & full
+    network = values & mask
+    broadcast = network | (~mask & full)
+    total = np.uint64(1) << (np.uint64(32) - prefix)
+
+    point_to_point = prefix >= 31
+    first = np.where(point_to_point, network, network + np.uint64(1))
+    last = np.where(point_to_point, broadcast, broadcast - np.uint64(1))
+    usable = np.where(point_to_point, total, total - np.uint64(2))
+
+    octet1 = (values >> np.uint64(24)).astype(np.int64)
+    octet2 = ((values >> np.uint64(16)) & np.uint64(0xFF)).astype(np.int64)
+    classes = np.select(
+        [(octet1 >= 1) & (octet1 <= 126), (octet1 >= 128) & (octet1 <= 191),
+         (octet1 >= 192) & (octet1 <= 223), (octet1 >= 224) & (octet1 <= 239), octet1 >= 240],
+        ["A", "B", "C", "D (Multicast)", "E (Reserved)"], "Unknown",
+    )
+    types = np.select(
+        [(octet1 == 10) | ((octet1 == 172) & (octet2 >= 16) & (octet2 <= 31))
+         | ((octet1 == 192) & (octet2 == 168)),
+         octet1 == 127, (octet1 == 169) & (octet2 == 254)],
+        ["Private", "Loopback", "APIPA"], "Public",
+    )
+
+    columns = [
+        addresses,
+        [f"{a}/{p}" for a, p in zip(addresses, prefixes)],
+        _dotted_column(network),
+        _dotted_column(broadcast),
+        [_MASKS[p] for p in prefixes],
+        [_WILDCARDS[p] for p in prefixes],
+        _dotted_column(first),
+        _dotted_column(last),
+        total.tolist(),
+        usable.tolist(),
+        classes.tolist(),
+        types.tolist(),
+    ]
+    return columns, errors
+
+
+def _use_numpy(vectorized):
+    if vectorized is None:
+        return _numpy() is not None
+    if vectorized and _numpy() is None:
+        raise IPCalcError("Vectorized mode requires NumPy: pip install 'veribits[bulk]'")
+    return vectorized
+
+
+def calculate_many(rows, vectorized=None):
+    """Calculate results for (ip, subnet_or_None) rows, in order
+
+    Invalid rows produce {"ip_address", "error"} records.
+    """
+    if not _use_numpy(vectorized):
+        return list(_calculate_rows(rows))
+
+    columns, errors = _calculate_columns(list(rows))
+    results = [dict(zip(FIELDS, row)) for row in zip(*columns)]
+    for index, error in errors.items():
+        results[index] = error
+    return results
+
+
+def calculate_table(rows, vectorized=None):
+    """Return (FIELDS + ["error"], row tuples) for writing CSV without per-row dicts"""
+    header = FIELDS + ["error"]
+    if not _use_numpy(vectorized):
+        return header, [tuple(r.get(f, "") for f in header) for r in _calculate_rows(rows)]
+
+    columns, errors = _calculate_columns(list(rows))
+    table = list(zip(*columns, [""] * len(columns[0])))
+    blank = ("",) * (len(header) - 2)
+    for index, error in errors.items():
+        table[index] = (error["ip_address"],) + blank + (error["error"],)
+    return header, table
+
+
+def aggregate(prefixes):
+    """Collapse overlapping and adjacent prefixes into the minimal CIDR list
+
+    Bare addresses count as /32 (or /128).
+    IPv4 ranges are merged with sorted-interval array operations when NumPy
+    is available; IPv6 uses ipaddress.collapse_addresses.
+    """
+    starts, ends, lengths, v6 = [], [], [], []
+    for prefix in prefixes:
+        if ":" in prefix:
+            v6.append(ipaddress.ip_network(prefix.strip(), strict=False))
+            continue
+        address, _, length = prefix.partition("/")
+        value = _parse_ipv4(address.strip())
+        if value is None:
+            raise IPCalcError(f"Invalid IPv4 address: {prefix.strip()}")
+        length = parse_prefix(length) if length else 32
+        mask = (0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF
+        starts.append(value & mask)
+        ends.append((value & mask) | (~mask & 0xFFFFFFFF))
+        lengths.append(length)
+
+    np = _numpy()
+    if not starts:
+        collapsed = []
+    elif np is None:
+        collapsed = ipaddress.collapse_addresses(
+            ipaddress.IPv4Network((start, length)) for start, length in zip(starts, lengths))
+    else:
+        starts = np.array(starts, dtype=np.int64)
+        ends = np.array(ends, dtype=np.int64)
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+        reach = np.maximum.accumulate(ends)
+        breaks = np.flatnonzero(starts[1:] > reach[:-1] + 1) + 1
+        group_starts = starts[np.concatenate(([0], breaks))]
+        group_ends = reach[np.concatenate((breaks - 1, [len(starts) - 1]))]
+
+        collapsed = []
+        for start, end in zip(group_starts.tolist(), group_ends.tolist()):
+            collapsed.extend(ipaddress.summarize_address_range(
+                ipaddress.IPv4Address(start), ipaddress.IPv4Address(end)))
+
+    return [str(n) for n in collapsed] + [str(n) for n in ipaddress.collapse_addresses(v6)]
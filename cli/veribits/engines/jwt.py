@@ -0,0 +1,322 @@
+"""
+Local JWT decode, verify and sign engine
+
+Produces the same fields as /jwt/decode and /jwt/sign without sending
+tokens or secrets anywhere. HS* signatures use hmac; RS*, PS* and ES*
+signatures need the optional ``cryptography`` package. Parsed keys are
+cached, so auditing a stream of tokens parses the key once per process.
+
+The key must suit the token's algorithm family before any signature is
+checked: PEM material is never used as an HMAC secret, which would let a
+token signed with a public key as its HS256 secret verify (algorithm
+confusion). Callers can also pin the accepted algorithms instead of
+trusting the header's "alg".
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from ..errors import VeriBitsError
+
+TOKEN_RE = re.compile(r"eyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]*")
+
+HASHES = {"256": hashlib.sha256, "384": hashlib.sha384, "512": hashlib.sha512}
+
+# Curve each ES* algorithm is defined on (RFC 7518, section 3.4)
+ES_CURVES = {"256": "secp256r1", "384": "secp384r1", "512": "secp521r1"}
+
+BATCH_SIZE = 1000
+
+
+class JWTError(VeriBitsError):
+    """The token is not a well-formed JWT"""
+
+
+def b64url_decode(value):
+    try:
+        return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise JWTError(f"Invalid base64url encoding: {e}")
+
+
+def b64url_encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _claims(payload, now):
+    """Standard claim summary matching the decode endpoint"""
+    claims = {}
+    if "iss" in payload:
+        claims["issuer"] = payload["iss"]
+    if "sub" in payload:
+        claims["subject"] = payload["sub"]
+    if "aud" in payload:
+        claims["audience"] = payload["aud"]
+    if isinstance(payload.get("exp"), (int, float)):
+        claims["expiration"] = _timestamp(payload["exp"])
+        claims["expired"] = now > payload["exp"]
+    if isinstance(payload.get("nbf"), (int, float)):
+        claims["not_before"] = _timestamp(payload["nbf"])
+        claims["not_yet_valid"] = now < payload["nbf"]
+    if isinstance(payload.get("iat"), (int, float)):
+        claims["issued_at"] = _timestamp(payload["iat"])
+    if "jti" in payload:
+        claims["jwt_id"] = payload["jti"]
+    return claims
+
+
+@lru_cache(maxsize=64)
+def load_key(key, algorithm_family):
+    """Parse key material once per (key, algorithm family)
+
+    HS keys are the secret bytes; RS/PS/ES keys are PEM public keys,
+    certificates or private keys (the public half is used). PEM material
+    is refused as an HS secret.
+    """
+    if algorithm_family == "HS":
+        if b"-----BEGIN" in key:
+            raise JWTError("HS* tokens cannot be verified with a PEM key; "
+                           "the token's algorithm does not match the key (algorithm confusion)")
+        return key
+
+    try:
+        from cryptography import x509
+        from cryptography.hazmat.primitives import serialization
+    except ImportError:
+        raise JWTError(f"{algorithm_family}* verification requires the 'cryptography' package: "
+                       "pip install 'veribits[crypto]'")
+
+    if b"-----BEGIN CERTIFICATE-----" in key:
+        return x509.load_pem_x509_certificate(key).public_key()
+    if b"PRIVATE KEY-----" in key:
+        return serialization.load_pem_private_key(key, password=None).public_key()
+    return serialization.load_pem_public_key(key)
+
+
+def verify_signature(signing_input, signature, algorithm, key):
+    """Return True if signature is valid for signing_input under algorithm and key"""
+    family, bits = algorithm[:2], algorithm[2:]
+    if family not in ("HS", "RS", "PS", "ES") or bits not in HASHES:
+        raise JWTError(f"Unsupported algorithm: {algorithm}")
+
+    parsed = load_key(key, family)
+
+    if family == "HS":
+        expected = hmac.new(parsed, signing_input, HASHES[bits]).digest()
+        return hmac.compare_digest(expected, signature)
+
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa, utils
+
+    expected_type = ec.EllipticCurvePublicKey if family == "ES" else rsa.RSAPublicKey
+    if not isinstance(parsed, expected_type):
+        raise JWTError(f"Key type does not match algorithm {algorithm}")
+    if family == "ES" and parsed.curve.name != ES_CURVES[bits]:
+        raise JWTError(f"{algorithm} requires a {ES_CURVES[bits]} key, not {parsed.curve.name}")
+
+    digest = {"256": hashes.SHA256, "384": hashes.SHA384, "512": hashes.SHA512}[bits]()
+    try:
+        if family == "RS":
+            parsed.verify(signature, signing_input, padding.PKCS1v15(), digest)
+        elif family == "PS":
+            pss = padding.PSS(mgf=padding.MGF1(digest), salt_length=digest.digest_size)
+            parsed.verify(signature, signing_input, pss, digest)
+        else:
+            half = len(signature) // 2
+            der = utils.encode_dss_signature(int.from_bytes(signature[:half], "big"),
+                                             int.from_bytes(signature[half:], "big"))
+            parsed.verify(der, signing_input, ec.ECDSA(digest))
+    except InvalidSignature:
+        return False
+    return True
+
+
+def decode(token, key=None, verify=False, now=None, algorithms=None):
+    """Decode a JWT and return the /jwt/decode ``data`` fields
+
+    ``key`` is an HMAC secret or PEM key (str or bytes). With
+    ``algorithms``, a token whose header names any other algorithm fails
+    verification. Raises JWTError for malformed tokens.
+    """
+    parts = token.strip().split(".")
+    if len(parts) != 3:
+        raise JWTError("Invalid JWT format - must have 3 parts (header.payload.signature)")
+
+    header_b64, payload_b64, signature_b64 = parts
+    try:
+        header = json.loads(b64url_decode(header_b64))
+    except ValueError:
+        raise JWTError("Invalid header encoding")
+    try:
+        payload = json.loads(b64url_decode(payload_b64))
+    except ValueError:
+        raise JWTError("Invalid payload encoding")
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        raise JWTError("Header and payload must be JSON objects")
+
+    result = {
+        "is_valid": True,
+        "header": header,
+        "payload": payload,
+        "signature": signature_b64,
+        "algorithm": header.get("alg", "unknown"),
+        "type": header.get("typ", "JWT"),
+        "claims": _claims(payload, time.time() if now is None else now),
+    }
+
+    if verify:
+        if not key:
+            result["signature_verified"] = False
+            result["signature_error"] = "Secret key required for signature verification"
+        elif algorithms and result["algorithm"] not in algorithms:
+            result["signature_verified"] = False
+            result["signature_error"] = (f"Algorithm {result['algorithm']} is not allowed "
+                                         f"(expected {', '.join(algorithms)})")
+        else:
+            if isinstance(key, str):
+                key = key.encode()
+            try:
+                result["signature_verified"] = verify_signature(
+                    f"{header_b64}.{payload_b64}".encode(), b64url_decode(signature_b64),
+                    str(result["algorithm"]), key,
+                )
+            except (JWTError, ValueError, TypeError, AttributeError) as e:
+                result["signature_verified"] = False
+                result["signature_error"] = str(e)
+
+    return result
+
+
+def _check_time_claims(payload):
+    """Raise JWTError unless exp, nbf and iat, where present, are usable timestamps"""
+    for name in ("exp", "nbf", "iat"):
+        if name not in payload:
+            continue
+        value = payload[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise JWTError(f"Claim '{name}' must be a number of seconds since the epoch, got {value!r}")
+        try:
+            _timestamp(value)
+        except (OverflowError, OSError, ValueError):
+            raise JWTError(f"Claim '{name}' is out of range: {value!r}")
+
+
+def sign(secret, payload, expires=3600, algorithm="HS256", now=None):
+    """Create an HS* token and return the /jwt/sign ``data`` fields
+
+    Raises JWTError when ``payload`` is not a JSON object or its exp, nbf
+    or iat claim is not a timestamp.
+    """
+    bits = algorithm[2:]
+    if algorithm[:2] != "HS" or bits not in HASHES:
+        raise JWTError(f"Unsupported signing algorithm: {algorithm}")
+    if not isinstance(payload, dict):
+        raise JWTError("Payload must be a JSON object")
+    _check_time_claims(payload)
+
+    now = int(time.time() if now is None else now)
+    payload = dict(payload)
+    payload.setdefault("iat", now)
+    if "exp" not in payload and expires > 0:
+        payload["exp"] = now + expires
+
+    header = {"typ": "JWT", "alg": algorithm}
+    signing_input = ".".join(
+        b64url_encode(json.dumps(part, separators=(",", ":")).encode()) for part in (header, payload)
+    )
+    signature = hmac.new(secret.encode(), signing_input.encode(), HASHES[bits]).digest()
+
+    return {
+        "token": f"{signing_input}.{b64url_encode(signature)}",
+        "header": header,
+        "payload": payload,
+        "algorithm": algorithm,
+        "expires_in": expires,
+        "expires_at": _timestamp(payload["exp"]) if "exp" in payload else None,
+    }
+
+
+# Stream auditing
+
+_audit_key = None
+_audit_verify = False
+_audit_algorithms = None
+
+
+def _init_audit(key, verify, algorithms=None):
+    global _audit_key, _audit_verify, _audit_algorithms
+    _audit_key = key
+    _audit_verify = verify
+    _audit_algorithms = algorithms
+
+
+def audit_line(line_number, line, key=None, verify=False, now=None, algorithms=None):
+    """Return one audit record per JWT found in a line of text"""
+    records = []
+    for token in TOKEN_RE.findall(line):
+        record = {"line": line_number}
+        try:
+            decoded = decode(token, key, verify, now, algorithms)
+            del decoded["signature"]
+            record.update(decoded)
+        except JWTError as e:
+            record.update({"is_valid": False, "error": str(e)})
+        records.append(record)
+    return records
+
+
+def _audit_batch(batch):
+    now = time.time()
+    records = []
+    for line_number, line in batch:
+        records.extend(audit_line(line_number, line, _audit_key, _audit_verify, now, _audit_algorithms))
+    return records
+
+
+def _numbered_batches(lines, size):
+    batch = []
+    for line_number, line in enumerate(lines, 1):
+        batch.append((line_number, line))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def audit_stream(lines, key=None, verify=False, workers=None, batch_size=BATCH_SIZE, algorithms=None):
+    """Yield audit records for every JWT in an iterable of lines, in input order"""
+    if isinstance(key, str):
+        key = key.encode()
+    algorithms = tuple(algorithms) if algorithms else None
+
+    if workers == 1:
+        _init_audit(key, verify, algorithms)
+        for batch in _numbered_batches(lines, batch_size):
+            yield from _audit_batch(batch)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_audit,
+                             initargs=(key, verify, algorithms)) as executor:
+        pending = []
+        for batch in _numbered_batches(lines, batch_size):
+            pending.append(executor.submit(_audit_batch, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
@@ -0,0 +1,250 @@
+"""
+Local PKCS12 and JKS keystore writers
+
+Builds keystores from a PEM certificate (chain) and private key entirely
+in memory: PKCS12 through the optional ``cryptography`` package, JKS with
+a writer for Java's keystore format, including Sun's key protection
+algorithm, so neither openssl, keytool nor temporary files are needed.
+Directories of cert/key pairs are converted on a process pool.
+"""
+
+import hashlib
+import os
+import re
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ..errors import VeriBitsError
+
+FORMATS = {"pkcs12": "p12", "jks": "jks"}
+
+# Password keytool assumes when none is given
+DEFAULT_JKS_PASSWORD = "changeit"
+
+JKS_MAGIC = 0xFEEDFEED
+JKS_VERSION = 2
+JKS_PRIVATE_KEY_ENTRY = 1
+# Sun's proprietary JKS key protector, 1.3.6.1.4.1.42.2.17.1.1
+_KEY_PROTECTOR_OID = bytes.fromhex("060a2b060104012a02110101")
+_DER_NULL = b"\x05\x00"
+
+# PEM files ending in these names hold a certificate or key for the part before them
+_NAME_SUFFIX = re.compile(r"([._-]?(cert|crt|certificate|fullchain|chain|key|priv|privkey|private))+$")
+_PEM_EXTENSIONS = (".pem", ".crt", ".cer", ".cert", ".key")
+
+
+class KeystoreError(VeriBitsError):
+    """A certificate or key could not be loaded or converted"""
+
+
+def _cryptography():
+    try:
+        from cryptography import x509
+        from cryptography.hazmat.primitives import serialization
+    except ImportError:
+        raise KeystoreError("Keystore conversion requires the 'cryptography' package: "
+                            "pip install 'veribits[crypto]'")
+    return x509, serialization
+
+
+def load_pair(cert_pem, key_pem, key_password=None):
+    """(private key, [certificates]) from PEM bytes, the matching certificate first"""
+    x509, serialization = _cryptography()
+    try:
+        certs = x509.load_pem_x509_certificates(cert_pem)
+    except ValueError as e:
+        raise KeystoreError(f"Invalid certificate: {e}")
+    try:
+        key = serialization.load_pem_private_key(
+            key_pem, password=key_password.encode() if key_password else None)
+    except (ValueError, TypeError) as e:
+        raise KeystoreError(f"Invalid private key: {e}")
+
+    public = key.public_key().public_bytes(serialization.Encoding.DER,
+                                           serialization.PublicFormat.SubjectPublicKeyInfo)
+    for index, cert in enumerate(certs):
+        if cert.public_key().public_bytes(serialization.Encoding.DER,
+                                          serialization.PublicFormat.SubjectPublicKeyInfo) == public:
+            return key, [cert] + certs[:index] + certs[index + 1:]
+    raise KeystoreError("No certificate matches the private key")
+
+
+def pkcs12(key, certs, alias, password, legacy=False):
+    """PKCS12 bytes; ``legacy`` uses SHA1/3DES for older Java and Windows"""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.serialization import BestAvailableEncryption, NoEncryption, PrivateFormat
+    from cryptography.hazmat.primitives.serialization import pkcs12 as p12
+
+    if not password:
+        encryption = NoEncryption()
+    elif legacy:
+        encryption = (PrivateFormat.PKCS12.encryption_builder()
+                      .key_cert_algorithm(p12.PBES.PBESv1SHA1And3KeyTripleDESCBC)
+                      .hmac_hash(hashes.SHA1()).build(password.encode()))
+    else:
+        encryption = BestAvailableEncryption(password.encode())
+    return p12.serialize_key_and_certificates(alias.encode(), key, certs[0], certs[1:] or None, encryption)
+
+
+def _der(tag, content):
+    length = len(content)
+    if length < 0x80:
+        return bytes((tag, length)) + content
+    encoded = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((tag, 0x80 | len(encoded))) + encoded + content
+
+
+def _java_utf(text):
+    data = text.encode("utf-8")
+    return struct.pack(">H", len(data)) + data
+
+
+def protect_key(pkcs8, password, salt=None):
+    """EncryptedPrivateKeyInfo DER for a PKCS8 key under Sun's JKS key protector
+
+    The key is XORed with a SHA-1 keystream seeded by a random salt and
+    followed by a SHA-1 integrity check, both keyed with the password's
+    UTF-16BE bytes, as sun.security.provider.KeyProtector does.
+    """
+    secret = password.encode("utf-16-be")
+    salt = salt or os.urandom(20)
+    stream = bytearray()
+    digest = salt
+    while len(stream) < len(pkcs8):
+        digest = hashlib.sha1(secret + digest).digest()
+        stream += digest
+    size = len(pkcs8)
+    encrypted = (int.from_bytes(pkcs8, "big") ^ int.from_bytes(stream[:size], "big")).to_bytes(size, "big")
+    check = hashlib.sha1(secret + pkcs8).digest()
+    algorithm = _der(0x30, _KEY_PROTECTOR_OID + _DER_NULL)
+    return _der(0x30, algorithm + _der(0x04, salt + encrypted + check))
+
+
+def jks(key, certs, alias, password, timestamp_ms=None):
+    """JKS bytes holding one private key entry with its certificate chain"""
+    from cryptography.hazmat.primitives import serialization
+
+    password = password or DEFAULT_JKS_PASSWORD
+    pkcs8 = key.private_bytes(serialization.Encoding.DER, serialization.PrivateFormat.PKCS8,
+                              serialization.NoEncryption())
+    protected = protect_key(pkcs8, password)
+    if timestamp_ms is None:
+        timestamp_ms = int(time.time() * 1000)
+
+    # keytool stores aliases in lower case
+    out = bytearray(struct.pack(">III", JKS_MAGIC, JKS_VERSION, 1))
+    out += struct.pack(">I", JKS_PRIVATE_KEY_ENTRY) + _java_utf(alias.lower()) + struct.pack(">Q", timestamp_ms)
+    out += struct.pack(">I", len(protected)) + protected
+    out += struct.pack(">I", len(certs))
+    for cert in certs:
+        der = cert.public_bytes(serialization.Encoding.DER)
+        out += _java_utf("X.509") + struct.pack(">I", len(der)) + der
+    # Keyed integrity digest over the whole store
+    out += hashlib.sha1(password.encode("utf-16-be") + b"Mighty Aphrodite" + out).digest()
+    return bytes(out)
+
+
+def convert(cert_pem, key_pem, fmt, alias, password="", key_password=None, legacy=False):
+    """Keystore bytes in ``fmt`` ("pkcs12" or "jks") for a PEM certificate and key"""
+    key, certs = load_pair(cert_pem, key_pem, key_password)
+    if fmt == "jks":
+        return jks(key, certs, alias, password)
+    return pkcs12(key, certs, alias, password, legacy)
+
+
+def write_private(path, data):
+    """Write a keystore readable by its owner only"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+
+def _pem_kind(path):
+    """("key", 1), ("cert", number of certificates) or (None, 0) from a PEM file's armour lines"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(64 * 1024)
+    except OSError:
+        return None, 0
+    if b"PRIVATE KEY-----" in head:
+        return "key", 1
+    count = head.count(b"-----BEGIN CERTIFICATE-----")
+    return ("cert", count) if count else (None, 0)
+
+
+def _pair_name(filename):
+    stem = filename
+    while stem.lower().endswith(_PEM_EXTENSIONS):
+        stem = stem[:stem.rfind(".")]
+    return _NAME_SUFFIX.sub("", stem)
+
+
+def find_pairs(root):
+    """[(name, cert path, key path)] for the cert/key pairs under ``root``
+
+    Files pair up by name once PEM extensions and markers such as -cert,
+    .key or privkey are removed (example.com.crt with example.com.key,
+    site-cert.pem with site-key.pem). Names that reduce to nothing, as in
+    Let's Encrypt's fullchain.pem and privkey.pem, take the directory's
+    name. Where several certificate files share a name, the one with the
+    longest chain is used.
+    """
+    pairs = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        certs, keys = {}, {}
+        for filename in sorted(files):
+            if not filename.lower().endswith(_PEM_EXTENSIONS):
+                continue
+            path = os.path.join(directory, filename)
+            kind, count = _pem_kind(path)
+            name = _pair_name(filename) or os.path.basename(os.path.abspath(directory))
+            if kind == "key":
+                keys.setdefault(name, path)
+            elif kind == "cert" and count > certs.get(name, ("", 0))[1]:
+                certs[name] = (path, count)
+        for name in sorted(certs.keys() & keys.keys()):
+            pairs.append((name, certs[name][0], keys[name]))
+    return pairs
+
+
+def convert_pair(name, cert_path, key_path, output_path, fmt, alias, password, key_password=None,
+                 legacy=False):
+    """Convert one pair to ``output_path``; returns a record with "error" on failure"""
+    record = {"name": name, "cert": cert_path, "key": key_path, "output": output_path}
+    try:
+        with open(cert_path, "rb") as f:
+            cert_pem = f.read()
+        with open(key_path, "rb") as f:
+            key_pem = f.read()
+        write_private(output_path, convert(cert_pem, key_pem, fmt, alias or name, password, key_password,
+                                           legacy))
+    except KeystoreError as e:
+        record["error"] = str(e)
+    except OSError as e:
+        record["error"] = f"{e.filename}: {e.strerror}" if e.filename else str(e)
+    return record
+
+
+def convert_many(pairs, output_dir, fmt, alias=None, password="", key_password=None, legacy=False,
+                 workers=None):
+    """Yield a convert_pair() record per (name, cert, key) pair, converting on a process pool
+
+    Keystores are written to ``output_dir``, or next to each key when it
+    is None, as NAME.p12 or NAME.jks; ``alias`` defaults to the name.
+    """
+    _cryptography()
+    extension = FORMATS[fmt]
+    jobs = [(name, cert, key, os.path.join(output_dir or os.path.dirname(key), f"{name}.{extension}"))
+            for name, cert, key in pairs]
+    args = (fmt, alias, password, key_password, legacy)
+    if workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            yield convert_pair(*job, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        columns = [[value] * len(jobs) for value in args]
+        yield from executor.map(convert_pair, *zip(*jobs), *columns, chunksize=chunksize)
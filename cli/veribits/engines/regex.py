@@ -0,0 +1,190 @@
+"""
+Local regex engine
+
+Reproduces the API's /tools/regex-test on the bytes of the input, as PHP's
+PCRE functions do, so ``position`` is a byte offset. Flags are translated
+(i, m and s to re.IGNORECASE, re.MULTILINE and re.DOTALL); without g only
+the first match is reported, as in JavaScript. PCRE named groups
+``(?<name>...)`` and ``\\k<name>`` are rewritten to Python's syntax.
+
+Compiled patterns are cached for the life of the process, so repeated
+runs under the daemon (``vb``) skip compilation. Each search for the next
+match runs under a time budget enforced from a SIGALRM interval timer; a
+pattern that backtracks catastrophically is interrupted inside the regex
+engine instead of hanging. The budget needs setitimer() and the main
+thread; elsewhere searches run unguarded.
+"""
+
+import functools
+import re
+import signal
+import threading
+import time
+
+FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "g": 0}
+
+DEFAULT_BUDGET_MS = 100.0
+
+_NAMED_GROUP = re.compile(r"(?<!\\)\(\?<(?=[A-Za-z_])")
+_NAMED_BACKREF = re.compile(r"\\k<([A-Za-z_][A-Za-z0-9_]*)>")
+
+
+class RegexTimeout(Exception):
+    """A search starting at byte ``position`` ran past its time budget"""
+
+    def __init__(self, position, line=None):
+        super().__init__(position, line)
+        self.position = position
+        self.line = line
+
+
+def display_pattern(pattern, flags):
+    """The pattern as the API reports it: /pattern/flags without g"""
+    return "/" + pattern.replace("/", "\\/") + "/" + "".join(f for f in "ims" if f in flags)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_pattern(pattern, flags):
+    """(compiled bytes pattern, global) for a pattern and its g/i/m/s flags
+
+    Raises ValueError for unknown flags and re.error for invalid patterns.
+    """
+    unknown = set(flags) - set(FLAGS)
+    if unknown:
+        raise ValueError(f"Unknown regex flag(s): {''.join(sorted(unknown))} (use g, i, m, s)")
+    options = 0
+    for flag in flags:
+        options |= FLAGS[flag]
+    source = _NAMED_BACKREF.sub(r"(?P=\1)", _NAMED_GROUP.sub("(?P<", pattern))
+    return re.compile(source.encode("utf-8"), options), "g" in flags
+
+
+class _Expired(Exception):
+    pass
+
+
+class Budget:
+    """Interrupt any single search that runs longer than ``ms`` milliseconds
+
+    One interval timer ticks every quarter budget while the context is
+    active, and its handler interrupts the current search once it has run
+    past the budget, so a search costs two clock reads rather than two
+    timer system calls. A runaway search is stopped within 1.25 budgets.
+    """
+
+    def __init__(self, ms=DEFAULT_BUDGET_MS):
+        self.seconds = ms / 1000
+        self.enabled = (ms > 0 and hasattr(signal, "setitimer")
+                        and threading.current_thread() is threading.main_thread())
+        # perf_counter() when the running search started, else None
+        self.started = None
+        self.searches = 0
+        self.slowest = 0.0
+        self._previous = None
+
+    def __enter__(self):
+        if self.enabled:
+            self._previous = signal.signal(signal.SIGALRM, self._tick)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds / 4, self.seconds / 4)
+        return self
+
+    def __exit__(self, *exc):
+        if self.enabled:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous)
+
+    def _tick(self, signum, frame):
+        started = self.started
+        if started is not None and time.perf_counter() - started > self.seconds:
+            raise _Expired()
+
+
+def _find(compiled, global_, data, budget, base=0, line=None):
+    """Yield API-style match records in ``data``; positions are offset by ``base``"""
+    matches = compiled.finditer(data)
+    clock = time.perf_counter
+    searched_from = base
+    while True:
+        budget.started = start = clock()
+        try:
+            match = next(matches, None)
+        except _Expired:
+            raise RegexTimeout(searched_from, line) from None
+        finally:
+            budget.started = None
+            elapsed = clock() - start
+            budget.searches += 1
+            if elapsed > budget.slowest:
+                budget.slowest = elapsed
+        if match is None:
+            return
+        searched_from = base + match.end()
+        record = {"match": match.group().decode("utf-8", errors="replace"), "position": base + match.start()}
+        if line is not None:
+            record["line"] = line
+        yield record
+        if not global_:
+            return
+
+
+def _lines(stream):
+    """(line number, byte offset, raw line) for a binary stream"""
+    offset = 0
+    for number, raw in enumerate(stream, 1):
+        yield number, offset, raw
+        offset += len(raw)
+
+
+def search(pattern, flags, data=None, lines=None, budget_ms=DEFAULT_BUDGET_MS):
+    """Run the pattern over ``data`` (bytes or mmap) or over each line of a binary stream
+
+    Returns the API's result fields plus "stats". In line mode each match
+    carries its line number and a line whose search runs out of budget is
+    skipped; for whole data the search stops there. Timeouts are listed in
+    "timeouts" as {"position", "line"}.
+    """
+    hits = compile_pattern.cache_info().hits
+    start = time.perf_counter()
+    compiled, global_ = compile_pattern(pattern, flags)
+    compile_seconds = time.perf_counter() - start
+    cached = compile_pattern.cache_info().hits > hits
+
+    matches, timeouts = [], []
+    size = line_count = 0
+    start = time.perf_counter()
+    with Budget(budget_ms) as budget:
+        if lines is None:
+            size = len(data)
+            try:
+                matches.extend(_find(compiled, global_, data, budget))
+            except RegexTimeout as e:
+                timeouts.append({"position": e.position, "line": None})
+        else:
+            for line_count, offset, raw in _lines(lines):
+                size = offset + len(raw)
+                try:
+                    matches.extend(_find(compiled, global_, raw.rstrip(b"\r\n"), budget, offset, line_count))
+                except RegexTimeout as e:
+                    timeouts.append({"position": e.position, "line": e.line})
+    elapsed = time.perf_counter() - start
+
+    for index, match in enumerate(matches):
+        match["index"] = index
+    return {
+        "is_valid": True,
+        "match_count": len(matches),
+        "matches": matches,
+        "pattern": display_pattern(pattern, flags),
+        "timeouts": timeouts,
+        "stats": {
+            "bytes": size,
+            "lines": line_count if lines is not None else None,
+            "compile_ms": round(compile_seconds * 1000, 3),
+            "compile_cached": cached,
+            "search_ms": round(elapsed * 1000, 3),
+            "searches": budget.searches,
+            "slowest_search_ms": round(budget.slowest * 1000, 3),
+            "budget_ms": budget_ms if budget.enabled else None,
+            "mb_per_s": round(size / elapsed / 1e6, 2) if elapsed else None,
+        },
+    }
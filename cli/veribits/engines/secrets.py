@@ -0,0 +1,245 @@
+"""
+Local secrets scanner
+
+Reproduces the API's /tools/scan-secrets: the same rules, applied to the
+raw bytes so ``position`` is a byte offset, the same masking, severities
+and count-based risk level. Each rule is compiled once and gated by a
+literal every match must contain, so a file is only searched with the
+rules whose literal it contains. The Heroku and Twitter rules have no
+such literal (they match any UUID and any digits-dash-token string, as
+on the server), so they run on every file. Rules still run
+independently, as on the server, so one string can be reported by
+several rules.
+
+Each finding also carries the Shannon entropy of its credential (the
+matched text after any ``name =`` prefix), computed with NumPy for all
+findings of a file at once when it is installed; it helps tell real keys
+from placeholders.
+
+Directory trees are walked honouring .gitignore files, skipping .git and
+binary files, and files are scanned on a process pool. With a Manifest,
+files that have not changed since the last scan reuse its results.
+"""
+
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+
+from ..manifest import scan
+from ..streaming import DEFAULT_CHUNK_BYTES, file_digest, iter_line_chunks
+from ..walk import walk
+
+# (type, pattern, literal every match contains, or None) in the API's order
+RULES = (
+    ("AWS Access Key", rb"AKIA[0-9A-Z]{16}", b"AKIA"),
+    ("AWS Secret Key", rb"""aws(.{0,20})?['"][0-9a-zA-Z/+]{40}['"]""", b"aws"),
+    ("GitHub Token", rb"ghp_[0-9a-zA-Z]{36}", b"ghp_"),
+    ("GitHub OAuth", rb"gho_[0-9a-zA-Z]{36}", b"gho_"),
+    ("Slack Token", rb"xox[baprs]-[0-9a-zA-Z-]{10,48}", b"xox"),
+    ("Stripe API Key", rb"sk_live_[0-9a-zA-Z]{24}", b"sk_live_"),
+    ("Stripe Publishable", rb"pk_live_[0-9a-zA-Z]{24}", b"pk_live_"),
+    ("Google API Key", rb"AIza[0-9A-Za-z\-_]{35}", b"AIza"),
+    ("Google OAuth", rb"[0-9]+-[0-9A-Za-z_]{32}\.apps\.googleusercontent\.com", b".apps.googleusercontent.com"),
+    ("Heroku API Key", rb"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}", None),
+    ("MailChimp API Key", rb"[0-9a-f]{32}-us[0-9]{1,2}", b"-us"),
+    ("Mailgun API Key", rb"key-[0-9a-zA-Z]{32}", b"key-"),
+    ("PayPal Braintree", rb"access_token\$production\$[0-9a-z]{16}\$[0-9a-f]{32}", b"access_token$production$"),
+    ("Picatic API Key", rb"sk_live_[0-9a-z]{32}", b"sk_live_"),
+    ("SendGrid API Key", rb"SG\.[0-9A-Za-z\-_]{22}\.[0-9A-Za-z\-_]{43}", b"SG."),
+    ("Twilio API Key", rb"SK[0-9a-fA-F]{32}", b"SK"),
+    ("Twitter Access Token", rb"[1-9][0-9]+-[0-9a-zA-Z]{40}", None),
+    ("Private SSH Key", rb"-----BEGIN (RSA|OPENSSH|DSA|EC) PRIVATE KEY-----", b"-----BEGIN "),
+    ("Generic API Key", rb"""api[_-]?key['"]?\s*[:=]\s*['"]?[0-9a-zA-Z]{16,}""", b"api"),
+    ("Generic Secret", rb"""secret['"]?\s*[:=]\s*['"]?[0-9a-zA-Z]{16,}""", b"secret"),
+    ("Password in Code", rb"""password['"]?\s*[:=]\s*['"][^'"]{8,}""", b"password"),
+    ("JWT Token", rb"eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}", b"eyJ"),
+    ("Basic Auth", rb"Authorization:\s*Basic\s+[A-Za-z0-9+/]+=*", b"Authorization:"),
+    ("Bearer Token", rb"Authorization:\s*Bearer\s+[A-Za-z0-9\-._~+/]+=*", b"Authorization:"),
+)
+
+SEVERITIES = {
+    "AWS Secret Key": "critical", "Private SSH Key": "critical", "Password in Code": "critical",
+    "AWS Access Key": "high", "GitHub Token": "high", "Stripe API Key": "high", "Google API Key": "high",
+}
+
+_COMPILED = [(name, re.compile(pattern), literal) for name, pattern, literal in RULES]
+
+# Manifest scanner name; changes whenever the rules do, invalidating stored results
+MANIFEST_SCANNER = "secrets:" + hashlib.sha256(repr((RULES, SEVERITIES)).encode()).hexdigest()[:12]
+
+# Git's heuristic: a NUL byte in the first 8000 bytes means binary
+BINARY_SNIFF_BYTES = 8000
+
+DEFAULT_MAX_FILE_BYTES = 20 * 1024 * 1024
+
+# Larger files are scanned in line-aligned chunks of about this size
+SCAN_CHUNK_BYTES = DEFAULT_CHUNK_BYTES
+
+
+def severity(name):
+    return SEVERITIES.get(name, "medium")
+
+
+def risk_level(count):
+    """The API's risk level for a number of findings"""
+    return "low" if count == 0 else "medium" if count < 5 else "high"
+
+
+def mask(value):
+    """Keep the first and last four bytes, as the API does"""
+    if len(value) <= 8:
+        return "*" * len(value)
+    return (value[:4] + b"*" * (len(value) - 8) + value[-4:]).decode("utf-8", errors="replace")
+
+
+def _numpy():
+    """Import NumPy on first use; None when it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def entropies(values):
+    """Shannon entropy in bits per byte of each bytes value"""
+    if not values:
+        return []
+    np = _numpy()
+    if np is None:
+        result = []
+        for value in values:
+            counts = Counter(value).values()
+            result.append(max(0.0, -sum(c / len(value) * math.log2(c / len(value)) for c in counts)))
+        return result
+
+    lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+    data = np.frombuffer(b"".join(values), dtype=np.uint8).astype(np.int64)
+    owner = np.repeat(np.arange(len(values)), lengths)
+    counts = np.bincount(owner * 256 + data, minlength=len(values) * 256).reshape(len(values), 256)
+    p = counts / lengths[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(counts > 0, p * np.log2(np.where(counts > 0, p, 1)), 0.0)
+    return np.maximum(-terms.sum(axis=1), 0.0).tolist()
+
+
+# Separators between a key name and its value, e.g. password = "..."
+_ASSIGNMENT = re.compile(rb"[\s:='\"]+")
+
+
+def credential(value):
+    """The credential part of a match: its last token after any key name"""
+    tokens = [token for token in _ASSIGNMENT.split(value) if token]
+    return tokens[-1] if tokens else value
+
+
+def scan_bytes(data, min_entropy=0.0):
+    """Return the findings in ``data`` as API-style secret records"""
+    matches = []
+    for name, pattern, literal in _COMPILED:
+        if literal is not None and literal not in data:
+            continue
+        for match in pattern.finditer(data):
+            matches.append((name, match.start(), match.group()))
+
+    # Count newlines once across the file, in position order
+    lines = {}
+    line, previous = 1, 0
+    for position in sorted({position for _, position, _ in matches}):
+        line += data.count(b"\n", previous, position)
+        lines[position] = line
+        previous = position
+
+    findings = []
+    scores = entropies([credential(value) for _, _, value in matches])
+    for (name, position, value), score in zip(matches, scores):
+        if score < min_entropy:
+            continue
+        findings.append({
+            "type": name,
+            "value": mask(value),
+            "line": lines[position],
+            "position": position,
+            "severity": severity(name),
+            "entropy": round(score, 3),
+        })
+    return findings
+
+
+def scan_chunks(path, min_entropy=0.0, chunk_bytes=SCAN_CHUNK_BYTES):
+    """scan_bytes() over a file read in line-aligned chunks, with whole-file lines and positions
+
+    Only one chunk is held in memory at a time. As with the API's chunked
+    scans, a match spanning a chunk boundary is not found; only rules
+    whose whitespace runs cross a newline can produce one.
+    """
+    findings = []
+    for first_line, offset, chunk in iter_line_chunks(path, chunk_bytes, decode=False):
+        for finding in scan_bytes(chunk, min_entropy):
+            finding["line"] += first_line - 1
+            finding["position"] += offset
+            findings.append(finding)
+    return findings
+
+
+def summarize(findings):
+    return {"secrets_found": len(findings), "secrets": findings, "risk_level": risk_level(len(findings))}
+
+
+def _scan_tree_file(path, known, digest, max_bytes, skip_binary):
+    """Manifest worker: {"result": {"secrets"|"skipped"}} plus the file's size, mtime and SHA-256
+
+    Files up to SCAN_CHUNK_BYTES are read whole; larger ones are hashed
+    and scanned chunk by chunk so memory stays bounded.
+    """
+    try:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if max_bytes is not None and stat.st_size > max_bytes:
+                return {"result": {"skipped": "too large"}}
+            head = f.read(BINARY_SNIFF_BYTES)
+            if skip_binary and b"\0" in head:
+                return {"result": {"skipped": "binary"}}
+            data = head + f.read() if stat.st_size <= SCAN_CHUNK_BYTES else None
+        record = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if digest:
+            record["digest"] = hashlib.sha256(data).hexdigest() if data is not None else file_digest(path)
+            if record["digest"] == known:
+                return dict(record, unchanged=True)
+        findings = scan_bytes(data) if data is not None else scan_chunks(path)
+    except OSError as e:
+        return {"error": e.strerror or str(e)}
+    return dict(record, result={"secrets": findings})
+
+
+def _filtered(records, min_entropy):
+    for record in records:
+        if min_entropy and "secrets" in record:
+            record["secrets"] = [s for s in record["secrets"] if s["entropy"] >= min_entropy]
+        yield record
+
+
+def scan_paths(paths, min_entropy=0.0, workers=None, max_bytes=None, skip_binary=True,
+               manifest=None, rescan=False):
+    """Yield one record per path, in order: {"file", "secrets"|"skipped"|"error", "reused"}
+
+    With a Manifest, unchanged files reuse their stored findings (see
+    manifest.scan()). Findings are stored unfiltered, so ``min_entropy``
+    can change between runs.
+    """
+    records = scan(paths, _scan_tree_file, (max_bytes, skip_binary), workers, manifest, rescan)
+    return _filtered(records, min_entropy)
+
+
+def scan_tree(root, min_entropy=0.0, workers=None, gitignore=True, max_bytes=DEFAULT_MAX_FILE_BYTES,
+              manifest=None, rescan=False):
+    """Yield one scan_paths() record per file under ``root``, in walk order
+
+    With a Manifest, entries for files no longer in the tree are dropped
+    once the walk completes.
+    """
+    records = scan(walk(root, gitignore), _scan_tree_file, (max_bytes, True), workers, manifest, rescan,
+                   root)
+    return _filtered(records, min_entropy)
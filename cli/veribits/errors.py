@@ -0,0 +1,16 @@
+"""
+VeriBits CLI exceptions
+"""
+
+
+class VeriBitsError(Exception):
+    """Base class for VeriBits client errors"""
+
+
+class APIError(VeriBitsError):
+    """An API request failed (network error, HTTP error status or invalid response)"""
+
+    def __init__(self, message, status_code=None, detail=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.detail = detail
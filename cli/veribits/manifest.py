@@ -0,0 +1,215 @@
+"""
+Persistent scan manifest for incremental file scans
+
+For every scanned file the manifest records its size, modification time,
+SHA-256 and the scanner's result, in a SQLite table keyed by (scanner,
+absolute path). A later scan reuses the stored result when size and
+mtime are unchanged, and otherwise only re-runs the scanner when the
+content hash differs, so touched-but-identical files are not rescanned.
+
+As in git, an entry whose mtime is too close to the moment it was
+recorded is "racy": the file may have changed again within the same
+timestamp tick, so its content is hashed before the result is trusted.
+
+``scanner`` names the producer of the results and includes anything that
+changes them (rule set version, API URL), so results from different
+scanners or versions never mix.
+
+scan() runs a per-file worker over many paths on a process pool, sending
+only new and changed files to the workers. A worker is a picklable
+function ``worker(path, known, digest, *args)`` returning
+{"size", "mtime_ns", "digest", "result"} (the digest only when ``digest``
+is true), {"size", "mtime_ns", "digest", "unchanged": True} when the
+content's SHA-256 equals ``known``, or {"error"}. Results returned
+without a digest, such as files skipped without being read, are not
+stored.
+"""
+
+import itertools
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .settings import cache_dir
+
+# Entries recorded within this many nanoseconds of the file's mtime are racy
+RACY_NS = 2 * 10**9
+
+Entry = namedtuple("Entry", "size mtime_ns digest result verified_ns")
+
+
+def default_manifest_path():
+    """Manifest database path, honoring VERIBITS_MANIFEST and the cache directory"""
+    return Path(os.getenv("VERIBITS_MANIFEST") or Path(cache_dir()) / "manifest.sqlite")
+
+
+def unchanged(entry, stat):
+    """True when ``stat`` matches the entry and the entry is not racy"""
+    return (entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns
+            and entry.mtime_ns < entry.verified_ns - RACY_NS)
+
+
+class Manifest:
+    """Stored scan results of one scanner, keyed by absolute file path"""
+
+    def __init__(self, scanner, path=None):
+        self.scanner = scanner
+        self.path = Path(path) if path else default_manifest_path()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                scanner TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                result BLOB NOT NULL,
+                verified_ns INTEGER NOT NULL,
+                PRIMARY KEY (scanner, path)
+            ) WITHOUT ROWID
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _entry(row):
+        size, mtime_ns, digest, result, verified_ns = row
+        return Entry(size, mtime_ns, digest, json.loads(result), verified_ns)
+
+    def get(self, path):
+        """The stored Entry for a file, or None"""
+        row = self._db.execute(
+            "SELECT size, mtime_ns, digest, result, verified_ns FROM files WHERE scanner = ? AND path = ?",
+            (self.scanner, os.path.abspath(path)),
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def entries(self, root):
+        """{absolute path: Entry} for every stored file under ``root``, in one index range scan"""
+        prefix = os.path.join(os.path.abspath(root), "")
+        rows = self._db.execute(
+            "SELECT path, size, mtime_ns, digest, result, verified_ns FROM files "
+            "WHERE scanner = ? AND path >= ? AND path < ?",
+            (self.scanner, prefix, prefix[:-1] + chr(ord(os.sep) + 1)),
+        )
+        return {row[0]: self._entry(row[1:]) for row in rows}
+
+    def put(self, path, size, mtime_ns, digest, result):
+        self._db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.scanner, os.path.abspath(path), size, mtime_ns, digest,
+             json.dumps(result, separators=(",", ":")), time.time_ns()),
+        )
+
+    def prune(self, root, seen):
+        """Forget files under ``root`` that are not in ``seen`` (absolute paths)"""
+        stale = [(self.scanner, path) for path in self.entries(root) if path not in seen]
+        self._db.executemany("DELETE FROM files WHERE scanner = ? AND path = ?", stale)
+        return len(stale)
+
+    def update(self, path, result):
+        """Replace the stored result of a file, keeping its size, mtime and digest"""
+        self._db.execute("UPDATE files SET result = ? WHERE scanner = ? AND path = ?",
+                         (json.dumps(result, separators=(",", ":")), self.scanner, os.path.abspath(path)))
+
+    def commit(self):
+        self._db.commit()
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+
+def _plan(paths, manifest, known, rescan):
+    """(path, manifest entry, reusable) for each path"""
+    for path in paths:
+        entry = None
+        if manifest is not None and not rescan:
+            entry = known.get(os.path.abspath(path)) if known is not None else manifest.get(path)
+        reusable = False
+        if entry is not None:
+            try:
+                reusable = unchanged(entry, os.stat(path))
+            except OSError:
+                pass
+        yield path, entry, reusable
+
+
+def _parallel(plan, worker, args, workers, digest):
+    """Yield (path, entry, record) in plan order; reusable files bypass the pool"""
+    # Paths are submitted in bounded batches so huge trees are never listed up front
+    size = (workers or os.cpu_count() or 1) * 64
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        batch = []
+        for item in itertools.chain(plan, [None]):
+            if item is not None:
+                batch.append(item)
+                if len(batch) < size:
+                    continue
+            jobs = [(path, entry and entry.digest) for path, entry, reusable in batch if not reusable]
+            columns = [[value] * len(jobs) for value in (digest,) + tuple(args)]
+            results = executor.map(worker, [path for path, _ in jobs], [known for _, known in jobs],
+                                   *columns, chunksize=16)
+            for path, entry, reusable in batch:
+                yield path, entry, None if reusable else next(results)
+            batch = []
+
+
+def _record(path, entry, scanned, manifest):
+    """The output record for one file, storing fresh results in the manifest"""
+    if scanned is None:
+        return dict(entry.result, file=path, reused=True)
+    if "error" in scanned:
+        return {"file": path, "error": scanned["error"]}
+    reused = scanned.get("unchanged", False)
+    result = entry.result if reused else scanned["result"]
+    if manifest is not None and "digest" in scanned:
+        manifest.put(path, scanned["size"], scanned["mtime_ns"], scanned["digest"], result)
+    return dict(result, file=path, reused=reused)
+
+
+def scan(paths, worker, args=(), workers=None, manifest=None, rescan=False, root=None):
+    """Yield dict(result, file=path, reused=bool) or {"file", "error"} per path, in order
+
+    Without a Manifest every file goes to ``worker``. With one, files
+    whose size and mtime match their entry are not read at all, and files
+    whose content hash matches are not rescanned; "reused" is True for
+    both. ``rescan`` ignores stored results but still records new ones.
+    With ``root``, the entries under it are loaded in one query and, once
+    ``paths`` is exhausted, entries for files not seen are dropped.
+    ``workers=1`` runs in this process.
+    """
+    known = manifest.entries(root) if manifest is not None and root is not None else None
+    seen = set()
+
+    def tracked():
+        for path in paths:
+            seen.add(os.path.abspath(path))
+            yield path
+
+    plan = _plan(tracked(), manifest, known, rescan)
+    digest = manifest is not None
+    if workers == 1:
+        scanned = ((path, entry, None if reusable else worker(path, entry and entry.digest, digest, *args))
+                   for path, entry, reusable in plan)
+    else:
+        scanned = _parallel(plan, worker, args, workers, digest)
+
+    for path, entry, record in scanned:
+        yield _record(path, entry, record, manifest)
+    if manifest is not None:
+        if root is not None:
+            manifest.prune(root, seen)
+        manifest.commit()
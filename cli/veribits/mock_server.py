@@ -0,0 +1,360 @@
+"""
+Local stand-in for the VeriBits API, used by ``veribits bench``
+
+Answers the endpoints the CLI calls with responses shaped like the real
+service's, after a configurable latency. ``items`` sets the length of
+list payloads (BGP prefixes, peers, downstreams, DNS records), so large
+responses can be produced on demand. Standard library only:
+
+    python -m veribits.mock_server --port 8080 --latency 20 --items 5000
+"""
+
+import argparse
+import base64
+import email.parser
+import email.policy
+import hashlib
+import hmac
+import ipaddress
+import json
+import random
+import re
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_ITEMS = 100
+
+# The RBLs NetworkToolsController::rblCheck queries
+_RBLS = ("zen.spamhaus.org", "bl.spamcop.net", "b.barracudacentral.org", "dnsbl.sorbs.net",
+         "cbl.abuseat.org", "psbl.surriel.com", "bl.spameatingmonkey.net", "dnsbl-1.uceprotect.net",
+         "ix.dnsbl.manitu.net")
+
+
+def _asn(n):
+    return {"asn": 64512 + n % 1000, "name": f"AS-BENCH-{n}", "description": f"Bench network {n}",
+            "country_code": "US"}
+
+
+def _prefix(n):
+    return {"prefix": f"10.{n // 256 % 256}.{n % 256}.0/24", "name": f"BENCH-NET-{n}",
+            "description": f"Bench prefix {n}", "country_code": "US"}
+
+
+def _secrets(body, items):
+    # The local engine carries the API's rules, severities and risk levels
+    from .engines import secrets
+
+    findings = secrets.scan_bytes(body.get("text", "").encode())
+    for finding in findings:
+        del finding["entropy"]
+    return secrets.summarize(findings)
+
+
+def _hash(body, items):
+    text = body.get("text", "").encode()
+    algorithms = [algorithm.lower() for algorithm in body.get("algorithms", ("md5", "sha1", "sha256", "sha512"))]
+    return {"hashes": {algorithm: hashlib.new(algorithm, text).hexdigest() for algorithm in algorithms
+                       if algorithm in hashlib.algorithms_available},
+            "input_length": len(text)}
+
+
+def _regex(body, items):
+    pattern, flags = body.get("pattern", ""), body.get("flags", "g")
+    php_flags = "".join(flag for flag in "ims" if flag in flags)
+    try:
+        compiled = re.compile(f"(?{php_flags})" + pattern if php_flags else pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regex pattern: {e}")
+    matches = [{"match": match.group(), "position": match.start(), "index": index}
+               for index, match in enumerate(compiled.finditer(body.get("text", "")))]
+    return {"is_valid": True, "match_count": len(matches), "matches": matches,
+            "pattern": "/" + pattern.replace("/", "\\/") + "/" + php_flags}
+
+
+def _segment(text):
+    try:
+        return json.loads(base64.urlsafe_b64decode(text + "=" * (-len(text) % 4)))
+    except ValueError:
+        return {}
+
+
+def _jwt_decode(body, items):
+    parts = body.get("token", "").split(".") + ["", "", ""]
+    header, payload = _segment(parts[0]), _segment(parts[1])
+    result = {"is_valid": True, "header": header, "payload": payload, "signature": parts[2],
+              "algorithm": header.get("alg", "unknown"), "type": header.get("typ", "JWT"), "claims": {}}
+    if "sub" in payload:
+        result["claims"]["subject"] = payload["sub"]
+    if body.get("verify_signature"):
+        secret = body.get("secret")
+        digest = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}.get(header.get("alg"))
+        if not secret:
+            result["signature_verified"] = False
+            result["signature_error"] = "Secret key required for signature verification"
+        elif digest is None:
+            result["signature_verified"] = False
+            result["signature_error"] = "Unsupported algorithm"
+        else:
+            mac = hmac.new(secret.encode(), f"{parts[0]}.{parts[1]}".encode(), digest).digest()
+            result["signature_verified"] = hmac.compare_digest(
+                base64.urlsafe_b64encode(mac).rstrip(b"=").decode(), parts[2])
+    return result
+
+
+def _jwt_sign(body, items):
+    expires_in = body.get("expires_in", 3600)
+    payload = dict(body.get("payload") or {}, iat=int(time.time()), exp=int(time.time()) + expires_in)
+    return {"token": "eyJhbGciOiJIUzI1NiJ9.e30.bench", "header": {"alg": "HS256", "typ": "JWT"},
+            "payload": payload, "algorithm": "HS256", "expires_in": expires_in,
+            "expires_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(payload["exp"]))}
+
+
+def _bitcoin(body, items):
+    value = body.get("value", "")
+    if body.get("type") == "transaction":
+        return {"value": value, "type": "bitcoin_transaction", "is_valid": True,
+                "details": {"format": "Hexadecimal", "length": "64 characters"}}
+    return {"value": value, "type": "bitcoin_address", "is_valid": True, "format": "P2PKH (Legacy)",
+            "network": "mainnet", "details": {"encoding": "Base58Check", "length": f"{len(value)} characters",
+                                              "checksum": "Valid"}}
+
+
+def _ethereum(body, items):
+    value = body.get("value", "")
+    if body.get("type") == "transaction":
+        return {"value": value, "type": "ethereum_transaction", "is_valid": True,
+                "details": {"format": "Hexadecimal", "length": "66 characters (including 0x prefix)"}}
+    return {"value": value, "type": "ethereum_address", "is_valid": True, "checksum_valid": True,
+            "details": {"format": "Hexadecimal", "length": "42 characters (including 0x prefix)",
+                        "checksum_address": value}}
+
+
+def _dns(body, items):
+    record_type = body.get("record_type", "A")
+    records = [{"type": record_type, "value": f"192.0.2.{n % 254 + 1}", "ttl": 300}
+               for n in range(min(items, 50))]
+    return {"domain": body.get("domain"), "record_type": record_type, "records": records,
+            "dnssec": {"enabled": False}}
+
+
+def _whois(body, items):
+    query = body.get("query", "")
+    return {"query": query, "query_type": "domain", "whois_server": "whois.bench.invalid",
+            "parsed": {"registrar": "Bench Registrar", "created": "2000-01-01"},
+            "raw_response": f"Domain Name: {query}\n" * 20}
+
+
+def _ipcalc(body, items):
+    # NetworkToolsController::ipCalculate, including its /31 and /32 arithmetic
+    address, _, cidr = body.get("ip", "").partition("/")
+    if not cidr:
+        mask = body.get("subnet_mask")
+        cidr = ipaddress.IPv4Network(f"0.0.0.0/{mask}").prefixlen if mask else 24
+    interface = ipaddress.IPv4Interface(f"{address}/{cidr}")
+    network = interface.network
+    first, second = (int(octet) for octet in address.split(".")[:2])
+    ip_class = ("A" if 1 <= first <= 126 else "B" if 128 <= first <= 191 else "C" if 192 <= first <= 223
+                else "D (Multicast)" if 224 <= first <= 239 else "E (Reserved)" if first >= 240 else "Unknown")
+    if first == 10 or (first == 172 and 16 <= second <= 31) or (first == 192 and second == 168):
+        ip_type = "Private"
+    else:
+        ip_type = {127: "Loopback"}.get(first, "APIPA" if (first, second) == (169, 254) else "Public")
+    broadcast = int(network.broadcast_address)
+    return {"ip_address": address, "network_address": str(network.network_address),
+            "broadcast_address": str(network.broadcast_address), "subnet_mask": str(network.netmask),
+            "wildcard_mask": str(network.hostmask), "cidr": f"{address}/{network.prefixlen}",
+            "first_usable": str(ipaddress.IPv4Address((int(network.network_address) + 1) & 0xFFFFFFFF)),
+            "last_usable": str(ipaddress.IPv4Address((broadcast - 1) & 0xFFFFFFFF)),
+            "total_hosts": network.num_addresses, "usable_hosts": max(0, network.num_addresses - 2),
+            "ip_class": ip_class, "ip_type": ip_type}
+
+
+def _rbl(body, items):
+    return {"ip_address": body.get("ip"), "listed": False, "blacklists_checked": len(_RBLS),
+            "blacklists_found": 0, "listings": [], "checked_rbls": list(_RBLS)}
+
+
+def _smtp(body, items):
+    target = body.get("target", "")
+    server = f"mx.{target.rpartition('@')[2]}"
+    return {"server": server, "mx_records": [server], "is_open_relay": False, "open_relay": False,
+            "tests_performed": [{"test": "External to External Relay", "result": "PASSED - Relay Rejected",
+                                 "passed": True, "details": "Server properly rejected unauthorized relay"}]}
+
+
+def _traceroute(body, items):
+    max_hops = body.get("max_hops", 30)
+    hops = [{"hop": n + 1, "hostname": f"hop{n + 1}.bench.invalid", "ip": f"192.0.2.{n % 254 + 1}",
+             "latencies": [float(n), n + 0.5, n + 1.0], "timeout": False,
+             "location": {"city": "Bench", "country": "US"}}
+            for n in range(min(items, max_hops))]
+    return {"target": body.get("target"), "hops": hops, "total_hops": len(hops), "max_hops": max_hops}
+
+
+def _bgp_prefix(body, items):
+    return dict(_prefix(0), prefix=body.get("query"), asns=[_asn(0)], rir_name="ARIN",
+                allocation_date="2000-01-01", rpki_validation="valid")
+
+
+def _bgp_asn(body, items):
+    return dict(_asn(0), asn=body.get("asn"), website=None, email_contacts=["noc@bench.invalid"],
+                abuse_contacts=["abuse@bench.invalid"], looking_glass=None, traffic_estimation=None,
+                traffic_ratio=None, owner_address=[])
+
+
+def _asn_list(kind):
+    def build(body, items):
+        entries = [_asn(n) for n in range(items)]
+        return {"asn": body.get("asn"), f"ipv4_{kind}s": entries, f"ipv6_{kind}s": [],
+                f"ipv4_{kind}_count": len(entries), f"ipv6_{kind}_count": 0}
+    return build
+
+
+def _bgp_search(body, items):
+    return {"query": body.get("query"), "results": {"asns": [_asn(n) for n in range(items)],
+                                                    "ipv4_prefixes": [], "ipv6_prefixes": []}}
+
+
+# Response data by endpoint, shaped like the PHP controllers' Response::success payloads
+RESPONSES = {
+    "/tools/scan-secrets": _secrets,
+    "/tools/dns-validate": _dns,
+    "/tools/whois": _whois,
+    "/tools/rbl-check": _rbl,
+    "/tools/ip-calculate": _ipcalc,
+    "/tools/generate-hash": _hash,
+    "/tools/regex-test": _regex,
+    "/jwt/decode": _jwt_decode,
+    "/jwt/sign": _jwt_sign,
+    "/crypto/validate/bitcoin": _bitcoin,
+    "/crypto/validate/ethereum": _ethereum,
+    "/tools/smtp-relay-check": _smtp,
+    "/tools/traceroute": _traceroute,
+    "/bgp/prefix": _bgp_prefix,
+    "/bgp/asn": _bgp_asn,
+    "/bgp/asn/prefixes": lambda body, items: {"asn": body.get("asn"), "ipv4_count": items, "ipv6_count": 0,
+                                              "ipv4_prefixes": [_prefix(n) for n in range(items)],
+                                              "ipv6_prefixes": []},
+    "/bgp/asn/peers": _asn_list("peer"),
+    "/bgp/asn/upstreams": _asn_list("upstream"),
+    "/bgp/asn/downstreams": _asn_list("downstream"),
+    "/bgp/search": _bgp_search,
+}
+
+
+def _upload(content_type, raw):
+    """(filename, contents) of the first file in a multipart/form-data body, or None"""
+    if not content_type.startswith("multipart/form-data"):
+        return None
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + raw)
+    if not message.is_multipart():
+        return None
+    for part in message.iter_parts():
+        if part.get_filename() is not None:
+            return part.get_filename(), part.get_payload(decode=True) or b""
+    return None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _delay(self):
+        config = self.server.config
+        delay = config["latency"] + random.uniform(0, config["jitter"])
+        if delay:
+            time.sleep(delay)
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _success(self, data):
+        self._reply(200, {"success": True, "message": "Success", "data": data})
+
+    def _error(self, status, message):
+        self._reply(status, {"success": False, "error": {"message": message, "code": status, "details": []}})
+
+    def do_GET(self):
+        self._delay()
+        if self.path.endswith("/limits/anonymous"):
+            return self._success({"type": "anonymous_trial_status",
+                                  "trial": {"free_scans": 5, "scans_used": 0, "scans_remaining": 5,
+                                            "max_file_size_mb": 50, "trial_period_days": 30},
+                                  "status": "active", "message": "Free trial active"})
+        self._error(404, "Not found")
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._delay()
+        endpoint = self.path.split("/api/v1", 1)[-1]
+
+        if endpoint == "/file-magic":
+            upload = _upload(self.headers.get("Content-Type", ""), raw)
+            if upload is None:
+                return self._error(400, "No file uploaded")
+            filename, contents = upload
+            return self._success({
+                "type": "file_magic_analysis", "filename": filename, "file_size": len(contents),
+                "file_hash": hashlib.sha256(contents).hexdigest(), "magic_number": "\\x89PNG",
+                "magic_number_hex": "89504e47", "detected_type": "PNG image", "detected_extension": "png",
+                "detected_mime": "image/png", "match_confidence": "high", "additional_info": {}})
+
+        build = RESPONSES.get(endpoint)
+        if build is None:
+            return self._error(404, f"Unknown endpoint {endpoint}")
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            return self._error(400, "Invalid JSON")
+        try:
+            data = build(body, self.server.config["items"])
+        except ValueError as e:
+            return self._error(400, str(e))
+        self._success(data)
+
+
+def make_server(host="127.0.0.1", port=0, latency=0.0, jitter=0.0, items=DEFAULT_ITEMS):
+    """Create the server; ``latency`` and ``jitter`` are in seconds"""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.config = {"latency": latency, "jitter": jitter, "items": items}
+    return server
+
+
+def api_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/api/v1"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the VeriBits API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency up to this (ms)")
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS, help="Length of list payloads")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.latency / 1000, args.jitter / 1000, args.items)
+    # The first line tells a parent process where to connect
+    print(api_url(server), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Output formats and lazy Rich rendering
+
+Commands render Rich tables for people by default. With a machine format
+(--output json, ndjson or csv) the command's ``data`` dict is serialized
+straight to stdout instead, rows are written one at a time, and status
+or error messages go to stderr as plain text. Rich is only imported when
+something is actually rendered with it.
+"""
+
+import csv
+import json
+import re
+import sys
+
+from . import tracing
+
+FORMATS = ("table", "json", "ndjson", "csv")
+
+_format = "table"
+
+# Bumped by configure() so consoles are recreated for each invocation
+_generation = 0
+
+# Rich markup tags such as [bold], [/], [bold red] or [link=...]
+_MARKUP = re.compile(r"\[/?(?:[a-z]+(?:[ =][^\[\]]*)?)?\]")
+
+
+def configure(format):
+    """Select the output format for this invocation"""
+    global _format, _generation
+    if format not in FORMATS:
+        raise ValueError(f"Unknown output format: {format}")
+    _format = format
+    _generation += 1
+
+
+def current():
+    return _format
+
+
+def machine():
+    """True when a machine-readable format was requested"""
+    return _format != "table"
+
+
+class LazyConsole:
+    """Stand-in for rich.console.Console that imports Rich on first use
+
+    In machine formats plain strings are written to stderr without Rich so
+    stdout only carries data.
+    """
+
+    def __init__(self, stderr=False):
+        self._stderr = stderr
+        self._console = None
+        self._generation = None
+
+    def _rich(self):
+        if self._console is None or self._generation != _generation:
+            from rich.console import Console
+            self._console = Console(stderr=self._stderr or machine())
+            self._generation = _generation
+        return self._console
+
+    def print(self, *objects, **kwargs):
+        with tracing.span("render"):
+            if machine() and all(isinstance(o, str) for o in objects):
+                text = " ".join(_MARKUP.sub("", o) for o in objects)
+                sys.stderr.write(text + kwargs.get("end", "\n"))
+                return
+            self._rich().print(*objects, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._rich(), name)
+
+
+def Table(*args, **kwargs):
+    from rich.table import Table
+    return Table(*args, **kwargs)
+
+
+def Panel(*args, **kwargs):
+    from rich.panel import Panel
+    return Panel(*args, **kwargs)
+
+
+def Syntax(*args, **kwargs):
+    from rich.syntax import Syntax
+    return Syntax(*args, **kwargs)
+
+
+def _lookup(data, path):
+    for part in path.split("."):
+        data = data.get(part) if isinstance(data, dict) else None
+    return data or []
+
+
+def flatten(record, prefix=""):
+    """Flatten nested dicts into dotted keys; lists become JSON strings"""
+    if not isinstance(record, dict):
+        return {prefix or "value": record}
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, separators=(",", ":"))
+        else:
+            flat[name] = value
+    return flat
+
+
+def iter_rows(data, rows=()):
+    """Yield the records to write for ``data``
+
+    ``rows`` names the list(s) of records inside ``data`` (dotted paths
+    for nested lists). With several lists each record gets a ``section``
+    key naming its list. Without ``rows`` the whole dict is one record.
+    """
+    if isinstance(rows, str):
+        rows = (rows,)
+    if not rows:
+        yield data
+        return
+    for path in rows:
+        section = path.rsplit(".", 1)[-1]
+        for row in _lookup(data, path):
+            if len(rows) > 1:
+                row = {"section": section, **row} if isinstance(row, dict) else \
+                      {"section": section, "value": row}
+            yield row
+
+
+def write_ndjson(records, stream=None):
+    stream = stream or sys.stdout
+    for record in records:
+        stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def write_csv(records, stream=None):
+    """Write records as CSV, using the union of their flattened keys as the header"""
+    stream = stream or sys.stdout
+    flat = [flatten(record) for record in records]
+    header = list(dict.fromkeys(key for record in flat for key in record))
+    writer = csv.DictWriter(stream, fieldnames=header, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(flat)
+
+
+def emit(data, rows=()):
+    """Write ``data`` in the selected machine format
+
+    Returns False, writing nothing, for the human table format so the
+    caller renders as usual.
+    """
+    if not machine():
+        return False
+    with tracing.span("render", **{"veribits.output": _format}):
+        if _format == "json":
+            json.dump(data, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        elif _format == "ndjson":
+            write_ndjson(iter_rows(data, rows))
+        else:
+            write_csv(iter_rows(data, rows))
+    return True
@@ -0,0 +1,173 @@
+"""
+Request builders for VeriBits API commands
+
+Each builder returns an (endpoint, method, payload) tuple that can be
+passed straight to api_request()/call(), so single commands and batch
+runs construct identical requests.
+"""
+
+
+# Signature algorithms the local JWT engine verifies
+JWT_ALGORITHMS = ("HS256", "HS384", "HS512", "RS256", "RS384", "RS512",
+                  "PS256", "PS384", "PS512", "ES256", "ES384", "ES512")
+
+
+def jwt_decode(token, secret=None, verify=False):
+    return "/jwt/decode", "POST", {
+        "token": token,
+        "secret": secret or "",
+        "verify_signature": verify
+    }
+
+
+def jwt_sign(secret, payload, expires=3600):
+    return "/jwt/sign", "POST", {
+        "secret": secret,
+        "payload": payload,
+        "expires_in": expires
+    }
+
+
+def regex(pattern, text, flags="g"):
+    return "/tools/regex-test", "POST", {
+        "pattern": pattern,
+        "text": text,
+        "flags": flags
+    }
+
+
+def secrets(text):
+    return "/tools/scan-secrets", "POST", {
+        "text": text
+    }
+
+
+def hash(text, algorithms=("md5", "sha256", "sha512")):
+    return "/tools/generate-hash", "POST", {
+        "text": text,
+        "algorithms": list(algorithms)
+    }
+
+
+def bitcoin(address, type="address"):
+    return "/crypto/validate/bitcoin", "POST", {
+        "value": address,
+        "type": type
+    }
+
+
+def ethereum(address, type="address"):
+    return "/crypto/validate/ethereum", "POST", {
+        "value": address,
+        "type": type
+    }
+
+
+def limits():
+    return "/limits/anonymous", "GET", None
+
+
+DNS_RECORD_TYPES = ("A", "AAAA", "MX", "TXT", "CNAME", "NS", "SOA", "PTR", "SRV", "CAA")
+
+
+def dns(domain, type="A"):
+    return "/tools/dns-validate", "POST", {
+        "domain": domain,
+        "record_type": type
+    }
+
+
+def whois(query):
+    return "/tools/whois", "POST", {
+        "query": query
+    }
+
+
+def ipcalc(ip, subnet=None):
+    data_payload = {"ip": ip}
+    if subnet:
+        data_payload["subnet_mask"] = subnet
+    return "/tools/ip-calculate", "POST", data_payload
+
+
+def rbl(ip):
+    return "/tools/rbl-check", "POST", {
+        "ip": ip
+    }
+
+
+def smtp_relay(target):
+    return "/tools/smtp-relay-check", "POST", {
+        "target": target
+    }
+
+
+def traceroute(target, max_hops=30):
+    return "/tools/traceroute", "POST", {
+        "target": target,
+        "max_hops": max_hops
+    }
+
+
+def bgp_prefix(query):
+    return "/bgp/prefix", "POST", {
+        "query": query
+    }
+
+
+def bgp_asn(asn):
+    return "/bgp/asn", "POST", {
+        "asn": asn
+    }
+
+
+def bgp_prefixes(asn):
+    return "/bgp/asn/prefixes", "POST", {
+        "asn": asn
+    }
+
+
+def bgp_peers(asn):
+    return "/bgp/asn/peers", "POST", {
+        "asn": asn
+    }
+
+
+def bgp_upstreams(asn):
+    return "/bgp/asn/upstreams", "POST", {
+        "asn": asn
+    }
+
+
+def bgp_downstreams(asn):
+    return "/bgp/asn/downstreams", "POST", {
+        "asn": asn
+    }
+
+
+def bgp_search(query):
+    return "/bgp/search", "POST", {
+        "query": query
+    }
+
+
+# Commands that take a single input value, keyed by CLI command name
+SINGLE_INPUT = {
+    "jwt-decode": jwt_decode,
+    "hash": hash,
+    "bitcoin": bitcoin,
+    "ethereum": ethereum,
+    "dns": dns,
+    "whois": whois,
+    "ipcalc": ipcalc,
+    "rbl": rbl,
+    "smtp-relay": smtp_relay,
+    "traceroute": traceroute,
+    "bgp-prefix": bgp_prefix,
+    "bgp-asn": bgp_asn,
+    "bgp-prefixes": bgp_prefixes,
+    "bgp-peers": bgp_peers,
+    "bgp-upstreams": bgp_upstreams,
+    "bgp-downstreams": bgp_downstreams,
+    "bgp-search": bgp_search,
+}
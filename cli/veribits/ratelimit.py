@@ -0,0 +1,45 @@
+"""
+Client-side request rate limiting
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` requests per second
+
+    Up to ``burst`` tokens accumulate while idle, so short bursts go out
+    immediately; acquire() blocks until a token is available and
+    reserve() returns the wait for async callers.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens=1):
+        """Take tokens now, borrowing ahead if the bucket is short
+
+        Returns the seconds to wait before using them; callers sleep (or
+        await) that long, which spaces concurrent callers at the rate.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens=1):
+        """Block until ``tokens`` are available"""
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
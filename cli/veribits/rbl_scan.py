@@ -0,0 +1,167 @@
+"""
+RBL scans across IP ranges
+
+Targets (addresses and CIDRs) are validated up front, networks nested in
+another target are dropped, and addresses are then generated one network
+at a time, so a /16 is never materialized as a list. Addresses checked
+within the RBL cache TTL are answered from the response cache without
+using a worker or a rate-limit token; the rest are checked on a bounded
+thread pool, optionally throttled to a requests-per-second rate.
+Results are yielded in address order.
+"""
+
+import ipaddress
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from . import api, payloads
+from .batch import BatchStats
+from .errors import APIError, VeriBitsError
+from .session import configure_session, pool_size
+
+DEFAULT_MAX_ADDRESSES = 65536
+
+
+class RBLScanError(VeriBitsError):
+    """Invalid or oversized scan targets"""
+
+
+class ScanStats(BatchStats):
+    """Batch counters plus listing and cache counts"""
+
+    def __init__(self):
+        super().__init__()
+        self.listed = 0
+        self.cached = 0
+
+
+def parse_targets(targets, max_addresses=DEFAULT_MAX_ADDRESSES):
+    """Return the networks to scan, dropping ones nested in another target"""
+    networks = []
+    for target in targets:
+        try:
+            networks.append(ipaddress.ip_network(target.strip(), strict=False))
+        except ValueError:
+            raise RBLScanError(f"Invalid IP address or CIDR: {target.strip()}")
+
+    networks.sort(key=lambda n: (n.version, n.network_address, n.prefixlen))
+    kept = []
+    for network in networks:
+        if kept and kept[-1].version == network.version and network.subnet_of(kept[-1]):
+            continue
+        kept.append(network)
+
+    total = sum(network.num_addresses for network in kept)
+    if total > max_addresses:
+        raise RBLScanError(f"Targets cover {total} addresses, more than the limit of "
+                           f"{max_addresses}; raise it with --max-addresses")
+    return kept
+
+
+def expand(networks):
+    """Yield the usable addresses of each network lazily
+
+    Network and broadcast addresses are skipped except for /31, /32 and
+    their IPv6 equivalents.
+    """
+    for network in networks:
+        addresses = network if network.num_addresses <= 2 else network.hosts()
+        for address in addresses:
+            yield str(address)
+
+
+def check(ip, fetch, limiter=None, cache=None):
+    """Check one address and return its result record instead of raising"""
+    endpoint, method, payload = payloads.rbl(ip)
+    if limiter is not None:
+        limiter.acquire()
+    try:
+        response = fetch(endpoint, method, payload)
+    except APIError as e:
+        return {"ip": ip, "success": False, "error": e.detail or str(e)}
+    if cache is not None:
+        cache.put(endpoint, payload, response)
+    return _record(ip, response, cached=False)
+
+
+def _record(ip, response, cached):
+    data = response.get("data", {})
+    return {
+        "ip": ip,
+        "success": True,
+        "cached": cached,
+        "listed": bool(data.get("listed")),
+        "blacklists_checked": data.get("blacklists_checked", 0),
+        "listings": data.get("listings", []),
+    }
+
+
+def _cache_key(ip):
+    endpoint, _, payload = payloads.rbl(ip)
+    return endpoint, payload
+
+
+def scan(addresses, concurrency=16, rate=None, stats=None):
+    """Yield one result record per address, preserving input order"""
+    from .client.sync import VeriBitsClient
+    from .ratelimit import TokenBucket
+
+    stats = stats if stats is not None else ScanStats()
+    configure_session(pool_size=max(pool_size(), concurrency))
+    limiter = TokenBucket(rate, burst=concurrency) if rate else None
+
+    # Cached answers are read here; workers fetch misses without a second lookup
+    client = api.default_client()
+    cache = client.cache
+    fetch = VeriBitsClient(client.api_url, client.api_key, client.timeout,
+                           resilience=client.resilience, coalescer=client.coalescer).request
+
+    window = concurrency * 4
+    pending = deque()
+
+    def collect(item):
+        record = item.result() if isinstance(item, Future) else item
+        stats.total += 1
+        if record["success"]:
+            stats.succeeded += 1
+            stats.listed += record["listed"]
+            stats.cached += record["cached"]
+        else:
+            stats.failed += 1
+        return record
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for ip in addresses:
+            cached = cache.get(*_cache_key(ip)) if cache is not None else None
+            if cached is not None:
+                pending.append(_record(ip, cached, cached=True))
+            else:
+                pending.append(executor.submit(check, ip, fetch, limiter, cache))
+            if len(pending) >= window:
+                yield collect(pending.popleft())
+
+        while pending:
+            yield collect(pending.popleft())
+
+    stats.finished = time.perf_counter()
+
+
+class ListingSummary:
+    """Listed addresses grouped by RBL name, accumulated one record at a time"""
+
+    def __init__(self, examples=5):
+        self.examples = examples
+        self.by_rbl = {}
+
+    def add(self, record):
+        for listing in record.get("listings", []):
+            name = listing.get("rbl", "")
+            entry = self.by_rbl.setdefault(name, {"rbl": name, "listed_ips": 0, "examples": []})
+            entry["listed_ips"] += 1
+            if len(entry["examples"]) < self.examples:
+                entry["examples"].append(record["ip"])
+
+    def rows(self):
+        """Summary rows, most listings first"""
+        return sorted(self.by_rbl.values(), key=lambda entry: (-entry["listed_ips"], entry["rbl"]))
@@ -0,0 +1,188 @@
+"""
+Retries, backoff, rate limiting and circuit breaking for API requests
+
+Transient failures (connection errors, timeouts, 429 and 5xx responses)
+are retried with jittered exponential backoff, waiting for Retry-After
+(or the API's reset_in_seconds) when the server sends it. The first 429
+switches on a token bucket sized from /limits/anonymous, or from the
+API-key tier, so a long batch settles at the rate the service allows
+instead of repeatedly hitting the limit. After several consecutive
+failed requests the circuit opens and requests fail fast until a trial
+request succeeds again.
+"""
+
+import random
+import threading
+import time
+
+from .errors import APIError
+from .ratelimit import TokenBucket
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+# Longer Retry-After waits (daily quotas) are reported instead of slept through
+MAX_RETRY_AFTER = 120.0
+
+# Requests per second by tier, from the API's per-identifier windows
+# (60/min by default, 100/min for API keys)
+TIER_RATES = {"anonymous": 1.0, "api_key": 100 / 60}
+
+
+class CircuitOpenError(APIError):
+    """Requests are failing fast after repeated API failures"""
+
+
+class TransientError(APIError):
+    """A failure worth retrying, with the server's requested wait if any"""
+
+    def __init__(self, message, status_code=None, detail=None, retry_after=None):
+        super().__init__(message, status_code=status_code, detail=detail)
+        self.retry_after = retry_after
+
+
+def retryable(status_code):
+    """True for HTTP statuses that are retried (429 and 5xx gateway errors)"""
+    return status_code in RETRY_STATUSES
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def rate_from_limits(data, authenticated=False):
+    """Requests per second allowed by a /limits response, else the tier default"""
+    limit = data.get("rate_limit") if isinstance(data.get("rate_limit"), dict) else data
+    per_second = limit.get("requests_per_second")
+    per_minute = limit.get("requests_per_minute")
+    if isinstance(per_second, (int, float)) and per_second > 0:
+        return float(per_second)
+    if isinstance(per_minute, (int, float)) and per_minute > 0:
+        return per_minute / 60
+    return TIER_RATES["api_key" if authenticated else "anonymous"]
+
+
+class CircuitBreaker:
+    """Open after ``threshold`` consecutive failures; allow a trial request after ``reset_timeout``"""
+
+    def __init__(self, threshold=5, reset_timeout=30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return
+            remaining = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(f"Circuit open after {self.failures} consecutive API failures",
+                               detail=f"Retrying in {remaining:.0f}s")
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class Resilience:
+    """Retry policy, circuit breaker and adaptive rate limit shared by a client's requests"""
+
+    def __init__(self, retries=3, backoff=DEFAULT_BACKOFF, max_backoff=MAX_BACKOFF, rate=None,
+                 breaker=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = TokenBucket(rate) if rate else None
+        self.retried = 0
+        self._lock = threading.Lock()
+        self._configuring = False
+
+    def before_request(self):
+        """Raise CircuitOpenError or return the seconds to wait for a rate-limit token"""
+        self.breaker.before()
+        return self.limiter.reserve() if self.limiter is not None else 0.0
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry ``attempt`` (0-based), or None to give up"""
+        if retry_after is not None:
+            if retry_after > MAX_RETRY_AFTER:
+                return None
+            return retry_after + random.uniform(0, self.backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def attempts(self, replayable=True):
+        """Number of times a request may be sent; once when its body cannot be replayed"""
+        return self.retries + 1 if replayable else 1
+
+    def retry_delay(self, error, attempt, attempts):
+        """Record a TransientError on ``attempt`` and return the seconds to wait before retrying
+
+        Raises a plain APIError for ``error`` when no attempts remain or the
+        server asks for a longer wait than MAX_RETRY_AFTER. A 429 does not
+        count against the circuit breaker: the API is up, just busy.
+        """
+        if error.status_code != 429:
+            self.breaker.failure()
+        delay = self.delay(attempt, error.retry_after) if attempt + 1 < attempts else None
+        if delay is None:
+            raise APIError(str(error), status_code=error.status_code, detail=error.detail) from error
+        self.retried += 1
+        return delay
+
+    def start_throttling(self):
+        """Claim the switch to rate-limited mode after a 429
+
+        True for exactly one caller, which then fetches the limits and
+        calls configure_rate(); False when a rate is already set.
+        """
+        with self._lock:
+            if self.limiter is not None or self._configuring:
+                return False
+            self._configuring = True
+            return True
+
+    def configure_rate(self, limits, authenticated):
+        """Install the token bucket from a /limits response (may be empty)"""
+        rate = rate_from_limits(limits or {}, authenticated)
+        with self._lock:
+            self.limiter = TokenBucket(rate, burst=max(1.0, rate))
+            self._configuring = False
@@ -0,0 +1,123 @@
+"""
+Shared HTTP session for VeriBits API requests
+
+All commands go through a single pooled requests.Session so that repeated
+calls to the API reuse keep-alive connections instead of paying a fresh
+TCP + TLS handshake per request.
+"""
+
+import threading
+import time
+
+from .settings import env_number
+
+DEFAULT_POOL_SIZE = 10
+
+_session = None
+# Read from VERIBITS_POOL_SIZE on first use
+_pool_size = None
+_lock = threading.Lock()
+
+
+def _traced_pool_classes():
+    """Connection pools whose connections report connect, TLS and response header times to tracing"""
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    from . import tracing
+
+    def new_conn(self):
+        start = time.perf_counter()
+        sock = self._untraced_new_conn()
+        self._connected_at = time.perf_counter()
+        tracing.phase("connect", start, self._connected_at, **{"server.address": self.host})
+        return sock
+
+    def get_response(self, *args, **kwargs):
+        response = self._untraced_getresponse(*args, **kwargs)
+        tracing.headers_received()
+        return response
+
+    class TracedHTTPConnection(HTTPConnection):
+        _untraced_new_conn = HTTPConnection._new_conn
+        _new_conn = new_conn
+        _untraced_getresponse = HTTPConnection.getresponse
+        getresponse = get_response
+
+    class TracedHTTPSConnection(HTTPSConnection):
+        _untraced_new_conn = HTTPSConnection._new_conn
+        _new_conn = new_conn
+        _untraced_getresponse = HTTPSConnection.getresponse
+        getresponse = get_response
+
+        def connect(self):
+            super().connect()
+            # connect() opens the socket through _new_conn, then does the handshake
+            tracing.phase("tls", getattr(self, "_connected_at", time.perf_counter()))
+
+    class TracedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TracedHTTPConnection
+
+    class TracedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TracedHTTPSConnection
+
+    return {"http": TracedHTTPConnectionPool, "https": TracedHTTPSConnectionPool}
+
+
+def _build_session(pool_size):
+    """Create a session whose adapters keep up to pool_size idle connections per host"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=False)
+    adapter.poolmanager.pool_classes_by_scheme = _traced_pool_classes()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Connection": "keep-alive",
+        "User-Agent": "veribits-cli",
+    })
+    return session
+
+
+def get_session():
+    """Return the shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session(pool_size())
+    return _session
+
+
+def configure_session(pool_size=None):
+    """Resize the connection pool; the next get_session() call picks up the change"""
+    global _session, _pool_size
+    with _lock:
+        if pool_size is not None and pool_size != _pool_size:
+            # Replaces the environment's size without parsing it
+            _pool_size = pool_size
+            if _session is not None:
+                _session.close()
+                _session = None
+
+
+def pool_size():
+    """Return the configured number of pooled connections per host
+
+    Raises ValueError when VERIBITS_POOL_SIZE is not a positive integer.
+    """
+    global _pool_size
+    if _pool_size is None:
+        _pool_size = env_number("VERIBITS_POOL_SIZE", DEFAULT_POOL_SIZE, minimum=1)
+    return _pool_size
+
+
+def close_session():
+    """Close all pooled connections"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
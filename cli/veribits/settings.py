@@ -0,0 +1,61 @@
+"""
+VeriBits CLI settings read from the environment
+"""
+
+import os
+
+# Default API endpoint
+DEFAULT_API_URL = "https://veribits.com/api/v1"
+API_URL = os.getenv("VERIBITS_API_URL", DEFAULT_API_URL)
+API_KEY = os.getenv("VERIBITS_API_KEY", "")
+
+# Request resilience: read timeout (seconds), retries of transient
+# failures, and an optional fixed client-side rate (requests per second)
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_RETRIES = 3
+CONNECT_TIMEOUT = 10.0
+
+
+def env_number(name, default, kind=int, minimum=0):
+    """The environment variable ``name`` as a ``kind`` number, or ``default`` when unset
+
+    Raises ValueError naming the variable when the value is not a number
+    of at least ``minimum``.
+    """
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        number = kind(value)
+    except ValueError:
+        number = None
+    if number is None or number < minimum:
+        kind_name = "an integer" if kind is int else "a number"
+        raise ValueError(f"{name} must be {kind_name} of at least {minimum}, got {value!r}")
+    return number
+
+
+def timeout():
+    """Read timeout in seconds from VERIBITS_TIMEOUT; raises ValueError for invalid values"""
+    return env_number("VERIBITS_TIMEOUT", DEFAULT_TIMEOUT, kind=float)
+
+
+def retries():
+    """Retries of transient failures from VERIBITS_RETRIES; raises ValueError for invalid values"""
+    return env_number("VERIBITS_RETRIES", DEFAULT_RETRIES)
+
+
+def rate():
+    """Fixed client-side rate from VERIBITS_RATE, or None for adaptive limiting"""
+    return env_number("VERIBITS_RATE", 0.0, kind=float) or None
+
+
+def cache_dir():
+    """Directory for the response cache and daemon socket
+
+    Honors VERIBITS_CACHE_DIR, then XDG_CACHE_HOME.
+    """
+    base = os.getenv("VERIBITS_CACHE_DIR")
+    if not base:
+        base = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "veribits")
+    return base
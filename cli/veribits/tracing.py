@@ -0,0 +1,219 @@
+"""
+Request and render timing for --timings and --trace
+
+When enabled, each invocation gets a root span, each API request a
+client span, and the phases of a request (connect, tls, ttfb, download,
+json_decode) and every render of output are recorded as child spans.
+``connect`` includes DNS resolution. Phases are only recorded for
+connections opened and requests sent while tracing is on; everything is
+a no-op otherwise.
+
+Spans export as OTLP/JSON (the OpenTelemetry protocol's JSON encoding),
+one ExportTraceServiceRequest per line, so a file appended to by many
+runs can be read by the collector's otlpjsonfile receiver or aggregated
+with jq.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from . import __version__
+
+PHASES = ("connect", "tls", "ttfb", "download", "json_decode", "render")
+
+# OTLP SpanKind and StatusCode values
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_enabled = False
+_root = None
+_spans = []
+_trace_id = None
+_lock = threading.Lock()
+_local = threading.local()
+# perf_counter_ns() + offset = Unix time in nanoseconds
+_clock_offset = 0
+
+
+class Span:
+    """A timed operation; times are perf_counter_ns() values"""
+
+    __slots__ = ("name", "span_id", "parent", "kind", "start", "end", "attributes", "error")
+
+    def __init__(self, name, parent=None, kind=KIND_INTERNAL, start=None, attributes=None):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent = parent
+        self.kind = kind
+        self.start = time.perf_counter_ns() if start is None else start
+        self.end = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    @property
+    def duration_ms(self):
+        return (self.end - self.start) / 1e6 if self.end is not None else None
+
+
+def enable(name, **attributes):
+    """Start recording a new trace whose root span is ``name``"""
+    global _enabled, _root, _spans, _trace_id, _clock_offset
+    with _lock:
+        _clock_offset = time.time_ns() - time.perf_counter_ns()
+        _trace_id = os.urandom(16).hex()
+        _spans = []
+        _root = Span(name, attributes=attributes)
+        _local.span = None
+        _enabled = True
+
+
+def enabled():
+    return _enabled
+
+
+def finish():
+    """Stop recording and return the finished spans, root first"""
+    global _enabled
+    with _lock:
+        if not _enabled:
+            return []
+        _enabled = False
+        _root.end = time.perf_counter_ns()
+        return [_root] + _spans
+
+
+def current():
+    """The innermost open span on this thread, else the root span"""
+    return getattr(_local, "span", None) or _root
+
+
+def _record(span):
+    with _lock:
+        if _enabled:
+            _spans.append(span)
+
+
+@contextmanager
+def span(name, kind=KIND_INTERNAL, **attributes):
+    """Record the enclosed block as a child of the current span
+
+    Yields the Span (None when tracing is off) so callers can add
+    attributes.
+    """
+    if not _enabled:
+        yield None
+        return
+    parent = current()
+    s = Span(name, parent, kind, attributes=attributes)
+    _local.span = s
+    try:
+        yield s
+    except BaseException as e:
+        if not isinstance(e, SystemExit):
+            s.error = str(e) or type(e).__name__
+        raise
+    finally:
+        s.end = time.perf_counter_ns()
+        _local.span = parent if parent is not _root else None
+        _record(s)
+
+
+def phase(name, start, end=None, **attributes):
+    """Record a phase of the current request from perf_counter() seconds"""
+    if not _enabled:
+        return
+    end = time.perf_counter() if end is None else end
+    if name in ("connect", "tls"):
+        _local.connected = end
+    s = Span(name, current(), start=int(start * 1e9), attributes=attributes)
+    s.end = int(end * 1e9)
+    _record(s)
+
+
+def connected_since(start):
+    """When this thread's latest connection became usable, if after ``start``"""
+    return max(start, getattr(_local, "connected", start))
+
+
+def headers_received():
+    """Note that this thread's current response has just had its headers parsed"""
+    if _enabled:
+        _local.headers_at = time.perf_counter()
+
+
+def headers_received_since(start, default):
+    """When this thread's latest response headers arrived, if after ``start``, else ``default``"""
+    headers_at = getattr(_local, "headers_at", None)
+    return headers_at if headers_at is not None and headers_at >= start else default
+
+
+def summarize(spans):
+    """Per-phase count, total, mean and max in ms, plus request counts"""
+    phases = {}
+    requests = cached = 0
+    for s in spans[1:]:
+        if s.kind == KIND_CLIENT:
+            requests += 1
+            cached += s.attributes.get("veribits.cache") == "hit"
+        elif s.name in PHASES:
+            phases.setdefault(s.name, []).append(s.duration_ms)
+
+    rows = []
+    for name in PHASES:
+        durations = phases.get(name)
+        if durations:
+            rows.append({"phase": name, "count": len(durations), "total_ms": round(sum(durations), 3),
+                         "mean_ms": round(sum(durations) / len(durations), 3),
+                         "max_ms": round(max(durations), 3)})
+    return {"command": spans[0].name, "total_ms": round(spans[0].duration_ms, 3),
+            "requests": requests, "cached": cached, "phases": rows}
+
+
+def _value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes):
+    return [{"key": key, "value": _value(value)} for key, value in attributes.items() if value is not None]
+
+
+def to_otlp(spans):
+    """The spans as an OTLP/JSON ExportTraceServiceRequest dict"""
+    encoded = []
+    for s in spans:
+        item = {
+            "traceId": _trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": s.kind,
+            "startTimeUnixNano": str(s.start + _clock_offset),
+            "endTimeUnixNano": str(s.end + _clock_offset),
+            "attributes": _attributes(s.attributes),
+            "status": {"code": STATUS_ERROR, "message": s.error} if s.error else {"code": STATUS_OK},
+        }
+        if s.parent is not None:
+            item["parentSpanId"] = s.parent.span_id
+        encoded.append(item)
+    return {"resourceSpans": [{
+        "resource": {"attributes": _attributes({"service.name": "veribits-cli",
+                                                "service.version": __version__,
+                                                "process.pid": os.getpid()})},
+        "scopeSpans": [{"scope": {"name": "veribits", "version": __version__}, "spans": encoded}],
+    }]}
+
+
+def export(spans, path):
+    """Append the trace to ``path`` as one OTLP/JSON line"""
+    with open(path, "a") as f:
+        f.write(json.dumps(to_otlp(spans), separators=(",", ":")) + "\n")
@@ -0,0 +1,133 @@
+"""
+Directory walking for local tree scans
+
+Yields the regular files of a tree in sorted order, skipping .git and
+symbolic links and honouring the .gitignore files found along the way,
+with git's rule semantics: rules from deeper directories are consulted
+after those above them and the last matching rule wins. Shared by the
+secrets and magic engines, and free of their rule tables.
+"""
+
+import os
+import re
+
+
+class GitIgnore:
+    """Ignore rules collected from the .gitignore files of a tree
+
+    Rules from deeper directories are consulted after those above them,
+    and the last matching rule wins, as in git.
+    """
+
+    def __init__(self):
+        self.rules = []
+
+    def load(self, directory, relative):
+        """Add the rules of ``directory``/.gitignore; ``relative`` is its path from the root"""
+        try:
+            with open(os.path.join(directory, ".gitignore"), encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        base = f"{relative}/" if relative else ""
+        for line in lines:
+            rule = _parse_rule(line)
+            if rule is not None:
+                self.rules.append((base,) + rule)
+
+    def ignored(self, relative, is_dir):
+        result = False
+        for base, regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base and not relative.startswith(base):
+                continue
+            if regex.match(relative[len(base):]):
+                result = not negate
+        return result
+
+
+def _parse_rule(line):
+    """(regex, negate, dir_only) for one .gitignore line, or None"""
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    return re.compile(("" if anchored else "(?:.*/)?") + _translate(line.lstrip("/")) + "$"), negate, dir_only
+
+
+def _translate(pattern):
+    """Regex for a gitignore glob: * and ? stop at '/', ** crosses directories"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            break
+        c = pattern[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def walk(root, gitignore=True):
+    """Yield the regular files under ``root`` in sorted order
+
+    Skips .git, symbolic links and, unless ``gitignore`` is False, paths
+    ignored by .gitignore files in the tree.
+    """
+    ignore = GitIgnore()
+    stack = [(root, "")]
+    while stack:
+        directory, relative = stack.pop()
+        if gitignore:
+            ignore.load(directory, relative)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            path = f"{relative}/{entry.name}" if relative else entry.name
+            if entry.is_symlink():
+                continue
+            if entry.is_dir():
+                if entry.name == ".git" or (gitignore and ignore.ignored(path, True)):
+                    continue
+                subdirectories.append((entry.path, path))
+            elif entry.is_file() and not (gitignore and ignore.ignored(path, False)):
+                yield entry.path
+        # Reversed so directories are visited in sorted order
+        stack.extend(reversed(subdirectories))